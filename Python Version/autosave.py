@@ -0,0 +1,272 @@
+# autosave.py
+"""
+Debounced background autosave into a rolling set of recovery files.
+
+AutosaveService watches a PlanetModel. Once the model has been left alone for
+`idle_ms`, it takes a snapshot on the calling (Tk) thread, which only collects
+references: PlanetModel.to_dict() reuses unchanged sections and big sections
+such as HEIGHTMAP are neither copied nor decoded. Encoding and the atomic
+write happen on one background thread, which keeps its own FragmentCache so
+only the sections changed since the previous autosave are encoded again.
+
+Each planet keeps its newest `keep` recovery files in `folder`, named
+"<planet>.<hash>.autosave.<timestamp>.txt" (see recovery_prefix); they are
+ordinary planet files that load_planet can open.
+
+The service never imports Tk: `schedule(ms, callback)` and `cancel(timer)`
+are passed in (a Tk root's after / after_cancel), and on_saved(path, error)
+is always called through them, i.e. on the Tk thread.
+
+Usage:
+    autosave = AutosaveService(root.after, root.after_cancel, on_saved=show_status)
+    autosave.watch(model, "Earth")
+    ...
+    autosave.close()
+"""
+import hashlib
+import os
+import queue
+import threading
+import time
+from urllib.parse import quote, unquote
+
+from planet_model import SECTIONS
+from sfs_exporter import FragmentCache, RawJSON, SFSExporter
+
+# Quiet time after the last edit before a snapshot is taken
+AUTOSAVE_IDLE_MS = 3000
+# Recovery files kept per planet, newest first
+RECOVERY_FILES = 5
+RECOVERY_FOLDER = os.path.join(os.path.expanduser("~"), ".sfs_planet_maker", "recovery")
+# How often the Tk thread checks for finished background writes
+RESULT_POLL_MS = 100
+
+
+class Snapshot:
+    """Everything the writer thread needs; built on the Tk thread, never changed afterwards."""
+
+    __slots__ = ("name", "data", "versions", "taken")
+
+    def __init__(self, name, data, versions):
+        self.name = name
+        self.data = data
+        self.versions = versions
+        self.taken = time.time()
+
+
+def take_snapshot(model, name):
+    """
+    Snapshot the planet `model` edits, including the sections it does not
+    cover (HEIGHTMAP, ACHIEVEMENT_DATA, ...) from model.source.
+
+    Section data is shared, not copied: to_dict() results are treated as
+    read-only, and the heightmap editor replaces HEIGHTMAP instead of
+    changing it in place. Sections a LazyPlanet has not decoded yet are
+    passed on as their raw JSON text.
+    """
+    data = dict(model.to_dict())
+    versions = model.section_versions()
+    source = model.source
+    raw_text = getattr(source, "raw_text", None)
+    # dict.keys / dict.__getitem__ so pending LazyPlanet sections are not decoded here
+    model_keys = {key for key, _, _ in SECTIONS}
+    for key in list(dict.keys(source)):
+        if key in model_keys:
+            continue
+        text = raw_text(key) if raw_text is not None else None
+        if text is not None:
+            data[key] = RawJSON(text)
+        else:
+            data[key] = dict.__getitem__(source, key)
+            versions[key] = (data[key], 0)   # same object, same encoding
+    return Snapshot(name, data, versions)
+
+
+def recovery_prefix(name):
+    """
+    File name prefix of the recovery files of planet `name`. Every planet gets
+    its own prefix: the name is percent-encoded ("A/B" -> "A%2FB") and followed
+    by a short hash of it, which also keeps "Earth" and "earth" apart on
+    case-insensitive disks. Rotation deletes by prefix, so this matters.
+    """
+    name = name or ""
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+    return f"{quote(name, safe=' ') or 'Untitled'}.{digest}.autosave."
+
+
+def recovered_name(path):
+    """Planet name a recovery file was written for ("A%2FB.<hash>.autosave.<stamp>.txt" -> "A/B")."""
+    encoded = os.path.basename(path).rsplit(".autosave.", 1)[0]
+    return unquote(encoded.rsplit(".", 1)[0])
+
+
+def recovery_files(folder=RECOVERY_FOLDER, name=None):
+    """
+    Recovery files in `folder`, newest first.
+
+    Args:
+        folder (str): Recovery folder.
+        name (str): Only the files of this planet; None for all of them.
+
+    Returns:
+        list[str]: Full paths.
+    """
+    try:
+        entries = os.listdir(folder)
+    except OSError:
+        return []
+    prefix = recovery_prefix(name) if name is not None else None
+    paths = [os.path.join(folder, entry) for entry in entries
+             if ".autosave." in entry and entry.endswith(".txt")
+             and (prefix is None or entry.startswith(prefix))]
+    return sorted(paths, key=_mtime, reverse=True)
+
+
+def _mtime(path):
+    # The writer thread may remove old files while the GUI lists them
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+class AutosaveService:
+    def __init__(self, schedule, cancel, folder=RECOVERY_FOLDER, idle_ms=AUTOSAVE_IDLE_MS,
+                 keep=RECOVERY_FILES, on_saved=None):
+        self.schedule = schedule
+        self.cancel = cancel
+        self.folder = folder
+        self.idle_ms = idle_ms
+        self.keep = keep
+        self.on_saved = on_saved
+        self.model = None
+        self.name = None
+
+        self._changed = False       # edits not snapshotted yet
+        self._changed_at = 0.0
+        self._timer = None
+        self._poll_timer = None
+
+        # Writer thread state: only the latest snapshot waiting to be written matters
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._queued = None
+        self._writing = False
+        self._closed = False
+        self._results = queue.Queue()
+        self._fragments = FragmentCache()   # used by the writer thread only
+        self._exporter = SFSExporter()
+        self._thread = None
+
+    # ---------------------------------------------
+    # Tk thread
+    # ---------------------------------------------
+    def watch(self, model, name):
+        """Autosave `model` (planet `name`) from now on; pending edits of the previous one are saved first."""
+        if self.model is not None:
+            self.snapshot_now()
+            self.model.unsubscribe(self.changed)
+        self.model = model
+        self.name = name
+        model.subscribe(self.changed)
+
+    def changed(self):
+        """Called on every model change; cheap, as it runs on each keystroke."""
+        self._changed = True
+        self._changed_at = time.monotonic()
+        if self._timer is None and not self._closed:
+            self._timer = self.schedule(self.idle_ms, self._idle_check)
+
+    def _idle_check(self):
+        self._timer = None
+        # Edits made while waiting push the snapshot back instead of rescheduling on every keystroke
+        waited_ms = (time.monotonic() - self._changed_at) * 1000.0
+        if waited_ms < self.idle_ms:
+            self._timer = self.schedule(max(1, int(self.idle_ms - waited_ms)), self._idle_check)
+            return
+        self.snapshot_now()
+
+    def snapshot_now(self):
+        """Snapshot pending edits right away and hand them to the writer thread."""
+        if self._timer is not None:
+            self.cancel(self._timer)
+            self._timer = None
+        if not self._changed or self.model is None or self._closed:
+            return
+        self._changed = False
+        snapshot = take_snapshot(self.model, self.name)
+        with self._lock:
+            self._queued = snapshot
+            self._wake.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+        if self._poll_timer is None:
+            self._poll_timer = self.schedule(RESULT_POLL_MS, self._poll_results)
+
+    def _poll_results(self):
+        self._poll_timer = None
+        while True:
+            try:
+                path, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self.on_saved:
+                self.on_saved(path, error)
+        with self._lock:
+            busy = self._writing or self._queued is not None
+        if busy and not self._closed:
+            self._poll_timer = self.schedule(RESULT_POLL_MS, self._poll_results)
+
+    def close(self, timeout=5.0):
+        """
+        Save pending edits and wait (up to `timeout` seconds) for the writer
+        to finish. Call before the window is destroyed.
+        """
+        self.snapshot_now()
+        if self._poll_timer is not None:
+            self.cancel(self._poll_timer)
+            self._poll_timer = None
+        if self.model is not None:
+            self.model.unsubscribe(self.changed)
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    # ---------------------------------------------
+    # Writer thread
+    # ---------------------------------------------
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._queued is None and not self._closed:
+                    self._wake.wait()
+                snapshot, self._queued = self._queued, None
+                if snapshot is None:
+                    return
+                self._writing = True
+            try:
+                self._results.put(self._write(snapshot))
+            finally:
+                with self._lock:
+                    self._writing = False
+
+    def _write(self, snapshot):
+        """Write one snapshot and drop the oldest recovery files. Never raises."""
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(snapshot.taken))
+        stamp += f"-{int(snapshot.taken * 1000) % 1000:03d}"
+        path = os.path.join(self.folder, f"{recovery_prefix(snapshot.name)}{stamp}.txt")
+        try:
+            self._exporter.export_planet(path, snapshot.data, fragments=self._fragments,
+                                         versions=snapshot.versions, quiet=True)
+        except (OSError, ValueError) as e:
+            return path, f"{type(e).__name__}: {e}"
+        for old in recovery_files(self.folder, snapshot.name)[self.keep:]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        return path, None
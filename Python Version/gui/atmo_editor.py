@@ -1,59 +1,69 @@
 import customtkinter as ctk
 
+from gui.model_binding import ModelBindings
+from gui.row_pool import RowPool
+from planet_model import FogKey, PlanetModel
+
 class AtmosphereEditor:
     def __init__(self, parent, planet_data=None):
-        self.planet_data = planet_data or {}
+        # planet_data may be a planet dict or a planet_model.PlanetModel
+        self.model = PlanetModel.coerce(planet_data)
+        self.bindings = ModelBindings()
         self.frame = ctk.CTkFrame(parent)
         self.frame.pack(fill="both", expand=True)
 
+        physics = lambda: self.model.atmosphere_physics
+        gradient = lambda: self.model.atmosphere_visuals.GRADIENT
+        clouds = lambda: self.model.atmosphere_visuals.CLOUDS
+
         # ------------------- Physics -------------------
-        atm_phys = self.planet_data.get("ATMOSPHERE_PHYSICS_DATA", {})
-        self.height = ctk.DoubleVar(value=atm_phys.get("height", 30000.0))
-        self.density = ctk.DoubleVar(value=atm_phys.get("density", 0.005))
-        self.curve = ctk.DoubleVar(value=atm_phys.get("curve", 10.0))
-        self.parachuteMultiplier = ctk.DoubleVar(value=atm_phys.get("parachuteMultiplier", 1.0))
-        self.upperAtmosphere = ctk.DoubleVar(value=atm_phys.get("upperAtmosphere", 0.333))
-        self.shockwaveIntensity = ctk.DoubleVar(value=atm_phys.get("shockwaveIntensity", 1.0))
-        self.minHeatingVelocityMultiplier = ctk.DoubleVar(value=atm_phys.get("minHeatingVelocityMultiplier", 1.0))
+        self.height = self._bind(ctk.DoubleVar(), physics, "height")
+        self.density = self._bind(ctk.DoubleVar(), physics, "density")
+        self.curve = self._bind(ctk.DoubleVar(), physics, "curve")
+        self.parachuteMultiplier = self._bind(ctk.DoubleVar(), physics, "parachuteMultiplier")
+        self.upperAtmosphere = self._bind(ctk.DoubleVar(), physics, "upperAtmosphere")
+        self.shockwaveIntensity = self._bind(ctk.DoubleVar(), physics, "shockwaveIntensity")
+        self.minHeatingVelocityMultiplier = self._bind(ctk.DoubleVar(), physics, "minHeatingVelocityMultiplier")
 
         # ------------------- Gradient -------------------
-        visuals = self.planet_data.get("ATMOSPHERE_VISUALS_DATA", {})
-        grad = visuals.get("GRADIENT", {})
-        self.gradientTexture = ctk.StringVar(value=grad.get("texture", "Atmo_Earth"))
-        self.gradientHeight = ctk.DoubleVar(value=grad.get("height", 45000.0))
-        self.gradientPositionZ = ctk.DoubleVar(value=grad.get("positionZ", 4000))
+        self.gradientTexture = self._bind(ctk.StringVar(), gradient, "texture", str)
+        self.gradientHeight = self._bind(ctk.DoubleVar(), gradient, "height")
+        self.gradientPositionZ = self._bind(ctk.DoubleVar(), gradient, "positionZ")
 
         # ------------------- Clouds -------------------
-        clouds = visuals.get("CLOUDS", {})
-        self.cloudTexture = ctk.StringVar(value=clouds.get("texture", "Earth_Clouds"))
-        self.cloudStartHeight = ctk.DoubleVar(value=clouds.get("startHeight", 1200.0))
-        self.cloudWidth = ctk.DoubleVar(value=clouds.get("width", 40845.87))
-        self.cloudHeight = ctk.DoubleVar(value=clouds.get("height", 36000.0))
-        self.cloudAlpha = ctk.DoubleVar(value=clouds.get("alpha", 0.1))
-        self.cloudVelocity = ctk.DoubleVar(value=clouds.get("velocity", 2.0))
+        self.cloudTexture = self._bind(ctk.StringVar(), clouds, "texture", str)
+        self.cloudStartHeight = self._bind(ctk.DoubleVar(), clouds, "startHeight")
+        self.cloudWidth = self._bind(ctk.DoubleVar(), clouds, "width")
+        self.cloudHeight = self._bind(ctk.DoubleVar(), clouds, "height")
+        self.cloudAlpha = self._bind(ctk.DoubleVar(), clouds, "alpha")
+        self.cloudVelocity = self._bind(ctk.DoubleVar(), clouds, "velocity")
 
         # ------------------- Fog -------------------
-        fog = visuals.get("FOG", {}).get("keys", [])
-        self.fogKeys = []
+        # Each fog key is a pooled row frame inside fogFrame
         self.fogFrame = ctk.CTkFrame(self.frame)
         self.fogFrame.grid(row=20, column=0, columnspan=2, sticky="nsew")
-        self.fogRowStart = 0
-
-        for key in fog:
-            color = key.get("color", {})
-            self.add_fog_key({
-                "r": color.get("r", 0.647058845),
-                "g": color.get("g", 0.848739564),
-                "b": color.get("b", 1.0),
-                "a": color.get("a", 0.416),
-                "distance": key.get("distance", 30000.0)
-            })
+        self.fog_pool = RowPool(self.fogFrame, self._make_fog_row, fill="x")
+        self.fogKeys = self.fog_pool.active
 
         # Add button to add more fog keys
         self.addFogButton = ctk.CTkButton(self.frame, text="Add Fog Key", command=self.add_fog_key)
         self.addFogButton.grid(row=99, column=0, columnspan=2, pady=10)
 
         self.build_ui()
+        self.update_data(self.model)
+
+    def _bind(self, var, section, name, convert=float):
+        return self.bindings.add(var, section, name, convert)
+
+    def update_data(self, planet_data):
+        """Show another planet's atmosphere in the existing widgets and fog rows."""
+        self.model = PlanetModel.coerce(planet_data)
+        self.bindings.rebind()
+
+        fog = self.model.atmosphere_visuals.FOG.keys
+        for key, item in zip(self.fog_pool.resize(len(fog)), fog):
+            self._fill_fog_key(key, item)
+        self._number_fog_keys()
 
     def build_ui(self):
         row = 0
@@ -100,86 +110,50 @@ class AtmosphereEditor:
         ctk.CTkLabel(self.frame, text="--- Fog Keys ---").grid(row=row, column=0, columnspan=2)
         row += 1
 
-        # Build initial fog keys
-        for key in self.fogKeys:
-            self.render_fog_key(key)
-
     def add_fog_key(self, default=None):
-        if default is None:
-            default = {"r":0.647058845,"g":0.848739564,"b":1.0,"a":0.416,"distance":30000.0}
-        key = {
-            "r": ctk.DoubleVar(value=default["r"]),
-            "g": ctk.DoubleVar(value=default["g"]),
-            "b": ctk.DoubleVar(value=default["b"]),
-            "a": ctk.DoubleVar(value=default["a"]),
-            "distance": ctk.DoubleVar(value=default["distance"])
-        }
-        self.fogKeys.append(key)
-        self.render_fog_key(key)
+        # default uses the flat {"r", "g", "b", "a", "distance"} form
+        item = FogKey()
+        if default is not None:
+            item.color.r, item.color.g, item.color.b, item.color.a = (default[c] for c in "rgba")
+            item.distance = default["distance"]
+        self.model.atmosphere_visuals.FOG.keys.append(item)
+        self._fill_fog_key(self.fog_pool.acquire(), item)
+        self._number_fog_keys()
 
     def remove_fog_key(self, key):
-        for widget in key["widgets"]:
-            widget.destroy()
-        self.fogKeys.remove(key)
-
-    def render_fog_key(self, key):
-        key["widgets"] = []
-        row = self.fogRowStart
-        ctk.CTkLabel(self.fogFrame, text=f"Fog Key {len(self.fogKeys)}").grid(row=row, column=0, columnspan=2)
-        key["widgets"].append(self.fogFrame)
-        row += 1
-        for label, var in [("R", key["r"]), ("G", key["g"]), ("B", key["b"]), ("A", key["a"]), ("Distance", key["distance"])]:
-            lbl = ctk.CTkLabel(self.fogFrame, text=label)
-            lbl.grid(row=row, column=0)
-            entry = ctk.CTkEntry(self.fogFrame, textvariable=var)
-            entry.grid(row=row, column=1)
-            key["widgets"].extend([lbl, entry])
+        fog = self.model.atmosphere_visuals.FOG.keys
+        fog[:] = [item for item in fog if item is not key["item"]]
+        self.fog_pool.release(key)
+        self._number_fog_keys()
+
+    def _make_fog_row(self, container):
+        frame = ctk.CTkFrame(container, fg_color="transparent")
+        key = {"frame": frame, "item": None, "bindings": ModelBindings()}
+        key["label"] = ctk.CTkLabel(frame, text="")
+        key["label"].grid(row=0, column=0, columnspan=2)
+        row = 1
+        for label, section, name in [("R", "color", "r"), ("G", "color", "g"), ("B", "color", "b"),
+                                     ("A", "color", "a"), ("Distance", None, "distance")]:
+            target = (lambda: key["item"].color) if section else (lambda: key["item"])
+            key[name] = key["bindings"].add(ctk.DoubleVar(), target, name)
+            ctk.CTkLabel(frame, text=label).grid(row=row, column=0)
+            ctk.CTkEntry(frame, textvariable=key[name]).grid(row=row, column=1)
             row += 1
         # Remove button
-        btn = ctk.CTkButton(self.fogFrame, text="Remove", command=lambda k=key: self.remove_fog_key(k))
+        btn = ctk.CTkButton(frame, text="Remove", command=lambda k=key: self.remove_fog_key(k))
         btn.grid(row=row, column=0, columnspan=2, pady=5)
-        key["widgets"].append(btn)
-        self.fogRowStart = row + 1
+        return key
+
+    def _fill_fog_key(self, key, item):
+        key["item"] = item
+        key["bindings"].rebind()
+
+    def _number_fog_keys(self):
+        for number, key in enumerate(self.fogKeys, 1):
+            key["label"].configure(text=f"Fog Key {number}")
 
     def get_data(self):
         return {
-            "ATMOSPHERE_PHYSICS_DATA": {
-                "height": self.height.get(),
-                "density": self.density.get(),
-                "curve": self.curve.get(),
-                "curveScale": {},
-                "parachuteMultiplier": self.parachuteMultiplier.get(),
-                "upperAtmosphere": self.upperAtmosphere.get(),
-                "heightDifficultyScale": {},
-                "shockwaveIntensity": self.shockwaveIntensity.get(),
-                "minHeatingVelocityMultiplier": self.minHeatingVelocityMultiplier.get()
-            },
-            "ATMOSPHERE_VISUALS_DATA": {
-                "GRADIENT": {
-                    "positionZ": self.gradientPositionZ.get(),
-                    "height": self.gradientHeight.get(),
-                    "texture": self.gradientTexture.get()
-                },
-                "CLOUDS": {
-                    "texture": self.cloudTexture.get(),
-                    "startHeight": self.cloudStartHeight.get(),
-                    "width": self.cloudWidth.get(),
-                    "height": self.cloudHeight.get(),
-                    "alpha": self.cloudAlpha.get(),
-                    "velocity": self.cloudVelocity.get()
-                },
-                "FOG": {
-                    "keys": [
-                        {
-                            "color": {
-                                "r": k["r"].get(),
-                                "g": k["g"].get(),
-                                "b": k["b"].get(),
-                                "a": k["a"].get()
-                            },
-                            "distance": k["distance"].get()
-                        } for k in self.fogKeys
-                    ]
-                }
-            }
+            "ATMOSPHERE_PHYSICS_DATA": self.model.atmosphere_physics.to_json(),
+            "ATMOSPHERE_VISUALS_DATA": self.model.atmosphere_visuals.to_json()
         }
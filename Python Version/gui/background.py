@@ -0,0 +1,106 @@
+import queue
+import threading
+
+
+class BackgroundTask:
+    """
+    Runs jobs on a single worker thread and hands results back to Tk.
+
+    Only the newest job matters: submitting while a job is still queued replaces
+    it, and results of jobs that were superseded are dropped. Results are
+    delivered on the Tk thread by polling a queue with widget.after(), because
+    Tk must never be called from the worker thread.
+
+    Usage:
+        task = BackgroundTask(widget, on_result=self.show, on_error=self.fail)
+        task.submit(expensive_function, arg1, arg2)
+    """
+
+    def __init__(self, widget, on_result, on_error=None, poll_ms=25):
+        self.widget = widget
+        self.on_result = on_result
+        self.on_error = on_error
+        self.poll_ms = poll_ms
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = None        # (generation, func, args) not started yet
+        self._generation = 0
+        self._results = queue.Queue()
+        self._poll_id = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # ---------------------------------------------
+    # Tk thread
+    # ---------------------------------------------
+    def submit(self, func, *args):
+        """Queue func(*args), replacing any job that has not started yet."""
+        with self._lock:
+            self._generation += 1
+            self._pending = (self._generation, func, args)
+            self._wakeup.notify()
+        self._ensure_polling()
+
+    @property
+    def busy(self):
+        return self._poll_id is not None
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._pending = None
+            self._wakeup.notify()
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+
+    def _ensure_polling(self):
+        if self._poll_id is None and not self._closed:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        latest = None
+        try:
+            while True:
+                latest = self._results.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            current = self._generation
+
+        if latest is not None and latest[0] == current:
+            _, ok, value = latest
+            if ok:
+                self.on_result(value)
+            elif self.on_error:
+                self.on_error(value)
+            return
+
+        # Nothing yet, or only a superseded result: the newest job is still running
+        self._ensure_polling()
+
+    # ---------------------------------------------
+    # Worker thread
+    # ---------------------------------------------
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._pending is None and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+                generation, func, args = self._pending
+                self._pending = None
+            try:
+                result = (generation, True, func(*args))
+            except Exception as e:
+                result = (generation, False, e)
+            self._results.put(result)
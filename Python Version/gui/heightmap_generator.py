@@ -1,158 +1,525 @@
-# Version/gui/heightmap_generator.py url=https://github.com/RoshanGamer7791/VisualSFSPlanetMaker/blob/a99c7d2a4bf2cb6abbc9dfa1fdaefb2ea0f44f80/Python%20Version/gui/heightmap_generator.py
-import tkinter as tk
-import customtkinter as ctk
-import numpy as np
-import json
-from tkinter import filedialog, messagebox
-
-class HeightmapGUI:
-    """
-    Heightmap editor tab.
-
-    Changes made:
-    - Use a CTkFrame compatible with the other editor tabs (do NOT call parent.add inside this class;
-      main.py is expected to add the tab).
-    - Canvas resizes with the frame and redraws appropriately.
-    - Export now opens a Save dialog so user can choose where to save (keeps same JSON-in-.txt format).
-    - Added a 'Save to Project' button that stores the heightmap into the provided planet_data dict
-      under the key "HEIGHTMAP" (as {"points":[...]}) so other parts of the app can access it.
-    """
-
-    def __init__(self, parent, planet_data=None, canvas_width=800, canvas_height=400, points_count=200):
-        self.parent = parent
-        self.planet_data = planet_data if isinstance(planet_data, dict) else {}
-
-        self.canvas_width = canvas_width
-        self.canvas_height = canvas_height
-
-        # Heightmap data (points_count points by default)
-        self.points = np.zeros(points_count, dtype=float)
-
-        # Main frame for this tab (don't call parent.add here; main will add the frame to its notebook)
-        self.frame = ctk.CTkFrame(parent)
-        self.frame.pack(fill="both", expand=True)
-
-        # Allow the canvas to expand
-        self.frame.columnconfigure(0, weight=1)
-        self.frame.rowconfigure(0, weight=1)
-
-        # ---------------------------
-        # CANVAS (stretches properly)
-        # ---------------------------
-        self.canvas = tk.Canvas(
-            self.frame,
-            bg="white",
-            width=self.canvas_width,
-            height=self.canvas_height,
-            highlightthickness=0
-        )
-        self.canvas.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-
-        # Bind drawing and resizing
-        self.canvas.bind("<B1-Motion>", self.draw_height)
-        self.canvas.bind("<Button-1>", self.draw_height)
-        self.canvas.bind("<Configure>", self.on_resize)
-
-        # ---------------------------
-        # BUTTONS (bottom row)
-        # ---------------------------
-        btn_frame = ctk.CTkFrame(self.frame)
-        btn_frame.grid(row=1, column=0, pady=8)
-
-        clear_btn = ctk.CTkButton(btn_frame, text="Clear", command=self.clear)
-        clear_btn.pack(side="left", padx=6)
-
-        export_btn = ctk.CTkButton(btn_frame, text="Export Heightmap", command=self.export_heightmap)
-        export_btn.pack(side="left", padx=6)
-
-        save_proj_btn = ctk.CTkButton(btn_frame, text="Save to Project", command=self.save_to_project)
-        save_proj_btn.pack(side="left", padx=6)
-
-        # Draw initial empty profile
-        self.redraw()
-
-    # ---------------------------------------------------
-    # EVENT: canvas resized
-    # ---------------------------------------------------
-    def on_resize(self, event):
-        # Update stored canvas size and redraw to fit new dimensions
-        self.canvas_width = max(1, event.width)
-        self.canvas_height = max(1, event.height)
-        self.redraw()
-
-    # ---------------------------------------------------
-    # DRAWING
-    # ---------------------------------------------------
-    def draw_height(self, event):
-        """Draw a point based on mouse position."""
-        # Translate mouse coordinates to local canvas coordinates (already local for tk events)
-        x = max(0, min(self.canvas_width - 1, event.x))
-        y = max(0, min(self.canvas_height - 1, event.y))
-
-        # Convert to index
-        index = int((x / max(1, self.canvas_width)) * len(self.points))
-        height_value = 1.0 - (y / max(1, self.canvas_height))  # normalized 0–1
-
-        if 0 <= index < len(self.points):
-            self.points[index] = float(height_value)
-
-        self.redraw()
-
-    def clear(self):
-        self.points.fill(0.0)
-        self.redraw()
-
-    # ---------------------------------------------------
-    # DRAW PROFILE
-    # ---------------------------------------------------
-    def redraw(self):
-        self.canvas.delete("all")
-
-        w = max(1, self.canvas_width)
-        h = max(1, self.canvas_height)
-
-        if len(self.points) < 2:
-            return
-
-        for i in range(len(self.points) - 1):
-            x1 = (i / (len(self.points) - 1)) * w
-            y1 = (1.0 - float(self.points[i])) * h
-
-            x2 = ((i + 1) / (len(self.points) - 1)) * w
-            y2 = (1.0 - float(self.points[i + 1])) * h
-
-            self.canvas.create_line(x1, y1, x2, y2, fill="black", width=2)
-
-        # Optionally draw a bounding rectangle
-        self.canvas.create_rectangle(0, 0, w - 1, h - 1, outline="#cccccc")
-
-    # ---------------------------------------------------
-    # EXPORT AS heightmap.txt USING JSON FORMAT (with Save dialog)
-    # ---------------------------------------------------
-    def export_heightmap(self):
-        heightmap_data = {
-            "points": [float(v) for v in self.points]
-        }
-
-        file_path = filedialog.asksaveasfilename(
-            title="Export Heightmap",
-            defaultextension=".txt",
-            filetypes=[("Heightmap Text", "*.txt"), ("JSON", "*.json"), ("All files", "*.*")],
-            initialfile="heightmap.txt"
-        )
-        if not file_path:
-            return
-
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(heightmap_data, f, indent=2)
-            messagebox.showinfo("Export Complete", f"Heightmap exported to:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Export Failed", f"Failed to export heightmap:\n{e}")
-
-    # ---------------------------------------------------
-    # Save the heightmap data into the in-memory project dict
-    # ---------------------------------------------------
-    def save_to_project(self):
-        self.planet_data["HEIGHTMAP"] = {"points": [float(v) for v in self.points]}
-        messagebox.showinfo("Saved", "Heightmap saved to project data (in-memory).")
+# Version/gui/heightmap_generator.py url=https://github.com/RoshanGamer7791/VisualSFSPlanetMaker/blob/a99c7d2a4bf2cb6abbc9dfa1fdaefb2ea0f44f80/Python%20Version/gui/heightmap_generator.py
+import queue
+import threading
+import tkinter as tk
+import customtkinter as ctk
+import numpy as np
+from tkinter import filedialog, messagebox
+
+from gui.render_scheduler import RenderScheduler
+from heightmap_brush import FALLOFFS, TOOLS, apply_stroke, stroke_span
+from heightmap_history import EditHistory
+from heightmap_io import FILETYPES, as_points, load_heightmap, save_heightmap
+from heightmap_lod import MinMaxPyramid
+from heightmap_procgen import GENERATORS, GenerationCancelled, generate
+from planet_model import PlanetModel
+
+RESOLUTIONS = ["200", "1000", "10000", "100000", "1000000"]
+MAX_POINTS = 16_000_000
+
+class HeightmapGUI:
+    """
+    Heightmap editor tab.
+
+    Changes made:
+    - Use a CTkFrame compatible with the other editor tabs (do NOT call parent.add inside this class;
+      main.py is expected to add the tab).
+    - Canvas resizes with the frame and redraws appropriately.
+    - Export now opens a Save dialog so user can choose where to save (JSON-in-.txt for SFS, or
+      binary .npy/.f32/.f16). Import memory-maps binary files instead of reading them into RAM.
+    - Added a 'Save to Project' button that stores the heightmap into the provided planet_data dict
+      under the key "HEIGHTMAP" (as {"points":[...]}) so other parts of the app can access it.
+    - The profile is a single persistent polyline whose coords are computed with NumPy;
+      edits only recompute the y values of the touched span.
+    - Brush tools (draw, raise, lower, smooth, flatten, noise) interpolate between mouse
+      events and edit the samples under the brush with one NumPy slice operation.
+    - Seeded generators (fractal/ridged noise, craters, thermal/hydraulic erosion) run on a
+      worker thread with progress and cancel; the result replaces the map when done.
+    - Undo/redo stores each stroke as (start, old slice) in a memory-capped ring buffer.
+    - Resolution is configurable (up to millions of points). Above two points per pixel the
+      profile is drawn from a min/max pyramid, one column per pixel, so redraw cost follows
+      the canvas width instead of the point count.
+    """
+
+    def __init__(self, parent, planet_data=None, canvas_width=800, canvas_height=400, points_count=200,
+                 undo_memory_mb=64):
+        self.parent = parent
+        self.planet_data = _planet_dict(planet_data)
+        self.model = planet_data if isinstance(planet_data, PlanetModel) else None
+
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+
+        # Heightmap data (points_count points by default) and its min/max LOD pyramid
+        self.default_count = max(2, int(points_count))
+        self.points = np.zeros(self.default_count, dtype=float)
+        self.pyramid = MinMaxPyramid(self.points)
+
+        # Undo/redo stores (start, old slice) per stroke, capped at undo_memory_mb
+        self.history = EditHistory(max_bytes=int(undo_memory_mb * 1024 * 1024))
+
+        # Main frame for this tab (don't call parent.add here; main will add the frame to its notebook)
+        self.frame = ctk.CTkFrame(parent)
+        self.frame.pack(fill="both", expand=True)
+
+        # Allow the canvas to expand
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+
+        # ---------------------------
+        # CANVAS (stretches properly)
+        # ---------------------------
+        self.canvas = tk.Canvas(
+            self.frame,
+            bg="white",
+            width=self.canvas_width,
+            height=self.canvas_height,
+            highlightthickness=0
+        )
+        self.canvas.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+
+        # Bind drawing and resizing
+        self.canvas.bind("<B1-Motion>", self.draw_height)
+        self.canvas.bind("<Button-1>", self.begin_stroke)
+        self.canvas.bind("<ButtonRelease-1>", self.end_stroke)
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.canvas.bind("<Control-z>", lambda e: self.undo())
+        self.canvas.bind("<Control-y>", lambda e: self.redo())
+        self.canvas.bind("<Control-Z>", lambda e: self.redo())
+
+        # Brush state: last pointer sample of the current stroke
+        self._stroke_last = None        # (index, height)
+        self._stroke_level = 0.0        # Flatten target, taken where the stroke started
+        self._rng = np.random.default_rng()
+
+        # ---------------------------
+        # BUTTONS (bottom row)
+        # ---------------------------
+        btn_frame = ctk.CTkFrame(self.frame)
+        btn_frame.grid(row=1, column=0, pady=8)
+
+        clear_btn = ctk.CTkButton(btn_frame, text="Clear", command=self.clear)
+        clear_btn.pack(side="left", padx=6)
+
+        ctk.CTkButton(btn_frame, text="Undo", width=60, command=self.undo).pack(side="left", padx=(6, 2))
+        ctk.CTkButton(btn_frame, text="Redo", width=60, command=self.redo).pack(side="left", padx=(2, 6))
+
+        import_btn = ctk.CTkButton(btn_frame, text="Import Heightmap", command=self.import_heightmap)
+        import_btn.pack(side="left", padx=6)
+
+        export_btn = ctk.CTkButton(btn_frame, text="Export Heightmap", command=self.export_heightmap)
+        export_btn.pack(side="left", padx=6)
+
+        save_proj_btn = ctk.CTkButton(btn_frame, text="Save to Project", command=self.save_to_project)
+        save_proj_btn.pack(side="left", padx=6)
+
+        ctk.CTkLabel(btn_frame, text="Points:").pack(side="left", padx=(12, 2))
+        self.resolution_var = ctk.StringVar(value=str(len(self.points)))
+        resolution_box = ctk.CTkComboBox(btn_frame, values=RESOLUTIONS, variable=self.resolution_var,
+                                         width=110, command=self.set_resolution)
+        resolution_box.pack(side="left", padx=6)
+        resolution_box.bind("<Return>", lambda e: self.set_resolution(self.resolution_var.get()))
+
+        # ---------------------------
+        # BRUSH (second row)
+        # ---------------------------
+        brush_frame = ctk.CTkFrame(self.frame)
+        brush_frame.grid(row=2, column=0, pady=(0, 8))
+
+        self.tool_var = ctk.StringVar(value="Draw")
+        ctk.CTkSegmentedButton(brush_frame, values=list(TOOLS), variable=self.tool_var).pack(side="left", padx=6)
+
+        ctk.CTkLabel(brush_frame, text="Radius (px):").pack(side="left", padx=(12, 2))
+        self.brush_radius = ctk.DoubleVar(value=0.0)
+        ctk.CTkSlider(brush_frame, from_=0, to=100, variable=self.brush_radius, width=120).pack(side="left")
+
+        ctk.CTkLabel(brush_frame, text="Strength:").pack(side="left", padx=(12, 2))
+        self.brush_strength = ctk.DoubleVar(value=0.5)
+        ctk.CTkSlider(brush_frame, from_=0.0, to=1.0, variable=self.brush_strength, width=100).pack(side="left")
+
+        self.falloff_var = ctk.StringVar(value=FALLOFFS[0])
+        ctk.CTkOptionMenu(brush_frame, values=list(FALLOFFS), variable=self.falloff_var, width=100).pack(side="left", padx=6)
+
+        # ---------------------------
+        # GENERATORS (third row, run on a worker thread)
+        # ---------------------------
+        gen_frame = ctk.CTkFrame(self.frame)
+        gen_frame.grid(row=3, column=0, pady=(0, 8))
+
+        self.generator_var = ctk.StringVar(value=next(iter(GENERATORS)))
+        ctk.CTkOptionMenu(gen_frame, values=list(GENERATORS), variable=self.generator_var, width=150).pack(side="left", padx=6)
+
+        ctk.CTkLabel(gen_frame, text="Seed:").pack(side="left", padx=(8, 2))
+        self.seed_var = ctk.StringVar(value="0")
+        ctk.CTkEntry(gen_frame, textvariable=self.seed_var, width=70).pack(side="left")
+
+        ctk.CTkLabel(gen_frame, text="Detail (blank = default):").pack(side="left", padx=(8, 2))
+        self.detail_var = ctk.StringVar(value="")
+        ctk.CTkEntry(gen_frame, textvariable=self.detail_var, width=50).pack(side="left")
+
+        self.generate_btn = ctk.CTkButton(gen_frame, text="Generate", width=90, command=self.start_generation)
+        self.generate_btn.pack(side="left", padx=6)
+        self.cancel_btn = ctk.CTkButton(gen_frame, text="Cancel", width=70, state="disabled",
+                                        command=self.cancel_generation)
+        self.cancel_btn.pack(side="left", padx=(0, 6))
+
+        self.gen_progress = ctk.CTkProgressBar(gen_frame, width=140)
+        self.gen_progress.set(0.0)
+        self.gen_progress.pack(side="left", padx=6)
+
+        self._gen_cancel = None         # threading.Event of the running generator
+        self._gen_results = None        # queue the worker puts its outcome in
+        self._gen_fraction = 0.0        # written by the worker, read by the poll loop
+
+        # Persistent canvas items (created once, updated through coords())
+        self._line_item = None
+        self._border_item = None
+        self._line_coords = None    # flat [x0, y0, x1, y1, ...] NumPy array
+        self._drawn_shape = None    # (points, width, height) the coords were built for
+
+        # Redraws are coalesced to one per frame; edits accumulate a dirty span
+        self.scheduler = RenderScheduler.for_widget(self.canvas)
+        self._dirty_span = None     # (start, stop) of points changed since the last frame
+        self._full_redraw = False
+
+        # Draw initial empty profile
+        self.redraw()
+
+    # ---------------------------------------------------
+    # EVENT: canvas resized
+    # ---------------------------------------------------
+    def on_resize(self, event):
+        # Update stored canvas size and redraw to fit new dimensions
+        self.canvas_width = max(1, event.width)
+        self.canvas_height = max(1, event.height)
+        self.request_redraw()
+
+    # ---------------------------------------------------
+    # DRAWING
+    # ---------------------------------------------------
+    def _event_sample(self, event):
+        """Mouse position -> (sample index, normalized 0–1 height)."""
+        # Translate mouse coordinates to local canvas coordinates (already local for tk events)
+        x = max(0, min(self.canvas_width - 1, event.x))
+        y = max(0, min(self.canvas_height - 1, event.y))
+
+        index = int((x / max(1, self.canvas_width)) * len(self.points))
+        height_value = 1.0 - (y / max(1, self.canvas_height))
+        return min(index, len(self.points) - 1), float(height_value)
+
+    def begin_stroke(self, event):
+        self.canvas.focus_set()     # so Ctrl+Z / Ctrl+Y reach the canvas
+        self.history.begin()
+        index, height = self._event_sample(event)
+        self._stroke_last = (index, height)
+        self._stroke_level = float(self.points[index])
+        self._apply_brush(index, height, index, height)
+
+    def draw_height(self, event):
+        """Continue the stroke: apply the brush along the segment since the last event."""
+        if self._stroke_last is None:
+            self.begin_stroke(event)
+            return
+        index, height = self._event_sample(event)
+        last_index, last_height = self._stroke_last
+        self._stroke_last = (index, height)
+        self._apply_brush(last_index, last_height, index, height)
+
+    def end_stroke(self, event=None):
+        self._stroke_last = None
+        self.history.commit(self.points)
+
+    def _apply_brush(self, i0, h0, i1, h1):
+        tool = self.tool_var.get()
+        if tool == "Flatten":
+            h0 = h1 = self._stroke_level
+        # Radius is chosen in pixels so the brush feels the same at any resolution
+        radius = round(self.brush_radius.get() * len(self.points) / max(1, self.canvas_width))
+        self.history.record(self.points, *stroke_span(len(self.points), i0, i1, radius))
+        start, stop = apply_stroke(self.points, tool, i0, h0, i1, h1, radius=radius,
+                                   strength=self.brush_strength.get(), falloff=self.falloff_var.get(),
+                                   rng=self._rng)
+        if stop > start:
+            self.request_redraw(start, stop)
+
+    def clear(self):
+        self.history.begin()
+        self.history.record(self.points, 0, len(self.points))
+        self.points.fill(0.0)
+        self.history.commit(self.points)
+        self.request_redraw(0, len(self.points))
+
+    def undo(self):
+        span = self.history.undo(self.points)
+        if span:
+            self.request_redraw(*span)
+
+    def redo(self):
+        span = self.history.redo(self.points)
+        if span:
+            self.request_redraw(*span)
+
+    def request_redraw(self, start=None, stop=None):
+        """Schedule a redraw of points[start:stop] (everything when no span is given)."""
+        if start is None:
+            self._full_redraw = True
+        elif self._dirty_span is None:
+            self._dirty_span = (start, stop)
+        else:
+            self._dirty_span = (min(start, self._dirty_span[0]), max(stop, self._dirty_span[1]))
+        self.scheduler.request(self._render_frame)
+
+    def _render_frame(self):
+        span, self._dirty_span = self._dirty_span, None
+        if self._full_redraw:
+            self._full_redraw = False
+            self.redraw()
+        elif span is not None:
+            self.redraw_span(*span)
+
+    # ---------------------------------------------------
+    # DRAW PROFILE
+    # ---------------------------------------------------
+    def redraw(self):
+        """Recompute every coordinate (size or point count changed) and update the polyline."""
+        w = max(1, self.canvas_width)
+        h = max(1, self.canvas_height)
+
+        if self._line_item is None:
+            self._line_item = self.canvas.create_line(0, 0, 0, 0, fill="black", width=2)
+            self._border_item = self.canvas.create_rectangle(0, 0, 0, 0, outline="#cccccc")
+        self.canvas.coords(self._border_item, 0, 0, w - 1, h - 1)
+
+        n = len(self.points)
+        if n < 2:
+            self.canvas.itemconfigure(self._line_item, state="hidden")
+            self._line_coords = None
+            return
+
+        if n <= 2 * w:
+            # Few enough points: draw every sample
+            self._line_coords = np.empty(2 * n)
+            self._line_coords[0::2] = np.linspace(0.0, w, n)
+            self._line_coords[1::2] = (1.0 - self.points) * h
+        else:
+            # Level of detail: one min/max pair per pixel column
+            self._line_coords = np.empty(4 * w)
+            self._fill_columns(0, w, w, h)
+
+        self._drawn_shape = (n, w, h)
+        self.canvas.itemconfigure(self._line_item, state="normal")
+        self.canvas.coords(self._line_item, self._line_coords.tolist())
+
+    def redraw_span(self, start, stop):
+        """Refresh the LOD pyramid and only the coordinates that cover points[start:stop]."""
+        self.pyramid.update(start, stop)
+
+        n = len(self.points)
+        w = max(1, self.canvas_width)
+        h = max(1, self.canvas_height)
+        if self._line_coords is None or self._drawn_shape != (n, w, h):
+            self.redraw()
+            return
+
+        if n <= 2 * w:
+            self._line_coords[2 * start + 1:2 * stop:2] = (1.0 - self.points[start:stop]) * h
+        else:
+            first = start * w // n
+            last = min(w, (stop - 1) * w // n + 2)
+            self._fill_columns(first, last, w, h)
+        self.canvas.coords(self._line_item, self._line_coords.tolist())
+
+    def _fill_columns(self, first, last, w, h):
+        """Write the min/max zigzag of pixel columns [first, last) into the coords array."""
+        lows, highs = self.pyramid.columns(w, first, last)
+        x = np.arange(first, last) + 0.5
+        y_high = (1.0 - highs) * h
+        y_low = (1.0 - lows) * h
+        # Alternate the vertical stroke direction so neighbouring columns join cleanly
+        even = (np.arange(first, last) % 2) == 0
+        block = self._line_coords[4 * first:4 * last]
+        block[0::4] = x
+        block[1::4] = np.where(even, y_high, y_low)
+        block[2::4] = x
+        block[3::4] = np.where(even, y_low, y_high)
+
+    # ---------------------------------------------------
+    # PROCEDURAL GENERATION (worker thread, progress + cancel)
+    # ---------------------------------------------------
+    def start_generation(self):
+        if self._gen_cancel is not None:
+            return
+        try:
+            seed = int(self.seed_var.get() or 0)
+        except ValueError:
+            messagebox.showerror("Generate", "Seed must be an integer.")
+            return
+        detail = self.detail_var.get().strip()
+        try:
+            detail = int(detail) if detail else None
+        except ValueError:
+            messagebox.showerror("Generate", "Detail must be an integer (or empty for the default).")
+            return
+
+        # Snapshot on the Tk thread; the worker never sees self.points
+        points = np.array(self.points, dtype=float)
+        self._gen_cancel = threading.Event()
+        self._gen_results = queue.Queue()
+        self._gen_fraction = 0.0
+        threading.Thread(
+            target=self._run_generator,
+            args=(self.generator_var.get(), points, seed, detail, self._gen_cancel, self._gen_results),
+            daemon=True
+        ).start()
+
+        self.generate_btn.configure(state="disabled")
+        self.cancel_btn.configure(state="normal")
+        self.gen_progress.set(0.0)
+        self.frame.after(50, self._poll_generation)
+
+    def cancel_generation(self):
+        if self._gen_cancel is not None:
+            self._gen_cancel.set()
+
+    def _run_generator(self, name, points, seed, detail, cancel, results):
+        """Worker thread: never touches Tk, only the results queue."""
+        def progress(fraction):
+            self._gen_fraction = fraction
+        try:
+            results.put(("done", generate(name, points, seed=seed, detail=detail,
+                                          progress=progress, cancel=cancel)))
+        except GenerationCancelled:
+            results.put(("cancelled", None))
+        except Exception as e:
+            results.put(("error", e))
+
+    def _poll_generation(self):
+        self.gen_progress.set(self._gen_fraction)
+        try:
+            status, value = self._gen_results.get_nowait()
+        except queue.Empty:
+            self.frame.after(50, self._poll_generation)
+            return
+
+        # Finished just as it was cancelled (e.g. by a planet switch): drop the result
+        cancelled = self._gen_cancel.is_set()
+        self._gen_cancel = None
+        self._gen_results = None
+        self.generate_btn.configure(state="normal")
+        self.cancel_btn.configure(state="disabled")
+        if status == "done" and not cancelled:
+            self.gen_progress.set(1.0)
+            self.set_points(value, undoable=True)
+        else:
+            self.gen_progress.set(0.0)
+            if status == "error":
+                messagebox.showerror("Generate", f"Generation failed:\n{value}")
+
+    # ---------------------------------------------------
+    # RESOLUTION
+    # ---------------------------------------------------
+    def set_points(self, points, undoable=False):
+        """Replace the heightmap array (any length >= 2) and redraw.
+        Float arrays, including memmaps, are used as-is rather than copied.
+
+        With undoable=True and an unchanged length the new values are written
+        into the current array as one undo step; otherwise history is reset.
+        """
+        points = as_points(points)
+        if undoable and len(points) == len(self.points):
+            self.history.begin()
+            self.history.record(self.points, 0, len(self.points))
+            self.points[:] = points
+            self.history.commit(self.points)
+            self.request_redraw(0, len(self.points))
+            return
+
+        self.history.clear()
+        self.points = points
+        self.pyramid = MinMaxPyramid(self.points)
+        self.resolution_var.set(str(len(self.points)))
+        self.request_redraw()
+
+    def set_resolution(self, count):
+        """Resample the current heightmap to `count` points."""
+        try:
+            count = int(float(count))
+        except (TypeError, ValueError):
+            self.resolution_var.set(str(len(self.points)))
+            return
+        count = max(2, min(MAX_POINTS, count))
+        if count == len(self.points):
+            return
+        old = self.points
+        self.set_points(np.interp(np.linspace(0.0, len(old) - 1, count), np.arange(len(old)), old))
+
+    # ---------------------------------------------------
+    # EXPORT (JSON-in-.txt for SFS, or binary .npy/.f32/.f16) with Save dialog
+    # ---------------------------------------------------
+    def export_heightmap(self):
+        file_path = filedialog.asksaveasfilename(
+            title="Export Heightmap",
+            defaultextension=".txt",
+            filetypes=FILETYPES,
+            initialfile="heightmap.txt"
+        )
+        if not file_path:
+            return
+
+        try:
+            save_heightmap(file_path, self.points)
+            messagebox.showinfo("Export Complete", f"Heightmap exported to:\n{file_path}")
+        except Exception as e:
+            messagebox.showerror("Export Failed", f"Failed to export heightmap:\n{e}")
+
+    # ---------------------------------------------------
+    # IMPORT (binary formats are memory-mapped, not read into RAM)
+    # ---------------------------------------------------
+    def import_heightmap(self):
+        file_path = filedialog.askopenfilename(title="Import Heightmap", filetypes=FILETYPES)
+        if not file_path:
+            return
+
+        try:
+            self.set_points(load_heightmap(file_path))
+        except Exception as e:
+            messagebox.showerror("Import Failed", f"Failed to import heightmap:\n{e}")
+
+    # ---------------------------------------------------
+    # Switch to another planet of the project
+    # ---------------------------------------------------
+    def update_data(self, planet_data):
+        """Point at another planet: its saved HEIGHTMAP, or a flat default map, replaces the current one."""
+        self.planet_data = _planet_dict(planet_data)
+        self.model = planet_data if isinstance(planet_data, PlanetModel) else None
+        # A generation still running belongs to the previous planet
+        self.cancel_generation()
+        try:
+            saved = self.planet_data.get("HEIGHTMAP")
+        except ValueError as e:
+            # A lazily loaded HEIGHTMAP is only parsed here (see sfs_loader.LazyPlanet)
+            messagebox.showerror("Heightmap", f"The planet's HEIGHTMAP could not be read:\n{e}")
+            saved = None
+        points = saved.get("points") if isinstance(saved, dict) else None
+        if points is not None and len(points) >= 2:
+            self.set_points(points)
+        else:
+            # Never carry the previous planet's points (or its undo history) over
+            self.set_points(np.zeros(self.default_count, dtype=float))
+
+    # ---------------------------------------------------
+    # Save the heightmap data into the in-memory project dict
+    # ---------------------------------------------------
+    def save_to_project(self):
+        # Kept as an array; it only becomes a JSON list when the planet is exported
+        self.planet_data["HEIGHTMAP"] = {"points": np.array(self.points, dtype=float)}
+        if self.model is not None:
+            self.model.touch()      # HEIGHTMAP is not a model section; let the autosave know
+        messagebox.showinfo("Saved", "Heightmap saved to project data (in-memory).")
+
+
+def _planet_dict(planet_data):
+    # HEIGHTMAP is not part of the model; it lives in the planet dict the model was read from
+    if isinstance(planet_data, PlanetModel):
+        return planet_data.source
+    return planet_data if isinstance(planet_data, dict) else {}
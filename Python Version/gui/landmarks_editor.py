@@ -1,66 +1,64 @@
 import customtkinter as ctk
 
+from gui.model_binding import ModelBindings
+from gui.row_pool import RowPool
+from planet_model import Landmark, PlanetModel
+
 class LandmarksEditor:
     def __init__(self, parent, planet_data):
         self.parent = parent
-        self.planet_data = planet_data
+        # planet_data may be a planet dict or a planet_model.PlanetModel
+        self.model = PlanetModel.coerce(planet_data)
         self.frame = ctk.CTkFrame(self.parent)
         self.frame.pack(fill="both", expand=True)
-        self.landmark_entries = []
         self.build_ui()
 
     def build_ui(self):
-        landmarks = self.planet_data.get("LANDMARKS", [])
+        # Landmark rows live in their own container so they stay above the button
+        container = ctk.CTkFrame(self.frame, fg_color="transparent")
+        container.pack(fill="x")
+        self.landmark_pool = RowPool(container, self._make_landmark_row, fill="x", padx=5, pady=2)
+        self.landmark_entries = self.landmark_pool.active
 
         # Existing landmarks
-        for lm in landmarks:
-            self.add_landmark_ui(lm)
+        self.update_data(self.model)
 
         # Add new landmark button
         ctk.CTkButton(self.frame, text="Add Landmark", command=lambda: self.add_landmark_ui()).pack(padx=5, pady=5)
 
-    def add_landmark_ui(self, data=None):
-        data = data or {"name": "", "angle": 0.0, "startAngle": 0.0, "endAngle": 0.0}
-        f_frame = ctk.CTkFrame(self.frame)
-        f_frame.pack(fill="x", padx=5, pady=2)
+    def update_data(self, planet_data):
+        """Show another planet's LANDMARKS, reusing the existing rows."""
+        self.model = PlanetModel.coerce(planet_data)
+        landmarks = self.model.landmarks
+        for lm, data in zip(self.landmark_pool.resize(len(landmarks)), landmarks):
+            self._fill_landmark(lm, data)
 
-        name_var = ctk.StringVar(value=data.get("name", ""))
-        angle_var = ctk.DoubleVar(value=data.get("angle", 0.0))
-        start_var = ctk.DoubleVar(value=data.get("startAngle", 0.0))
-        end_var = ctk.DoubleVar(value=data.get("endAngle", 0.0))
+    def _make_landmark_row(self, container):
+        f_frame = ctk.CTkFrame(container)
+        lm = {"frame": f_frame, "item": None, "bindings": ModelBindings()}
 
-        for label, var in [("Name", name_var), ("Angle", angle_var), ("Start Angle", start_var), ("End Angle", end_var)]:
+        for label, name, var in [("Name", "name", ctk.StringVar()), ("Angle", "angle", ctk.DoubleVar()),
+                                 ("Start Angle", "startAngle", ctk.DoubleVar()), ("End Angle", "endAngle", ctk.DoubleVar())]:
+            lm["bindings"].add(var, lambda: lm["item"], name, str if name == "name" else float)
             ctk.CTkLabel(f_frame, text=label).pack(anchor="w", padx=5)
             ctk.CTkEntry(f_frame, textvariable=var).pack(fill="x", padx=5, pady=2)
 
         # Remove button
-        ctk.CTkButton(f_frame, text="Remove", command=lambda: self.remove_landmark(f_frame)).pack(padx=5, pady=2, anchor="e")
+        ctk.CTkButton(f_frame, text="Remove", command=lambda: self.remove_landmark(lm)).pack(padx=5, pady=2, anchor="e")
+        return lm
 
-        self.landmark_entries.append({
-            "frame": f_frame,
-            "name": name_var,
-            "angle": angle_var,
-            "startAngle": start_var,
-            "endAngle": end_var
-        })
+    def _fill_landmark(self, lm, item):
+        lm["item"] = item
+        lm["bindings"].rebind()
 
-    def remove_landmark(self, frame):
-        for lm in self.landmark_entries:
-            if lm["frame"] == frame:
-                lm["frame"].destroy()
-                self.landmark_entries.remove(lm)
-                break
-
-    def get_data(self):
-        landmarks_list = []
-
-        for lm in self.landmark_entries:
-            landmarks_list.append({
-                "name": lm["name"].get(),
-                "angle": float(lm["angle"].get()),
-                "startAngle": float(lm["startAngle"].get()),
-                "endAngle": float(lm["endAngle"].get())
-            })
+    def add_landmark_ui(self, data=None):
+        item = Landmark.from_json(data or {})
+        self.model.landmarks.append(item)
+        self._fill_landmark(self.landmark_pool.acquire(), item)
 
-        return {"LANDMARKS": landmarks_list}
+    def remove_landmark(self, lm):
+        self.model.landmarks[:] = [item for item in self.model.landmarks if item is not lm["item"]]
+        self.landmark_pool.release(lm)
 
+    def get_data(self):
+        return {"LANDMARKS": [item.to_json() for item in self.model.landmarks]}
@@ -0,0 +1,47 @@
+# gui/lazy_notebook.py
+from tkinter import ttk
+
+
+class LazyNotebook(ttk.Notebook):
+    """
+    ttk.Notebook whose pages are only built the first time they are selected.
+
+    add_lazy() adds an empty placeholder page right away, so every tab title is
+    visible at startup; factory(placeholder) runs on first selection and must
+    return an object with a .frame, which is packed into the placeholder.
+
+    Usage:
+        notebook = LazyNotebook(root)
+        notebook.add_lazy("Orbit", lambda parent: OrbitEditor(parent, data), on_built=remember)
+    """
+
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self._pending = {}          # placeholder widget path -> (factory, on_built)
+        self.bind("<<NotebookTabChanged>>", lambda e: self.build_selected(), add="+")
+
+    def add_lazy(self, text, factory, on_built=None):
+        placeholder = ttk.Frame(self)
+        self.add(placeholder, text=text)
+        self._pending[str(placeholder)] = (factory, on_built)
+        return placeholder
+
+    def is_built(self, placeholder):
+        return str(placeholder) not in self._pending
+
+    def build(self, placeholder):
+        """Build the page now if it has not been built yet; returns the page object or None."""
+        entry = self._pending.pop(str(placeholder), None)
+        if entry is None:
+            return None
+        factory, on_built = entry
+        page = factory(self.nametowidget(str(placeholder)))
+        page.frame.pack(fill="both", expand=True)
+        if on_built:
+            on_built(page)
+        return page
+
+    def build_selected(self):
+        selected = self.select()
+        if selected:
+            self.build(selected)
@@ -0,0 +1,179 @@
+# gui/library_browser.py
+from tkinter import filedialog, ttk
+import customtkinter as ctk
+
+from gui.background import BackgroundTask
+from planet_library import PLANETS_DIR, PlanetLibrary
+
+FILTER_DEBOUNCE_MS = 80
+# Rows put in the list at once; the match count is always exact
+DISPLAY_LIMIT = 500
+
+# (label, PlanetRecord field, column width)
+COLUMNS = (
+    ("Name", "name", 160),
+    ("Parent", "parent", 100),
+    ("Radius (m)", "radius", 100),
+    ("Gravity", "gravity", 70),
+    ("SMA (m)", "semi_major_axis", 110),
+    ("Atmosphere (m)", "atmosphere_height", 110),
+    ("Formula lines", "formula_lines", 90),
+)
+# (label, field) pairs that get min/max filter entries
+RANGE_FILTERS = (
+    ("Radius", "radius"),
+    ("Gravity", "gravity"),
+    ("SMA", "semi_major_axis"),
+    ("Atmosphere", "atmosphere_height"),
+    ("Formula lines", "formula_lines"),
+)
+
+
+class LibraryBrowser:
+    """
+    Browser panel over a planets folder (see planet_library.PlanetLibrary).
+
+    The index refresh runs on a worker thread; typing in the name or range
+    filters re-queries the in-memory index (debounced), which stays instant
+    for folders of 10k planets. Double-clicking a row calls on_open(path).
+
+    Usage:
+      tab = LibraryBrowser(parent, on_open=app.open_planet_file)
+      parent_tab_control.add(tab.frame, text="Library")
+    """
+
+    def __init__(self, parent, folder=PLANETS_DIR, on_open=None):
+        self.parent = parent
+        self.on_open = on_open
+        self.library = PlanetLibrary(folder)
+        self.frame = ctk.CTkFrame(self.parent)
+        self.frame.pack(fill="both", expand=True)
+
+        self._filter_after_id = None
+        self._shown_paths = {}      # tree item id -> planet path
+
+        self.build_ui()
+        self.refresh_task = BackgroundTask(self.tree, self._refresh_done, self._refresh_failed)
+        self.refresh()
+
+    def build_ui(self):
+        toolbar = ctk.CTkFrame(self.frame)
+        toolbar.pack(fill="x", padx=8, pady=(8, 4))
+        ctk.CTkButton(toolbar, text="Open Folder...", command=self.choose_folder).pack(side="left", padx=4, pady=4)
+        ctk.CTkButton(toolbar, text="Refresh", width=80, command=self.refresh).pack(side="left", padx=4, pady=4)
+        ctk.CTkLabel(toolbar, text="Name:").pack(side="left", padx=(12, 4))
+        self.name_var = ctk.StringVar()
+        ctk.CTkEntry(toolbar, textvariable=self.name_var, width=180).pack(side="left", padx=4)
+        self.name_var.trace_add("write", lambda *_: self.schedule_filter())
+        self.status_label = ctk.CTkLabel(toolbar, text="")
+        self.status_label.pack(side="left", padx=10)
+
+        ranges = ctk.CTkFrame(self.frame)
+        ranges.pack(fill="x", padx=8, pady=4)
+        self.range_vars = {}
+        for column, (label, field) in enumerate(RANGE_FILTERS):
+            ctk.CTkLabel(ranges, text=f"{label} (min / max)").grid(row=0, column=column, padx=4, pady=(4, 0))
+            low, high = ctk.StringVar(), ctk.StringVar()
+            cell = ctk.CTkFrame(ranges, fg_color="transparent")
+            cell.grid(row=1, column=column, padx=4, pady=(0, 4))
+            ctk.CTkEntry(cell, textvariable=low, width=70).pack(side="left", padx=(0, 2))
+            ctk.CTkEntry(cell, textvariable=high, width=70).pack(side="left")
+            for var in (low, high):
+                var.trace_add("write", lambda *_: self.schedule_filter())
+            self.range_vars[field] = (low, high)
+
+        table = ctk.CTkFrame(self.frame)
+        table.pack(fill="both", expand=True, padx=8, pady=(4, 8))
+        self.tree = ttk.Treeview(table, columns=[field for _, field, _ in COLUMNS], show="headings")
+        for label, field, width in COLUMNS:
+            self.tree.heading(field, text=label)
+            self.tree.column(field, width=width, anchor="w" if field in ("name", "parent") else "e")
+        scroll = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+        self.tree.bind("<Double-1>", self.on_double_click)
+
+    # --------------------
+    # Index refresh (worker thread)
+    # --------------------
+    def choose_folder(self):
+        folder = filedialog.askdirectory(title="Select a planets folder")
+        if folder:
+            self.library = PlanetLibrary(folder)
+            self.refresh()
+
+    def refresh(self):
+        self.status_label.configure(text="Indexing...")
+        self.refresh_task.submit(_refreshed_library, self.library.folder)
+
+    def _refresh_done(self, result):
+        library, parsed = result
+        if library.folder != self.library.folder:
+            return          # a different folder was chosen meanwhile
+        self.library = library
+        self.apply_filter(parsed)
+
+    def _refresh_failed(self, error):
+        self.status_label.configure(text=f"Indexing failed: {error}")
+
+    # --------------------
+    # Filtering
+    # --------------------
+    def schedule_filter(self):
+        if self._filter_after_id is not None:
+            self.frame.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.frame.after(FILTER_DEBOUNCE_MS, self.apply_filter)
+
+    def _ranges(self):
+        ranges = {}
+        for field, (low_var, high_var) in self.range_vars.items():
+            bounds = []
+            for var in (low_var, high_var):
+                try:
+                    bounds.append(float(var.get()))
+                except ValueError:
+                    bounds.append(None)     # empty or half-typed: no bound
+            if bounds != [None, None]:
+                ranges[field] = tuple(bounds)
+        return ranges
+
+    def apply_filter(self, parsed=None):
+        self._filter_after_id = None
+        matches = self.library.search(self.name_var.get(), **self._ranges())
+
+        self.tree.delete(*self.tree.get_children())
+        self._shown_paths = {}
+        for record in matches[:DISPLAY_LIMIT]:
+            values = [_format_cell(getattr(record, field)) for _, field, _ in COLUMNS]
+            if record.error:
+                values[1] = "(unreadable)"
+            item = self.tree.insert("", "end", values=values)
+            self._shown_paths[item] = record.path
+
+        status = f"{len(matches)} of {len(self.library.records)} planets"
+        if len(matches) > DISPLAY_LIMIT:
+            status += f" (first {DISPLAY_LIMIT} shown)"
+        if parsed:
+            status += f", {parsed} file(s) re-indexed"
+        self.status_label.configure(text=status)
+
+    def on_double_click(self, event):
+        item = self.tree.identify_row(event.y)
+        if item and self.on_open:
+            self.on_open(self._shown_paths[item])
+
+
+def _refreshed_library(folder):
+    """Worker thread: build a fresh index so the one in use is never half-updated."""
+    library = PlanetLibrary(folder)
+    parsed = library.refresh()
+    return library, parsed
+
+
+def _format_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:,.6g}" if abs(value) < 1e6 else f"{value:,.0f}"
+    return str(value)
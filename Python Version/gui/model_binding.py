@@ -0,0 +1,84 @@
+# gui/model_binding.py
+import tkinter as tk
+
+
+class ModelBindings:
+    """
+    Two-way links between Tk variables and fields of planet_model sections.
+
+    add(var, section, name) links `var` to getattr(section(), name). Typing
+    into a widget writes the converted value to the model right away; values
+    that do not convert yet (an empty or half-typed number) are ignored, so
+    the model always holds the last valid value. Changes made to the model
+    elsewhere reach the variables through the sections' change listeners.
+
+    `section` is a callable so an editor can switch to another model: point
+    it at the new sections, then call rebind().
+
+    Usage:
+      self.bindings = ModelBindings()
+      self.bindings.add(self.height, lambda: self.model.atmosphere_physics, "height")
+      self.bindings.rebind()
+    """
+
+    def __init__(self):
+        self._links = []            # (var, section getter, name, convert)
+        self._by_field = {}         # (id(section), name) -> [link]
+        self._watched = []          # sections whose listeners include ours
+        self._syncing = False
+        self._writing = None        # link whose variable is being copied to the model
+
+    def add(self, var, section, name, convert=float):
+        link = (var, section, name, convert)
+        self._links.append(link)
+        var.trace_add("write", lambda *_: self._var_written(link))
+        return var
+
+    def rebind(self):
+        """Listen to the sections the links point at now and load their values."""
+        for section in self._watched:
+            section.unsubscribe(self._model_changed)
+        self._watched = []
+        self._by_field = {}
+        for link in self._links:
+            section = link[1]()
+            self._by_field.setdefault((id(section), link[2]), []).append(link)
+            if not any(section is watched for watched in self._watched):
+                section.subscribe(self._model_changed)
+                self._watched.append(section)
+        self.refresh()
+
+    def refresh(self):
+        """Copy every linked model value into its variable."""
+        self._syncing = True
+        try:
+            for var, section, name, _ in self._links:
+                var.set(getattr(section(), name))
+        finally:
+            self._syncing = False
+
+    def _var_written(self, link):
+        if self._syncing:
+            return
+        var, section, name, convert = link
+        try:
+            value = convert(var.get())
+        except (ValueError, TypeError, tk.TclError):
+            return
+        # The variable being typed into is not rewritten (that would turn "1." into "1.0")
+        self._writing = link
+        try:
+            setattr(section(), name, value)
+        finally:
+            self._writing = None
+
+    def _model_changed(self, section, name, value):
+        if self._syncing:
+            return
+        self._syncing = True
+        try:
+            for link in self._by_field.get((id(section), name), ()):
+                if link is not self._writing:
+                    link[0].set(value)
+        finally:
+            self._syncing = False
@@ -1,37 +1,71 @@
 # gui/orbit_editor.py
 import math
+import time
 import tkinter as tk
 import customtkinter as ctk
 
+from gui.model_binding import ModelBindings
+from gui.render_scheduler import RenderScheduler
+from kepler import gravitational_parameter, orbital_period, propagate, time_to_periapsis
+from orbit_geometry import apsides, to_pixels, viewport_orbit
+from planet_model import PlanetModel
+
+# Max distance (px) between the drawn polyline and the true ellipse
+ORBIT_TOLERANCE_PX = 0.25
+
+# Parent body defaults (the real Sun), used for the animation and period when
+# the parent planet is not loaded
+DEFAULT_PARENT_GRAVITY = 274.0      # m/s^2
+DEFAULT_PARENT_RADIUS = 6.957e8     # m
+
+# Playback: one frame every ANIMATION_FRAME_MS, one full orbit per ANIMATION_ORBIT_SECONDS
+ANIMATION_FRAME_MS = 33
+ANIMATION_ORBIT_SECONDS = 10.0
+
+def _orbit_field(name):
+    """Editor attribute that lives in self.model.orbit.<name>."""
+    return property(lambda self: getattr(self.model.orbit, name),
+                    lambda self, value: setattr(self.model.orbit, name, value))
+
+
 class OrbitEditor:
     """
     OrbitEditor (CTk) - fixed canvas 500x500.
 
     Usage:
-      tab = OrbitEditor(parent, planet_data)
+      tab = OrbitEditor(parent, planet_data, find_body=app.find_body)
       parent_tab_control.add(tab.frame, text="Orbit")
 
+    find_body(name) returns the solar_system.Body of a loaded planet (or
+    None); the parent's gravity and radius come from it, else from the
+    DEFAULT_PARENT_* constants.
+
     Public API:
       - .frame : CTkFrame container (for adding to notebook)
       - .get_data() -> dict with ORBIT_DATA exactly matching required SFS structure
-      - .save() updates internal planet_data dict from UI (optional)
+      - .save() writes ORBIT_DATA back into the source planet dict (optional)
+
+    The orbit elements are stored in a planet_model.OrbitData section; the
+    editor follows changes made to it elsewhere through its change listener.
     """
 
-    def __init__(self, parent, planet_data=None):
+    parent_name = _orbit_field("parent")
+    semiMajorAxis = _orbit_field("semiMajorAxis")      # meters
+    eccentricity = _orbit_field("eccentricity")
+    arg_peri = _orbit_field("argumentOfPeriapsis")      # degrees
+    direction = _orbit_field("direction")               # 1 or -1
+    multiplierSOI = _orbit_field("multiplierSOI")
+
+    def __init__(self, parent, planet_data=None, find_body=None):
         self.parent = parent
-        self.planet_data = planet_data or {}
+        self.find_body = find_body
+        # planet_data may be a planet dict or a planet_model.PlanetModel;
+        # missing values get the SFS defaults from planet_model.OrbitData
+        self.model = PlanetModel.coerce(planet_data)
+        self.bindings = ModelBindings()
         self.frame = ctk.CTkFrame(self.parent)
         self.frame.pack(fill="both", expand=True)
 
-        # default values (match SFS defaults you provided)
-        orbit = (self.planet_data.get("ORBIT_DATA") or {})
-        self.parent_name = orbit.get("parent", "Sun")
-        self.semiMajorAxis = float(orbit.get("semiMajorAxis", 7480000000.0))  # meters
-        self.eccentricity = float(orbit.get("eccentricity", 0.0))
-        self.arg_peri = float(orbit.get("argumentOfPeriapsis", 0.0))  # degrees
-        self.direction = int(orbit.get("direction", 1))  # 1 or -1
-        self.multiplierSOI = float(orbit.get("multiplierSOI", 2.5))
-
         # UI constants
         self.canvas_size = 500
         self.center = (self.canvas_size // 2, self.canvas_size // 2)
@@ -42,10 +76,22 @@ class OrbitEditor:
         # State
         self.dragging = False
         self.dot_pos = (0, 0)  # pixel coords on canvas
+        self.animating = False
+        self.sim_time = 0.0         # seconds since periapsis passage
+        self._anim_id = None
+        self._anim_last = 0.0
 
         self.build_ui()
+        self.scheduler = RenderScheduler.for_widget(self.canvas)
+        self.model.orbit.subscribe(self._on_orbit_changed)
+        self.bindings.rebind()
+        self.load_parent_body()
         self.redraw()
 
+    def request_redraw(self):
+        """Coalesced redraw: runs at most once per frame however many events arrive."""
+        self.scheduler.request(self.redraw)
+
     def build_ui(self):
         left = ctk.CTkFrame(self.frame)
         left.pack(side="left", fill="both", expand=False, padx=8, pady=8)
@@ -62,12 +108,13 @@ class OrbitEditor:
         self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)            # Windows
         self.canvas.bind("<Button-4>", self.on_mouse_wheel)             # Linux scroll up
         self.canvas.bind("<Button-5>", self.on_mouse_wheel)             # Linux scroll down
+        self.create_canvas_items()
 
         # Left-side controls
         ctk.CTkLabel(left, text="Parent (type):").grid(row=0, column=0, sticky="w", padx=6, pady=(4,2))
-        self.parent_entry = ctk.CTkEntry(left, width=200)
+        self.parent_var = self.bindings.add(ctk.StringVar(), lambda: self.model.orbit, "parent", str)
+        self.parent_entry = ctk.CTkEntry(left, width=200, textvariable=self.parent_var)
         self.parent_entry.grid(row=1, column=0, padx=6, pady=(0,8))
-        self.parent_entry.insert(0, str(self.parent_name))
 
         # SMA (meters) entry (user can type to set)
         ctk.CTkLabel(left, text="Semi-major axis (m):").grid(row=2, column=0, sticky="w", padx=6, pady=(4,2))
@@ -112,6 +159,21 @@ class OrbitEditor:
         self.info_label = ctk.CTkLabel(left, text="Drag the white dot to set SMA.\nMouse wheel zooms (meters per pixel).", wraplength=200, justify="left")
         self.info_label.grid(row=13, column=0, padx=6, pady=(8,2))
 
+        # Parent body (for orbital period and playback)
+        ctk.CTkLabel(left, text="Parent gravity (m/s²):").grid(row=14, column=0, sticky="w", padx=6, pady=(4,2))
+        self.parent_gravity_entry = ctk.CTkEntry(left)
+        self.parent_gravity_entry.grid(row=15, column=0, padx=6, pady=(0,8))
+        self.parent_gravity_entry.insert(0, str(DEFAULT_PARENT_GRAVITY))
+        ctk.CTkLabel(left, text="Parent radius (m):").grid(row=16, column=0, sticky="w", padx=6, pady=(4,2))
+        self.parent_radius_entry = ctk.CTkEntry(left)
+        self.parent_radius_entry.grid(row=17, column=0, padx=6, pady=(0,8))
+        self.parent_radius_entry.insert(0, str(DEFAULT_PARENT_RADIUS))
+
+        self.play_btn = ctk.CTkButton(left, text="Play", command=self.toggle_animation)
+        self.play_btn.grid(row=18, column=0, padx=6, pady=(4,2))
+        self.kepler_label = ctk.CTkLabel(left, text="", justify="left")
+        self.kepler_label.grid(row=19, column=0, sticky="w", padx=6, pady=(2,2))
+
         # initial dot position
         self.update_dot_from_sma()
 
@@ -125,7 +187,7 @@ class OrbitEditor:
                 return
             self.semiMajorAxis = v
             self.update_dot_from_sma()
-            self.redraw()
+            self.request_redraw()
         except Exception:
             pass
 
@@ -136,14 +198,14 @@ class OrbitEditor:
                 return
             self.meters_per_pixel = v
             self.update_dot_from_sma()
-            self.redraw()
+            self.request_redraw()
         except Exception:
             pass
 
     def on_ecc_change(self, val):
         try:
             self.eccentricity = float(val)
-            self.redraw()
+            self.request_redraw()
         except Exception:
             pass
 
@@ -151,13 +213,13 @@ class OrbitEditor:
         try:
             self.arg_peri = float(val)
             self.update_dot_from_sma()  # keep dot aligned to argument
-            self.redraw()
+            self.request_redraw()
         except Exception:
             pass
 
     def on_direction_change(self, val):
         self.direction = 1 if val == "Prograde" else -1
-        self.redraw()
+        self.request_redraw()
 
     def center_and_fit(self):
         # Ensure the current SMA is visible by adjusting meters_per_pixel automatically
@@ -166,7 +228,7 @@ class OrbitEditor:
             self.meters_per_pixel = max(1.0, self.semiMajorAxis / 200.0)
             self.scale_var.set(str(self.meters_per_pixel))
             self.update_dot_from_sma()
-            self.redraw()
+            self.request_redraw()
 
     def reset_defaults(self):
         self.semiMajorAxis = 7480000000.0
@@ -180,7 +242,7 @@ class OrbitEditor:
         self.ecc_slider.set(self.eccentricity)
         self.dir_switch.set("Prograde")
         self.update_dot_from_sma()
-        self.redraw()
+        self.request_redraw()
 
     def on_canvas_click(self, event):
         # Start dragging if clicked near the dot; else treat as a move to set SMA
@@ -193,12 +255,12 @@ class OrbitEditor:
         else:
             # place dot / set SMA directly
             self.set_dot_and_sma_from_pixel(x, y)
-            self.redraw()
+            self.request_redraw()
 
     def on_canvas_drag(self, event):
         if self.dragging:
             self.set_dot_and_sma_from_pixel(event.x, event.y)
-            self.redraw()
+            self.request_redraw()
 
     def on_canvas_release(self, event):
         self.dragging = False
@@ -219,7 +281,7 @@ class OrbitEditor:
         self.meters_per_pixel = max(1.0, self.meters_per_pixel * factor)
         self.scale_var.set(str(self.meters_per_pixel))
         self.update_dot_from_sma()
-        self.redraw()
+        self.request_redraw()
 
     # --------------------
     # Dot / SMA mapping
@@ -255,99 +317,164 @@ class OrbitEditor:
     # --------------------
     # Drawing
     # --------------------
-    def redraw(self):
-        self.canvas.delete("all")
+    def create_canvas_items(self):
+        """Create every canvas item once; redraw() only moves them with coords()/itemconfigure()."""
         cx, cy = self.center
-
-        # draw parent body at center
         parent_radius = 6
-        self.canvas.create_oval(cx-parent_radius, cy-parent_radius, cx+parent_radius, cy+parent_radius, fill="#ffd700", outline="")
-
-        # compute ellipse points (focus at center)
-        a = max(1.0, self.semiMajorAxis)
-        e = max(0.0, min(0.99, self.eccentricity))
-        b = a * math.sqrt(max(0.0, 1 - e*e))
-        c = a * e  # focal distance
-
-        # Parametric ellipse with focus at (0,0): x = a*cos(t) - c, y = b*sin(t)
-        pts = []
-        steps = 180
-        ang_rot = math.radians(self.arg_peri)  # rotate ellipse by argument of periapsis
-        for i in range(steps+1):
-            t = 2*math.pi * (i/steps)
-            x_orb = a * math.cos(t) - c
-            y_orb = b * math.sin(t)
-            # rotate
-            xr = x_orb * math.cos(ang_rot) - y_orb * math.sin(ang_rot)
-            yr = x_orb * math.sin(ang_rot) + y_orb * math.cos(ang_rot)
-            # map meters -> pixels
-            px = cx + (xr / max(1.0, self.meters_per_pixel))
-            py = cy + (yr / max(1.0, self.meters_per_pixel))
-            pts.append((px, py))
-
-        # draw ellipse as polyline
-        for i in range(len(pts)-1):
-            x1, y1 = pts[i]
-            x2, y2 = pts[i+1]
-            self.canvas.create_line(x1, y1, x2, y2, fill="white")
-
-        # draw periapsis and apoapsis points (position relative to center)
-        # periapsis at true anomaly = 0 in our param -> position x = a - c rotated
-        peri_x = a - c
-        peri_y = 0
-        # rotate
-        prx = peri_x * math.cos(ang_rot) - peri_y * math.sin(ang_rot)
-        pry = peri_x * math.sin(ang_rot) + peri_y * math.cos(ang_rot)
-        per_px = cx + prx / max(1.0, self.meters_per_pixel)
-        per_py = cy + pry / max(1.0, self.meters_per_pixel)
-        self.canvas.create_oval(per_px-4, per_py-4, per_px+4, per_py+4, fill="red", outline="")
-
-        # apoapsis at true anomaly = pi
-        apo_x = -a - c
-        apo_y = 0
-        arx = apo_x * math.cos(ang_rot) - apo_y * math.sin(ang_rot)
-        ary = apo_x * math.sin(ang_rot) + apo_y * math.cos(ang_rot)
-        apo_px = cx + arx / max(1.0, self.meters_per_pixel)
-        apo_py = cy + ary / max(1.0, self.meters_per_pixel)
-        self.canvas.create_oval(apo_px-4, apo_py-4, apo_px+4, apo_py+4, fill="blue", outline="")
-
-        # draw the draggable dot
+        self.parent_item = self.canvas.create_oval(cx-parent_radius, cy-parent_radius, cx+parent_radius, cy+parent_radius,
+                                                   fill="#ffd700", outline="")
+        # One polyline per visible arc; an ellipse clipped by a rectangle has at most four
+        self.orbit_items = [self.canvas.create_line(0, 0, 0, 0, fill="white", state="hidden") for _ in range(4)]
+        self.peri_item = self.canvas.create_oval(0, 0, 0, 0, fill="red", outline="")
+        self.apo_item = self.canvas.create_oval(0, 0, 0, 0, fill="blue", outline="")
+        self.dot_item = self.canvas.create_oval(0, 0, 0, 0, fill="white", outline="")
+        self.body_item = self.canvas.create_oval(0, 0, 0, 0, fill="#66ccff", outline="", state="hidden")
+        self.info_item = self.canvas.create_text(8, 8, anchor="nw", fill="white", font=("TkDefaultFont", 10))
+
+    def redraw(self):
+        # Only the arcs inside the canvas are sampled (focus at center), densely
+        # enough to stay within ORBIT_TOLERANCE_PX at any zoom
+        size = (self.canvas_size, self.canvas_size)
+        arcs = viewport_orbit(self.semiMajorAxis, self.eccentricity, self.arg_peri,
+                              self.center, self.meters_per_pixel, size, ORBIT_TOLERANCE_PX)
+        for i, item in enumerate(self.orbit_items):
+            if i < len(arcs):
+                self.canvas.coords(item, arcs[i].ravel().tolist())
+                self.canvas.itemconfigure(item, state="normal")
+            else:
+                self.canvas.itemconfigure(item, state="hidden")
+
+        for item, point in zip((self.peri_item, self.apo_item),
+                               apsides(self.semiMajorAxis, self.eccentricity, self.arg_peri)):
+            px, py = to_pixels(point, self.center, self.meters_per_pixel)
+            if -4 <= px <= self.canvas_size + 4 and -4 <= py <= self.canvas_size + 4:
+                self.canvas.coords(item, px-4, py-4, px+4, py+4)
+                self.canvas.itemconfigure(item, state="normal")
+            else:
+                # Far off-canvas coordinates are not sent to Tk at all
+                self.canvas.itemconfigure(item, state="hidden")
+
+        # the draggable dot
         dot_x, dot_y = self.dot_pos
-        self.canvas.create_oval(dot_x-6, dot_y-6, dot_x+6, dot_y+6, fill="white", outline="")
+        self.canvas.coords(self.dot_item, dot_x-6, dot_y-6, dot_x+6, dot_y+6)
 
         # info overlay
         info_text = f"SMA: {int(self.semiMajorAxis)} m\nEcc: {self.eccentricity:.3f}\nArg: {self.arg_peri:.1f}°\nDir: {'1' if self.direction==1 else '-1'}"
-        self.canvas.create_text(8, 8, anchor="nw", fill="white", text=info_text, font=("TkDefaultFont", 10))
+        self.canvas.itemconfigure(self.info_item, text=info_text)
+
+    # --------------------
+    # Playback (Kepler propagation)
+    # --------------------
+    def load_parent_body(self):
+        """Fill the parent gravity/radius entries from the loaded parent planet, or the defaults."""
+        body = self.find_body(self.parent_name or "Sun") if self.find_body else None
+        if body is not None and body.gravity > 0 and body.radius > 0:
+            gravity, radius = body.gravity, body.radius
+        else:
+            gravity, radius = DEFAULT_PARENT_GRAVITY, DEFAULT_PARENT_RADIUS
+        for entry, value in ((self.parent_gravity_entry, gravity), (self.parent_radius_entry, radius)):
+            entry.delete(0, "end")
+            entry.insert(0, str(value))
+
+    def parent_mu(self):
+        """Parent's gravitational parameter from the gravity/radius entries, or None if invalid."""
+        try:
+            mu = float(gravitational_parameter(float(self.parent_gravity_entry.get()),
+                                               float(self.parent_radius_entry.get())))
+        except ValueError:
+            return None
+        return mu if mu > 0 else None
+
+    def toggle_animation(self):
+        if self.animating:
+            self.stop_animation()
+            return
+        # The parent planet may have been loaded or edited since
+        self.load_parent_body()
+        self.animating = True
+        self._anim_last = time.perf_counter()
+        self.play_btn.configure(text="Pause")
+        self._animate()
+
+    def stop_animation(self):
+        self.animating = False
+        if self._anim_id is not None:
+            self.canvas.after_cancel(self._anim_id)
+            self._anim_id = None
+        self.play_btn.configure(text="Play")
+
+    def _animate(self):
+        self._anim_id = None
+        mu = self.parent_mu()
+        if not self.animating or mu is None:
+            self.stop_animation()
+            return
+        started = time.perf_counter()
+
+        # Simulated time runs so that one orbit takes ANIMATION_ORBIT_SECONDS, however long a frame took
+        period = float(orbital_period(self.semiMajorAxis, mu))
+        self.sim_time = (self.sim_time + (started - self._anim_last) * period / ANIMATION_ORBIT_SECONDS) % period
+        self._anim_last = started
+
+        eccentricity = max(0.0, min(0.99, self.eccentricity))
+        pos, vel = propagate(self.sim_time, self.semiMajorAxis, eccentricity, self.arg_peri, self.direction, mu)
+        px, py = to_pixels(pos, self.center, self.meters_per_pixel)
+        if -5 <= px <= self.canvas_size + 5 and -5 <= py <= self.canvas_size + 5:
+            self.canvas.coords(self.body_item, px-5, py-5, px+5, py+5)
+            self.canvas.itemconfigure(self.body_item, state="normal")
+        else:
+            self.canvas.itemconfigure(self.body_item, state="hidden")
+
+        to_peri = float(time_to_periapsis(self.sim_time, self.semiMajorAxis, mu))
+        self.kepler_label.configure(text=f"Period: {period:,.0f} s\nTo periapsis: {to_peri:,.0f} s\n"
+                                         f"Speed: {math.hypot(*vel):,.1f} m/s")
+
+        # Keep a fixed frame budget: subtract the time this frame took
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self._anim_id = self.canvas.after(max(1, int(ANIMATION_FRAME_MS - elapsed_ms)), self._animate)
 
     # --------------------
     # Data export / integration helpers
     # --------------------
+    def update_data(self, planet_data):
+        """Show another planet's ORBIT_DATA in the existing widgets (the zoom is kept)."""
+        self.stop_animation()
+        self.sim_time = 0.0
+        self.model.orbit.unsubscribe(self._on_orbit_changed)
+        self.model = PlanetModel.coerce(planet_data)
+        self.model.orbit.subscribe(self._on_orbit_changed)
+        self.bindings.rebind()
+        self.load_parent_body()
+        self._sync_widgets()
+        self.update_dot_from_sma()
+        self.request_redraw()
+
+    def _sync_widgets(self, names=("semiMajorAxis", "eccentricity", "argumentOfPeriapsis", "direction")):
+        if "semiMajorAxis" in names:
+            self.sma_var.set(str(self.semiMajorAxis))
+        if "eccentricity" in names:
+            self.ecc_slider.set(self.eccentricity)
+        if "argumentOfPeriapsis" in names:
+            self.arg_slider.set(self.arg_peri)
+        if "direction" in names:
+            self.dir_switch.set("Prograde" if self.direction == 1 else "Retrograde")
+
+    def _on_orbit_changed(self, section, name, value):
+        # Also fires for the editor's own changes, which makes these no-ops
+        self._sync_widgets((name,))
+        if name == "parent":
+            self.load_parent_body()
+        if name in ("semiMajorAxis", "argumentOfPeriapsis") and not self.dragging:
+            self.update_dot_from_sma()
+        self.request_redraw()
+
     def save(self):
-        """Push UI values into self.planet_data dictionary (optional helper)."""
-        orbit = self.planet_data.setdefault("ORBIT_DATA", {})
-        orbit["parent"] = self.parent_entry.get()
-        orbit["semiMajorAxis"] = float(self.semiMajorAxis)
-        orbit["smaDifficultyScale"] = orbit.get("smaDifficultyScale", {})
-        orbit["eccentricity"] = float(self.eccentricity)
-        orbit["argumentOfPeriapsis"] = float(self.arg_peri)
-        orbit["direction"] = int(self.direction)
-        orbit["multiplierSOI"] = float(self.multiplierSOI)
-        orbit["soiDifficultyScale"] = orbit.get("soiDifficultyScale", {})
+        """Write ORBIT_DATA back into the planet dict the editor was opened with (optional helper)."""
+        self.model.source["ORBIT_DATA"] = self.get_data()["ORBIT_DATA"]
 
     def get_data(self):
         """Return the exact ORBIT_DATA structure expected by SFS exporter"""
-        return {
-            "ORBIT_DATA": {
-                "parent": self.parent_entry.get() or "Sun",
-                "semiMajorAxis": float(self.semiMajorAxis),
-                "smaDifficultyScale": {},
-                "eccentricity": float(self.eccentricity),
-                "argumentOfPeriapsis": float(self.arg_peri),
-                "direction": int(self.direction),
-                "multiplierSOI": float(self.multiplierSOI),
-                "soiDifficultyScale": {}
-            }
-        }
+        return {"ORBIT_DATA": self.model.orbit.to_json()}
 
 # Standalone test (optional)
 if __name__ == "__main__":
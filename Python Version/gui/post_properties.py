@@ -1,14 +1,29 @@
 import customtkinter as ctk
-from tkinter import messagebox
 
+from gui.model_binding import ModelBindings
+from gui.row_pool import RowPool
+from planet_model import PlanetModel, PostKey
+
+# (label, key) of every entry in a key block, in display order
+POST_FIELDS = (
+    ("Height", "height"),
+    ("Shadow Intensity", "shadowIntensity"),
+    ("Star Intensity", "starIntensity"),
+    ("Hue Shift", "hueShift"),
+    ("Saturation", "saturation"),
+    ("Contrast", "contrast"),
+    ("Red", "red"),
+    ("Green", "green"),
+    ("Blue", "blue"),
+)
 
 class PostProcessingEditor:
     def __init__(self, master, data):
         # Main container frame (required by main.py)
         self.frame = ctk.CTkFrame(master)
         
-        self.data = data if isinstance(data, dict) else {}
-        self.key_entries = []
+        # data may be a planet dict or a planet_model.PlanetModel
+        self.model = PlanetModel.coerce(data)
 
         self.build_ui()
 
@@ -25,58 +40,66 @@ class PostProcessingEditor:
         # Scroll panel
         self.scroll = ctk.CTkScrollableFrame(self.frame)
         self.scroll.pack(fill="both", expand=True, padx=10, pady=10)
+        self.key_pool = RowPool(self.scroll, self._make_key_block, fill="x", pady=10, padx=5)
+        self.key_entries = self.key_pool.active
 
         # Load existing keys
-        for key in self.data.get("keys", []):
-            self.add_key_block(key)
+        self.update_data(self.model)
 
         # Add key button
         ctk.CTkButton(self.frame, text="Add Key", command=self.add_empty_key).pack(pady=10)
 
 
+    # ---------------------------------------------------------
+    # Load another planet (reuses the existing key blocks)
+    # ---------------------------------------------------------
+    def update_data(self, data):
+        self.model = PlanetModel.coerce(data)
+        keys = self.model.post_processing.keys
+        for block, key in zip(self.key_pool.resize(len(keys)), keys):
+            self._fill_block(block, key)
+
+
     # ---------------------------------------------------------
     # Helper entry row
     # ---------------------------------------------------------
-    def _entry(self, frame, label, value):
+    def _entry(self, frame, label, var):
         row = ctk.CTkFrame(frame)
         row.pack(fill="x", pady=2)
 
         ctk.CTkLabel(row, text=label, width=140, anchor="w").pack(side="left", padx=5)
 
-        entry = ctk.CTkEntry(row)
+        entry = ctk.CTkEntry(row, textvariable=var)
         entry.pack(side="right", fill="x", expand=True, padx=5)
-        if value is not None:
-            entry.insert(0, str(value))
 
         return entry
 
 
     # ---------------------------------------------------------
-    # Add Key Block
+    # Key blocks
     # ---------------------------------------------------------
-    def add_key_block(self, key):
-        frame = ctk.CTkFrame(self.scroll, border_width=1, border_color="#333")
-        frame.pack(fill="x", pady=10, padx=5)
-
-        height = self._entry(frame, "Height", key.get("height"))
-        shadow = self._entry(frame, "Shadow Intensity", key.get("shadowIntensity"))
-        star = self._entry(frame, "Star Intensity", key.get("starIntensity"))
-        hue = self._entry(frame, "Hue Shift", key.get("hueShift"))
-        sat = self._entry(frame, "Saturation", key.get("saturation"))
-        cont = self._entry(frame, "Contrast", key.get("contrast"))
-        red = self._entry(frame, "Red", key.get("red"))
-        green = self._entry(frame, "Green", key.get("green"))
-        blue = self._entry(frame, "Blue", key.get("blue"))
+    def _make_key_block(self, container):
+        frame = ctk.CTkFrame(container, border_width=1, border_color="#333")
+        block = {"frame": frame, "item": None, "bindings": ModelBindings()}
+        for label, name in POST_FIELDS:
+            var = block["bindings"].add(ctk.StringVar(), lambda: block["item"], name)
+            self._entry(frame, label, var)
 
         remove_btn = ctk.CTkButton(
             frame, text="Remove", fg_color="#992222",
-            command=lambda f=frame: self.remove_block(f)
+            command=lambda: self.remove_block(block)
         )
         remove_btn.pack(pady=5)
+        return block
 
-        self.key_entries.append(
-            (frame, height, shadow, star, hue, sat, cont, red, green, blue)
-        )
+    def _fill_block(self, block, key):
+        block["item"] = key
+        block["bindings"].rebind()
+
+    def add_key_block(self, key):
+        item = PostKey.from_json(key)
+        self.model.post_processing.keys.append(item)
+        self._fill_block(self.key_pool.acquire(), item)
 
 
     def add_empty_key(self):
@@ -96,49 +119,19 @@ class PostProcessingEditor:
     # ---------------------------------------------------------
     # Remove a block
     # ---------------------------------------------------------
-    def remove_block(self, frame):
-        for block in self.key_entries:
-            if block[0] == frame:
-                block[0].destroy()
-                self.key_entries.remove(block)
-                return
+    def remove_block(self, block):
+        keys = self.model.post_processing.keys
+        keys[:] = [key for key in keys if key is not block["item"]]
+        self.key_pool.release(block)
 
 
     # ---------------------------------------------------------
     # get_data() — used by main.py
     # ---------------------------------------------------------
     def get_data(self):
-        output = {"keys": []}
-
-        for block in self.key_entries:
-            (_, height, shadow, star, hue, sat, cont, red, green, blue) = block
-
-            # Skip blank blocks
-            if all(e.get().strip() == "" for e in
-                   (height, shadow, star, hue, sat, cont, red, green, blue)):
-                continue
-
-            try:
-                output["keys"].append({
-                    "height": float(height.get()),
-                    "shadowIntensity": float(shadow.get()),
-                    "starIntensity": float(star.get()),
-                    "hueShift": float(hue.get()),
-                    "saturation": float(sat.get()),
-                    "contrast": float(cont.get()),
-                    "red": float(red.get()),
-                    "green": float(green.get()),
-                    "blue": float(blue.get())
-                })
-            except:
-                messagebox.showerror(
-                    "Error", "POST PROCESSING contains invalid number(s)."
-                )
-                return {}   # return empty dict so update() does not fail
-
         # If no keys → do NOT include POST_PROCESSING in file
-        if len(output["keys"]) == 0:
+        if not self.model.post_processing.keys:
             return {}  # SAFE for update()
 
         # Wrap in POST_PROCESSING
-        return {"POST_PROCESSING": output}
+        return {"POST_PROCESSING": self.model.post_processing.to_json()}
@@ -0,0 +1,106 @@
+import sys
+import time
+from tkinter import messagebox
+
+
+class RenderScheduler:
+    """
+    Coalesces redraw requests so every canvas is drawn at most once per frame.
+
+    Editors call request(self.redraw) from their event handlers instead of
+    redrawing synchronously. All requests that arrive before the next frame
+    collapse into one call per callback; frames run from after_idle(), or from
+    a timer when the previous frame was less than `frame_ms` ago.
+
+    One scheduler is shared per Tk interpreter:
+        scheduler = RenderScheduler.for_widget(self.canvas)
+        scheduler.request(self.redraw)
+
+    stats() returns {name: (events_received, frames_drawn)} per callback;
+    main.py prints them on exit with --startup-profile.
+    """
+
+    _shared = {}
+
+    def __init__(self, widget, frame_ms=16):
+        self.widget = widget
+        self.frame_ms = frame_ms
+
+        self._dirty = {}            # callback -> None, insertion ordered
+        self._after_id = None
+        self._last_frame = 0.0
+        self.events_received = {}
+        self.frames_drawn = {}
+        self._failed = set()        # callback names whose error was already shown
+
+    @classmethod
+    def for_widget(cls, widget):
+        """Return the scheduler shared by every widget of `widget`'s Tk interpreter."""
+        scheduler = cls._shared.get(widget.tk)
+        if scheduler is None:
+            scheduler = cls._shared[widget.tk] = cls(widget.winfo_toplevel())
+        return scheduler
+
+    # ---------------------------------------------
+    # Requests
+    # ---------------------------------------------
+    def request(self, callback):
+        """Mark `callback`'s canvas dirty; it will run once on the next frame."""
+        name = _callback_name(callback)
+        self.events_received[name] = self.events_received.get(name, 0) + 1
+        self._dirty[callback] = None
+
+        if self._after_id is None:
+            wait_ms = self.frame_ms - (time.perf_counter() - self._last_frame) * 1000.0
+            if wait_ms <= 0:
+                self._after_id = self.widget.after_idle(self._flush)
+            else:
+                self._after_id = self.widget.after(int(wait_ms) + 1, self._flush)
+
+    def cancel(self, callback):
+        self._dirty.pop(callback, None)
+
+    def flush(self):
+        """Draw everything pending right now (e.g. before exporting or closing)."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._flush()
+
+    def _flush(self):
+        self._after_id = None
+        self._last_frame = time.perf_counter()
+        pending, self._dirty = self._dirty, {}
+        for callback in pending:
+            name = _callback_name(callback)
+            self.frames_drawn[name] = self.frames_drawn.get(name, 0) + 1
+            try:
+                callback()
+            except Exception as e:
+                # One broken editor must not stop the other canvases from drawing.
+                # Traceback through Tk's usual handler; the dialog only once per canvas,
+                # as a redraw that fails tends to fail on every frame
+                self.widget._root().report_callback_exception(*sys.exc_info())
+                if name not in self._failed:
+                    self._failed.add(name)
+                    messagebox.showerror("Redraw", f"Drawing failed in {name}:\n{e}")
+
+    # ---------------------------------------------
+    # Stats
+    # ---------------------------------------------
+    def stats(self):
+        return {name: (count, self.frames_drawn.get(name, 0)) for name, count in self.events_received.items()}
+
+    def reset_stats(self):
+        self.events_received.clear()
+        self.frames_drawn.clear()
+
+    def format_stats(self):
+        """stats() as report lines, busiest callback first."""
+        rows = sorted(self.stats().items(), key=lambda item: -item[1][0])
+        return [f"  {events:8d} requests -> {frames:6d} frames  {name}" for name, (events, frames) in rows]
+
+
+def _callback_name(callback):
+    owner = getattr(callback, "__self__", None)
+    func = getattr(callback, "__name__", repr(callback))
+    return f"{type(owner).__name__}.{func}" if owner is not None else func
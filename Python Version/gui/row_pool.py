@@ -0,0 +1,56 @@
+# gui/row_pool.py
+
+
+class RowPool:
+    """
+    Rows of a dynamic editor list (fog keys, flat zones, landmarks, ...) that
+    are kept alive and reused instead of being destroyed and rebuilt.
+
+    make_row(container) builds one row and returns a dict holding at least
+    its "frame" (plus whatever Tk variables / entries the editor needs).
+    Released rows are only unpacked; acquire() packs a released row again
+    before building a new one, so repopulating an editor for another planet
+    just refills existing widgets.
+
+    `active` is the list of shown rows in display order; editors may keep a
+    reference to it (it is never replaced).
+
+    Usage:
+      pool = RowPool(container, self._make_row, fill="x", pady=2)
+      for row, data in zip(pool.resize(len(items)), items):
+          self._fill_row(row, data)
+    """
+
+    def __init__(self, container, make_row, **pack_options):
+        self.container = container
+        self.make_row = make_row
+        self.pack_options = pack_options
+        self.active = []
+        self._free = []
+
+    def acquire(self):
+        """Show a row at the end of the list (reused when possible) and return it."""
+        row = self._free.pop() if self._free else self.make_row(self.container)
+        row["frame"].pack(**self.pack_options)
+        self.active.append(row)
+        return row
+
+    def release(self, row):
+        """Hide `row` and keep it for a later acquire()."""
+        self.active.remove(row)
+        row["frame"].pack_forget()
+        self._free.append(row)
+
+    def resize(self, count):
+        """Show exactly `count` rows, reusing the existing ones first. Returns `active`."""
+        while len(self.active) > count:
+            self.release(self.active[-1])
+        while len(self.active) < count:
+            self.acquire()
+        return self.active
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active)
@@ -0,0 +1,265 @@
+# gui/system_view.py
+import tkinter as tk
+from tkinter import filedialog
+import customtkinter as ctk
+import numpy as np
+
+from gui.render_scheduler import RenderScheduler
+from orbit_conflicts import check_system
+from orbit_geometry import full_orbits, viewport_orbit
+from solar_system import SolarSystem
+
+# Orbits and bodies whose orbit spans less than this (px) merge into their parent and are skipped
+MIN_ORBIT_PX = 1.0
+# Bodies are drawn at least this big (px) so they stay clickable/visible
+MIN_BODY_PX = 3.0
+# Names are shown once a body's orbit is at least this big (px)
+LABEL_ORBIT_PX = 40.0
+# Per-orbit point budget; hundreds of orbits may be on screen at once
+ORBIT_MAX_POINTS = 1024
+# Conflict report lines shown in the GUI (the CLI prints all of them)
+REPORT_MAX_LINES = 1000
+
+
+class SystemView:
+    """
+    Whole-solar-system view (CTk + tk.Canvas).
+
+    Loads every planet of a folder, nests each orbit in its parent's frame and
+    draws only what is on screen: orbits that miss the viewport or collapse
+    below MIN_ORBIT_PX are skipped together with their children. Canvas items
+    are pooled and reused between frames.
+
+    Usage:
+      tab = SystemView(parent)
+      parent_tab_control.add(tab.frame, text="Solar System")
+      tab.load_folder("planets")
+
+    Drag to pan, mouse wheel to zoom around the pointer.
+    """
+
+    def __init__(self, parent, folder=None, canvas_width=800, canvas_height=600):
+        self.parent = parent
+        self.frame = ctk.CTkFrame(self.parent)
+        self.frame.pack(fill="both", expand=True)
+
+        self.system = None
+        self._arrays = None         # SolarSystem.arrays(), rebuilt when the system changes
+        self._world = None          # N x 2 body positions in meters
+        self.view_center = np.zeros(2)      # world position (m) at the canvas center
+        self.meters_per_pixel = 1e8
+        self._pan_start = None
+        self.conflicted = set()     # names whose orbit or SOI overlaps a sibling's
+
+        # Canvas item pools, reused every frame (hidden when unused)
+        self._orbit_items = []
+        self._body_items = []
+        self._label_items = []
+
+        self.build_ui(canvas_width, canvas_height)
+        self.scheduler = RenderScheduler.for_widget(self.canvas)
+        if folder:
+            self.load_folder(folder)
+
+    def build_ui(self, canvas_width, canvas_height):
+        toolbar = ctk.CTkFrame(self.frame)
+        toolbar.pack(fill="x", padx=8, pady=(8, 4))
+        ctk.CTkButton(toolbar, text="Open Folder...", command=self.choose_folder).pack(side="left", padx=4, pady=4)
+        ctk.CTkButton(toolbar, text="Fit", width=60, command=self.fit_view).pack(side="left", padx=4, pady=4)
+        ctk.CTkButton(toolbar, text="Check Conflicts", command=self.show_conflicts).pack(side="left", padx=4, pady=4)
+        self.status_label = ctk.CTkLabel(toolbar, text="No system loaded.")
+        self.status_label.pack(side="left", padx=10)
+
+        self.canvas = tk.Canvas(self.frame, width=canvas_width, height=canvas_height, bg="black", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+        self.canvas.bind("<Configure>", lambda e: self.request_redraw())
+        self.canvas.bind("<Button-1>", self.on_press)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.on_release)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)            # Windows
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel)             # Linux scroll up
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)             # Linux scroll down
+
+    def request_redraw(self):
+        self.scheduler.request(self.redraw)
+
+    # --------------------
+    # Loading
+    # --------------------
+    def choose_folder(self):
+        folder = filedialog.askdirectory(title="Select a folder of planet files")
+        if folder:
+            self.load_folder(folder)
+
+    def load_folder(self, folder):
+        self.set_system(SolarSystem.load_folder(folder))
+
+    def set_system(self, system):
+        self.system = system
+        self.conflicted = set()
+        self._arrays = system.arrays()
+        self._world = system.world_positions(0.0, self._arrays)[1]
+        status = f"{len(system.bodies)} bodies, {len(system.roots)} root(s)"
+        if system.errors:
+            status += f", {len(system.errors)} file(s) failed to load"
+        self.status_label.configure(text=status)
+        self.fit_view()
+
+    def fit_view(self):
+        if self._world is None or not len(self._world):
+            return
+        names, parent_index, a, e = self._arrays[:4]
+        reach = a * (1.0 + e)
+        parent_pos = np.where((parent_index >= 0)[:, None], self._world[parent_index], self._world)
+        lo = (parent_pos - reach[:, None]).min(axis=0)
+        hi = (parent_pos + reach[:, None]).max(axis=0)
+        self.view_center = 0.5 * (lo + hi)
+        w, h = self._canvas_size()
+        self.meters_per_pixel = max(1.0, float((hi - lo).max()) / (0.9 * min(w, h)))
+        self.request_redraw()
+
+    def show_conflicts(self):
+        """Run the orbit/SOI conflict check, highlight the bodies involved and list the pairs."""
+        if self.system is None:
+            return
+        conflicts = check_system(self.system)
+        self.conflicted = {name for c in conflicts for name in (c.first, c.second)}
+        self.request_redraw()
+
+        lines = [c.describe() for c in conflicts[:REPORT_MAX_LINES]]
+        if len(conflicts) > REPORT_MAX_LINES:
+            lines.append(f"... and {len(conflicts) - REPORT_MAX_LINES} more (run orbit_conflicts.py for all)")
+        crossing = sum(1 for c in conflicts if c.kind == "orbit")
+        summary = f"{crossing} orbit crossing(s), {len(conflicts) - crossing} SOI overlap(s)"
+
+        window = ctk.CTkToplevel(self.frame)
+        window.title("Orbit Conflicts")
+        window.geometry("600x400")
+        ctk.CTkLabel(window, text=summary).pack(anchor="w", padx=8, pady=(8, 4))
+        report = ctk.CTkTextbox(window)
+        report.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+        report.insert("1.0", "\n".join(lines) or "No conflicts found.")
+        report.configure(state="disabled")
+
+    # --------------------
+    # Pan / zoom
+    # --------------------
+    def on_press(self, event):
+        self._pan_start = (event.x, event.y, self.view_center.copy())
+
+    def on_drag(self, event):
+        if self._pan_start is None:
+            return
+        x0, y0, center0 = self._pan_start
+        self.view_center = center0 - np.array([event.x - x0, event.y - y0]) * self.meters_per_pixel
+        self.request_redraw()
+
+    def on_release(self, event):
+        self._pan_start = None
+
+    def on_mouse_wheel(self, event):
+        delta = getattr(event, "delta", 0) or (120 if getattr(event, "num", None) == 4 else -120)
+        factor = 0.8 if delta > 0 else 1.25
+        # Keep the world point under the pointer fixed
+        w, h = self._canvas_size()
+        offset = np.array([event.x - w / 2, event.y - h / 2])
+        pointer = self.view_center + offset * self.meters_per_pixel
+        self.meters_per_pixel = max(1.0, self.meters_per_pixel * factor)
+        self.view_center = pointer - offset * self.meters_per_pixel
+        self.request_redraw()
+
+    # --------------------
+    # Drawing
+    # --------------------
+    def _canvas_size(self):
+        return max(1, self.canvas.winfo_width()), max(1, self.canvas.winfo_height())
+
+    def _pooled(self, pool, index, create):
+        if index == len(pool):
+            pool.append(create())
+        return pool[index]
+
+    def redraw(self):
+        used = {"orbit": 0, "body": 0, "label": 0}
+        if self._world is not None and len(self._world):
+            self._draw_system(used)
+        for pool, count in ((self._orbit_items, used["orbit"]), (self._body_items, used["body"]),
+                            (self._label_items, used["label"])):
+            for item in pool[count:]:
+                self.canvas.itemconfigure(item, state="hidden")
+
+    def _draw_system(self, used):
+        names, parent_index, a, e, arg, direction, radius, _ = self._arrays
+        w, h = self._canvas_size()
+        mpp = self.meters_per_pixel
+        pixels = (self._world - self.view_center) / mpp + np.array([w / 2, h / 2])
+
+        # Vectorized culling. An orbit below MIN_ORBIT_PX hides its whole subtree;
+        # parents come first in the arrays, so one ordered pass propagates that.
+        has_orbit = parent_index >= 0
+        reach_px = a * (1.0 + e) / mpp
+        resolved = ~has_orbit | (reach_px >= MIN_ORBIT_PX)
+        shown = resolved.copy()
+        for i in np.flatnonzero(has_orbit):
+            shown[i] &= shown[parent_index[i]]
+
+        # Orbit circle (parent center, apoapsis radius) against the viewport
+        parent_px = pixels[np.where(has_orbit, parent_index, np.arange(len(names)))]
+        gap_x = np.maximum(np.maximum(-parent_px[:, 0], parent_px[:, 0] - w), 0.0)
+        gap_y = np.maximum(np.maximum(-parent_px[:, 1], parent_px[:, 1] - h), 0.0)
+        orbit_on_screen = shown & has_orbit & (a > 0) & (gap_x * gap_x + gap_y * gap_y <= reach_px * reach_px)
+
+        body_px = np.maximum(radius / mpp, MIN_BODY_PX)
+        body_on_screen = (shown & (pixels[:, 0] >= -body_px) & (pixels[:, 0] <= w + body_px) &
+                          (pixels[:, 1] >= -body_px) & (pixels[:, 1] <= h + body_px))
+
+        # Orbits entirely inside the view are sampled together; only the ones
+        # crossing an edge need per-orbit viewport clipping
+        inside = (orbit_on_screen &
+                  (parent_px[:, 0] - reach_px >= 0) & (parent_px[:, 0] + reach_px <= w) &
+                  (parent_px[:, 1] - reach_px >= 0) & (parent_px[:, 1] + reach_px <= h))
+        whole = np.flatnonzero(inside)
+        arcs = list(zip(whole, full_orbits(a[whole], e[whole], arg[whole], parent_px[whole], mpp)))
+        for i in np.flatnonzero(orbit_on_screen & ~inside):
+            arcs.extend((i, arc) for arc in viewport_orbit(a[i], e[i], arg[i], parent_px[i], mpp, (w, h),
+                                                           max_points=ORBIT_MAX_POINTS))
+
+        for i, arc in arcs:
+            item = self._pooled(self._orbit_items, used["orbit"],
+                                lambda: self.canvas.create_line(0, 0, 0, 0))
+            self.canvas.coords(item, arc.ravel().tolist())
+            color = "#ff4444" if names[i] in self.conflicted else "#666666"
+            self.canvas.itemconfigure(item, fill=color, state="normal")
+            used["orbit"] += 1
+
+        for i in np.flatnonzero(body_on_screen):
+            x, y = pixels[i]
+            r = body_px[i]
+            body = self.system.bodies[names[i]]
+            color = "#888888" if body.placeholder else ("#ffd700" if not has_orbit[i] else "#66ccff")
+            item = self._pooled(self._body_items, used["body"],
+                                lambda: self.canvas.create_oval(0, 0, 0, 0, outline="", tags="body_layer"))
+            self.canvas.coords(item, x - r, y - r, x + r, y + r)
+            self.canvas.itemconfigure(item, fill=color, state="normal")
+            used["body"] += 1
+
+            if not has_orbit[i] or reach_px[i] >= LABEL_ORBIT_PX:
+                label = self._pooled(self._label_items, used["label"],
+                                     lambda: self.canvas.create_text(0, 0, anchor="w", fill="white",
+                                                                     font=("TkDefaultFont", 9), tags="body_layer"))
+                self.canvas.coords(label, x + r + 3, y)
+                self.canvas.itemconfigure(label, text=names[i], state="normal")
+                used["label"] += 1
+
+        # Bodies above orbits
+        if used["body"]:
+            self.canvas.tag_raise("body_layer")
+
+
+# Standalone test (optional)
+if __name__ == "__main__":
+    import sys
+    root = ctk.CTk()
+    root.geometry("900x700")
+    view = SystemView(root, sys.argv[1] if len(sys.argv) > 1 else None)
+    root.mainloop()
@@ -1,108 +1,140 @@
 import json
+import math
 import os
+import tkinter as tk
 import customtkinter as ctk
+import numpy as np
 from tkinter import filedialog, messagebox
 
-PLANETS_DIR = "planets"
+from gui.background import BackgroundTask
+from gui.model_binding import ModelBindings
+from gui.row_pool import RowPool
+from planet_library import PLANETS_DIR
+from planet_model import FlatZone, PlanetModel
+from terrain_formula import FormulaError, IncrementalFormula, apply_flat_zones
+
 os.makedirs(PLANETS_DIR, exist_ok=True)
 
+DEFAULT_RADIUS = 315000.0       # used by the preview when BASE_DATA has no radius
+PREVIEW_SAMPLES = 2048
+PREVIEW_DEBOUNCE_MS = 150
+
 class TerrainEditor:
     """TerrainEditor - edits the entire TERRAIN_DATA block expected by SFS exporter.
 
     Usage:
         editor = TerrainEditor(parent_frame, planet_data_dict)
         parent_frame should be a container (frame or notebook tab)
-        planet_data_dict should be the current planet JSON-like dict (may be empty)
+        planet_data_dict should be the current planet JSON-like dict (may be empty) or a PlanetModel
 
     Methods:
-        save()       -- Writes UI values back into self.planet_data
+        save()       -- Writes the TERRAIN_DATA section back into the source planet dict
+        update_data(planet_data) -- Shows another planet in the existing widgets
         get_data()   -- Returns the exact TERRAIN_DATA structure expected by exporter
+
+    The preview canvas re-evaluates the formulas on a worker thread, debounced
+    while typing, and only the finished coordinates are handed back to Tk.
     """
 
     def __init__(self, parent, planet_data=None):
         self.parent = parent
-        self.planet_data = planet_data or {}
+        # planet_data may be a planet dict or a planet_model.PlanetModel
+        self.model = PlanetModel.coerce(planet_data)
+        self.bindings = ModelBindings()
 
         # Frame for tab
         self.frame = ctk.CTkFrame(self.parent)
         self.frame.pack(fill="both", expand=True)
 
-        # Internal state holders
-        self.formula_list = []            # list of strings (terrain formula lines for Normal)
-        self.texture_formula_list = []    # optional list of texture formula lines
-        self.flat_zones = []              # list of dicts {height, angle, width, transition}
+        # Flat zone rows, see build_ui
+        self.flat_zones = []
+
+        # Preview state; the Incremental formulas are only touched on the worker thread
+        self.preview_canvas = None
+        self._preview_after_id = None
+        self._preview_formula = None
+        self._preview_texture = None
 
         # UI variables (created in build_ui)
         self._create_ui_vars()
         self.build_ui()
+        self.update_data(self.model)
 
     def _create_ui_vars(self):
-        # Create variable placeholders so get_data can always read them
-        self.planetTexture = ctk.StringVar()
-        self.planetTextureCutout = ctk.DoubleVar()
-
-        self.surfaceTexture_A = ctk.StringVar()
-        self.surfaceTextureSize_A_x = ctk.DoubleVar()
-        self.surfaceTextureSize_A_y = ctk.DoubleVar()
-
-        self.surfaceTexture_B = ctk.StringVar()
-        self.surfaceTextureSize_B_x = ctk.DoubleVar()
-        self.surfaceTextureSize_B_y = ctk.DoubleVar()
-
-        self.terrainTexture_C = ctk.StringVar()
-        self.terrainTextureSize_C_x = ctk.DoubleVar()
-        self.terrainTextureSize_C_y = ctk.DoubleVar()
-
-        self.surfaceLayerSize = ctk.DoubleVar()
-        self.minFade = ctk.DoubleVar()
-        self.maxFade = ctk.DoubleVar()
-        self.shadowIntensity = ctk.DoubleVar()
-        self.shadowHeight = ctk.DoubleVar()
+        # Every variable is bound to a field of self.model.terrain, so get_data never reads Tk
+        terrain = lambda: self.model.terrain
+        tex = lambda: self.model.terrain.TERRAIN_TEXTURE_DATA
+        size_a = lambda: self.model.terrain.TERRAIN_TEXTURE_DATA.surfaceTextureSize_A
+        size_b = lambda: self.model.terrain.TERRAIN_TEXTURE_DATA.surfaceTextureSize_B
+        size_c = lambda: self.model.terrain.TERRAIN_TEXTURE_DATA.terrainTextureSize_C
+        bind = self.bindings.add
+
+        self.planetTexture = bind(ctk.StringVar(), tex, "planetTexture", str)
+        self.planetTextureCutout = bind(ctk.DoubleVar(), tex, "planetTextureCutout")
+
+        self.surfaceTexture_A = bind(ctk.StringVar(), tex, "surfaceTexture_A", str)
+        self.surfaceTextureSize_A_x = bind(ctk.DoubleVar(), size_a, "x")
+        self.surfaceTextureSize_A_y = bind(ctk.DoubleVar(), size_a, "y")
+
+        self.surfaceTexture_B = bind(ctk.StringVar(), tex, "surfaceTexture_B", str)
+        self.surfaceTextureSize_B_x = bind(ctk.DoubleVar(), size_b, "x")
+        self.surfaceTextureSize_B_y = bind(ctk.DoubleVar(), size_b, "y")
+
+        self.terrainTexture_C = bind(ctk.StringVar(), tex, "terrainTexture_C", str)
+        self.terrainTextureSize_C_x = bind(ctk.DoubleVar(), size_c, "x")
+        self.terrainTextureSize_C_y = bind(ctk.DoubleVar(), size_c, "y")
+
+        self.surfaceLayerSize = bind(ctk.DoubleVar(), tex, "surfaceLayerSize")
+        self.minFade = bind(ctk.DoubleVar(), tex, "minFade")
+        self.maxFade = bind(ctk.DoubleVar(), tex, "maxFade")
+        self.shadowIntensity = bind(ctk.DoubleVar(), tex, "shadowIntensity")
+        self.shadowHeight = bind(ctk.DoubleVar(), tex, "shadowHeight")
+
+        self.verticeSize = bind(ctk.DoubleVar(), terrain, "verticeSize")
+        self.collider_var = bind(ctk.BooleanVar(), terrain, "collider", bool)
+
+    def update_data(self, planet_data):
+        """Show another planet's TERRAIN_DATA, reusing the existing widgets and flat zone rows."""
+        self.model.base.unsubscribe(self._on_base_changed)
+        self.model = PlanetModel.coerce(planet_data)
+        self.model.base.subscribe(self._on_base_changed)    # radius changes redraw the preview
+        self.bindings.rebind()
+        terrain = self.model.terrain
+
+        for e, zone in zip(self.flatzone_pool.resize(len(terrain.flatZones)), terrain.flatZones):
+            self._fill_flat_zone(e, zone)
+
+        self.formula_text.delete("0.0", "end")
+        normal_formula = terrain.terrainFormulaDifficulties.get("Normal") or []
+        if normal_formula:
+            self.formula_text.insert("0.0", "\n".join(normal_formula))
+
+        self.texture_formula_text.delete("0.0", "end")
+        if terrain.textureFormula:
+            self.texture_formula_text.insert("0.0", "\n".join(terrain.textureFormula))
+
+        self._schedule_preview()
+
+    def _on_base_changed(self, section, name, value):
+        if name == "radius":
+            self._schedule_preview()
+
+    def _formulas_edited(self):
+        """Copy the formula text boxes into the model (on key release / focus out)."""
+        terrain = self.model.terrain
+        lines = [line for line in self.formula_text.get("0.0", "end").splitlines() if line.strip() != ""]
+        # Other difficulties of the planet are kept as loaded
+        difficulties = dict(terrain.terrainFormulaDifficulties)
+        if lines:
+            difficulties["Normal"] = lines
+        else:
+            difficulties.pop("Normal", None)
+        terrain.terrainFormulaDifficulties = difficulties
+        terrain.textureFormula = [l for l in self.texture_formula_text.get("0.0", "end").splitlines() if l.strip()]
+        self._schedule_preview()
 
-        self.verticeSize = ctk.DoubleVar()
-        self.collider_var = ctk.BooleanVar()
 
     def build_ui(self):
-        # Populate from planet_data defaults when available
-        terrain = self.planet_data.get("TERRAIN_DATA", {})
-        tex = terrain.get("TERRAIN_TEXTURE_DATA", {})
-
-        # Fill variables with defaults or values
-        self.planetTexture.set(tex.get("planetTexture", "Earth"))
-        self.planetTextureCutout.set(tex.get("planetTextureCutout", 1.0))
-
-        self.surfaceTexture_A.set(tex.get("surfaceTexture_A", "Blured"))
-        sza = tex.get("surfaceTextureSize_A", {"x": 20.0, "y": 8.0})
-        self.surfaceTextureSize_A_x.set(sza.get("x", 20.0))
-        self.surfaceTextureSize_A_y.set(sza.get("y", 8.0))
-
-        self.surfaceTexture_B.set(tex.get("surfaceTexture_B", "None"))
-        szb = tex.get("surfaceTextureSize_B", {"x": -1.0, "y": -1.0})
-        self.surfaceTextureSize_B_x.set(szb.get("x", -1.0))
-        self.surfaceTextureSize_B_y.set(szb.get("y", -1.0))
-
-        self.terrainTexture_C.set(tex.get("terrainTexture_C", "Blured"))
-        tzc = tex.get("terrainTextureSize_C", {"x": 100.0, "y": 30.0})
-        self.terrainTextureSize_C_x.set(tzc.get("x", 100.0))
-        self.terrainTextureSize_C_y.set(tzc.get("y", 30.0))
-
-        self.surfaceLayerSize.set(tex.get("surfaceLayerSize", 40.0))
-        self.minFade.set(tex.get("minFade", 0.0))
-        self.maxFade.set(tex.get("maxFade", 1.0))
-        self.shadowIntensity.set(tex.get("shadowIntensity", 6.0))
-        self.shadowHeight.set(tex.get("shadowHeight", 15.0))
-
-        self.verticeSize.set(terrain.get("verticeSize", 4.0))
-        self.collider_var.set(terrain.get("collider", True))
-
-        self.flat_zones = terrain.get("flatZones", [])[:]
-
-        tf = terrain.get("terrainFormulaDifficulties", {})
-        normal_formula = tf.get("Normal", [])
-        self.formula_list = normal_formula[:] if normal_formula else []
-
-        self.texture_formula_list = terrain.get("textureFormula", [])[:]
-
         # Build the UI layout
         # Top section: textures
         top = ctk.CTkFrame(self.frame)
@@ -175,8 +207,8 @@ class TerrainEditor:
         ctk.CTkLabel(fz_frame, text="Flat Zones (height, angle, width, transition)").pack(anchor="w")
         self.flatzones_container = ctk.CTkFrame(fz_frame)
         self.flatzones_container.pack(fill="x")
-        for z in self.flat_zones:
-            self._add_flat_zone_ui(z)
+        self.flatzone_pool = RowPool(self.flatzones_container, self._make_flat_zone_row, fill="x", pady=2)
+        self.flat_zones = self.flatzone_pool.active
 
         ctk.CTkButton(fz_frame, text="Add Flat Zone", command=lambda: self._add_flat_zone_ui()).pack(pady=6)
 
@@ -186,172 +218,153 @@ class TerrainEditor:
         ctk.CTkLabel(formula_frame, text="Terrain Formula (Normal)").pack(anchor="w")
         self.formula_text = ctk.CTkTextbox(formula_frame, height=160)
         self.formula_text.pack(fill="both", expand=True)
-        if self.formula_list:
-            self.formula_text.insert("0.0", "\n".join(self.formula_list))
 
         # Texture formula (optional)
         ctk.CTkLabel(formula_frame, text="Texture Formula (optional)").pack(anchor="w", pady=(6,0))
         self.texture_formula_text = ctk.CTkTextbox(formula_frame, height=80)
         self.texture_formula_text.pack(fill="both", expand=False)
-        if self.texture_formula_list:
-            self.texture_formula_text.insert("0.0", "\n".join(self.texture_formula_list))
+
+        for textbox in (self.formula_text, self.texture_formula_text):
+            textbox.bind("<KeyRelease>", lambda e: self._formulas_edited(), add="+")
+            textbox.bind("<FocusOut>", lambda e: self._formulas_edited(), add="+")
+
+        # Live preview of the planet outline
+        self._build_preview()
 
         # Save button
         bottom = ctk.CTkFrame(self.frame)
         bottom.pack(fill="x", padx=8, pady=8)
         ctk.CTkButton(bottom, text="Save to planet data", command=self.save).pack(side="right")
 
-    def _add_flat_zone_ui(self, data=None):
-        data = data or {"height": 18.0, "angle": 1.5707, "width": 900.0, "transition": 200.0}
-        row = ctk.CTkFrame(self.flatzones_container)
-        row.pack(fill="x", pady=2)
-
-        h = ctk.DoubleVar(value=data.get("height", 0.0))
-        a = ctk.DoubleVar(value=data.get("angle", 0.0))
-        w = ctk.DoubleVar(value=data.get("width", 0.0))
-        t = ctk.DoubleVar(value=data.get("transition", 0.0))
-
-        ctk.CTkEntry(row, textvariable=h, width=12).pack(side="left", padx=4)
-        ctk.CTkEntry(row, textvariable=a, width=12).pack(side="left", padx=4)
-        ctk.CTkEntry(row, textvariable=w, width=12).pack(side="left", padx=4)
-        ctk.CTkEntry(row, textvariable=t, width=12).pack(side="left", padx=4)
-        ctk.CTkButton(row, text="Remove", command=lambda: self._remove_flat_zone(row)).pack(side="right", padx=6)
-
-        self.flat_zones.append({"height_var": h, "angle_var": a, "width_var": w, "transition_var": t, "frame": row})
-
-    def _remove_flat_zone(self, frame):
-        # remove from ui and internal list
-        for e in list(self.flat_zones):
-            if e.get("frame") == frame:
-                e["frame"].destroy()
-                self.flat_zones.remove(e)
-                return
+    def _make_flat_zone_row(self, container):
+        row = ctk.CTkFrame(container)
+        e = {"frame": row, "item": None, "bindings": ModelBindings()}
 
-    def save(self):
-        # Push all values into self.planet_data under TERRAIN_DATA
-        terrain = self.planet_data.setdefault("TERRAIN_DATA", {})
-        tex = terrain.setdefault("TERRAIN_TEXTURE_DATA", {})
-
-        tex["planetTexture"] = self.planetTexture.get()
-        tex["planetTextureCutout"] = float(self.planetTextureCutout.get())
-
-        tex["surfaceTexture_A"] = self.surfaceTexture_A.get()
-        tex["surfaceTextureSize_A"] = {"x": float(self.surfaceTextureSize_A_x.get()), "y": float(self.surfaceTextureSize_A_y.get())}
-
-        tex["surfaceTexture_B"] = self.surfaceTexture_B.get()
-        tex["surfaceTextureSize_B"] = {"x": float(self.surfaceTextureSize_B_x.get()), "y": float(self.surfaceTextureSize_B_y.get())}
-
-        tex["terrainTexture_C"] = self.terrainTexture_C.get()
-        tex["terrainTextureSize_C"] = {"x": float(self.terrainTextureSize_C_x.get()), "y": float(self.terrainTextureSize_C_y.get())}
-
-        tex["surfaceLayerSize"] = float(self.surfaceLayerSize.get())
-        tex["minFade"] = float(self.minFade.get())
-        tex["maxFade"] = float(self.maxFade.get())
-        tex["shadowIntensity"] = float(self.shadowIntensity.get())
-        tex["shadowHeight"] = float(self.shadowHeight.get())
-
-        terrain["verticeSize"] = float(self.verticeSize.get())
-        terrain["collider"] = bool(self.collider_var.get())
-
-        # Flat zones: convert UI vars into plain dicts
-        flat_list = []
-        for e in self.flat_zones:
-            # if stored as dict with vars
-            if "height_var" in e:
-                flat_list.append({
-                    "height": float(e["height_var"].get()),
-                    "angle": float(e["angle_var"].get()),
-                    "width": float(e["width_var"].get()),
-                    "transition": float(e["transition_var"].get())
-                })
-            else:
-                # legacy raw dict
-                flat_list.append({
-                    "height": float(e.get("height", 0)),
-                    "angle": float(e.get("angle", 0)),
-                    "width": float(e.get("width", 0)),
-                    "transition": float(e.get("transition", 0))
-                })
-
-        terrain["flatZones"] = flat_list
-
-        # Terrain formula
-        formula_raw = self.formula_text.get("0.0", "end").strip()
-        if formula_raw:
-            terrain["terrainFormulaDifficulties"] = {"Normal": [line for line in formula_raw.splitlines() if line.strip() != ""]}
-        else:
-            terrain["terrainFormulaDifficulties"] = {}
+        for name in ("height", "angle", "width", "transition"):
+            var = e["bindings"].add(ctk.DoubleVar(), lambda: e["item"], name)
+            var.trace_add("write", lambda *_: self._schedule_preview())
+            ctk.CTkEntry(row, textvariable=var, width=12).pack(side="left", padx=4)
+        ctk.CTkButton(row, text="Remove", command=lambda: self._remove_flat_zone(e)).pack(side="right", padx=6)
+        return e
 
-        # Texture formula
-        t_raw = self.texture_formula_text.get("0.0", "end").strip()
-        terrain["textureFormula"] = [l for l in t_raw.splitlines() if l.strip()] if t_raw else []
+    def _fill_flat_zone(self, e, zone):
+        e["item"] = zone
+        e["bindings"].rebind()
+
+    def _add_flat_zone_ui(self, data=None):
+        zone = FlatZone.from_json(data or {"height": 18.0, "angle": 1.5707, "width": 900.0, "transition": 200.0})
+        self.model.terrain.flatZones.append(zone)
+        self._fill_flat_zone(self.flatzone_pool.acquire(), zone)
+        self._schedule_preview()
+
+    def _remove_flat_zone(self, e):
+        zones = self.model.terrain.flatZones
+        zones[:] = [zone for zone in zones if zone is not e["item"]]
+        self.flatzone_pool.release(e)
+        self._schedule_preview()
+
+    # ---------------------------------------------
+    # LIVE PREVIEW
+    # ---------------------------------------------
+    def _build_preview(self):
+        preview_frame = ctk.CTkFrame(self.frame)
+        preview_frame.pack(fill="x", padx=8, pady=6)
+        self.preview_canvas = tk.Canvas(preview_frame, height=240, bg="black", highlightthickness=0)
+        self.preview_canvas.pack(fill="x", expand=True)
+
+        # Persistent items, updated through coords()/itemconfig() only
+        self._preview_surface = self.preview_canvas.create_line(0, 0, 0, 0, fill="#7fd17f", width=1)
+        self._preview_texture_line = self.preview_canvas.create_line(0, 0, 0, 0, fill="#8a6f4d", width=1)
+        self._preview_label = self.preview_canvas.create_text(6, 6, anchor="nw", fill="white", text="", font=("TkDefaultFont", 9))
+
+        self.preview_canvas.bind("<Configure>", lambda e: self._schedule_preview(), add="+")
+        self.preview_task = BackgroundTask(self.preview_canvas, self._show_preview, self._show_preview_error)
+
+    def _preview_radius(self):
+        radius = self.model.base.radius
+        return radius if radius > 0 else DEFAULT_RADIUS
+
+    def _schedule_preview(self):
+        """Debounce: restart the timer on every change, evaluate once typing pauses."""
+        if self.preview_canvas is None:
+            return
+        if self._preview_after_id is not None:
+            self.preview_canvas.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.preview_canvas.after(PREVIEW_DEBOUNCE_MS, self._start_preview)
+
+    def _start_preview(self):
+        # Snapshot everything on the Tk thread; the worker never touches widgets
+        self._preview_after_id = None
+        terrain = self.model.terrain
+        formula = list(terrain.terrainFormulaDifficulties.get("Normal") or [])
+        texture = list(terrain.textureFormula)
+        zones = [zone.to_json() for zone in terrain.flatZones]
+        size = (max(1, self.preview_canvas.winfo_width()), max(1, self.preview_canvas.winfo_height()))
+        self.preview_task.submit(self._compute_preview, formula, texture, zones, self._preview_radius(), size)
+
+    def _compute_preview(self, formula, texture, zones, radius, size):
+        """Worker thread: evaluate the formulas and return flat canvas coordinates."""
+        if self._preview_formula is None or self._preview_formula.radius != radius:
+            angles = np.linspace(0.0, 2 * math.pi, PREVIEW_SAMPLES, endpoint=False)
+            self._preview_formula = IncrementalFormula(angles, radius)
+            self._preview_texture = IncrementalFormula(angles, radius)
+        angles = self._preview_formula.angles
+
+        heights = apply_flat_zones(self._preview_formula.evaluate(formula), angles, radius, zones)
+        tex = self._preview_texture.evaluate(texture)
+        # NaN/inf (e.g. x / 0) would make canvas.coords raise on the Tk thread
+        if not np.isfinite(heights).all():
+            raise FormulaError("Terrain formula gives NaN or infinite heights (division by zero?)")
+        if not np.isfinite(tex).all():
+            raise FormulaError("Texture formula gives NaN or infinite values (division by zero?)")
+
+        # Exaggerate relief so it is visible: the tallest feature spans 15% of the radius
+        low, high = float(heights.min()), float(heights.max())
+        relief = high - low
+        exaggeration = max(1.0, 0.15 * radius / relief) if relief > 0 else 1.0
+        r = radius + (heights - low) * exaggeration
+
+        w, h = size
+        scale = 0.45 * min(w, h) / float(r.max())
+        cos, sin = np.cos(angles), np.sin(angles)
+        surface = _closed_polar_coords(r * scale, cos, sin, w / 2, h / 2)
+
+        tex_low, tex_high = float(tex.min()), float(tex.max())
+        tex_norm = (tex - tex_low) / (tex_high - tex_low) if tex_high > tex_low else np.zeros_like(tex)
+        inner = (0.8 + 0.1 * tex_norm) * radius * scale
+        texture_coords = _closed_polar_coords(inner, cos, sin, w / 2, h / 2)
+        if not (np.isfinite(surface).all() and np.isfinite(texture_coords).all()):
+            raise FormulaError("Terrain is too large to preview")
+
+        info = (f"Radius {radius:.0f} m  terrain {low:.0f}..{high:.0f} m  (relief x{exaggeration:.0f})\n"
+                f"Texture {tex_low:.2f}..{tex_high:.2f}")
+        return surface, texture_coords, info
+
+    def _show_preview(self, result):
+        surface, texture_coords, info = result
+        self.preview_canvas.coords(self._preview_surface, surface)
+        self.preview_canvas.coords(self._preview_texture_line, texture_coords)
+        self.preview_canvas.itemconfig(self._preview_label, text=info, fill="white")
+
+    def _show_preview_error(self, error):
+        text = str(error) if isinstance(error, FormulaError) else f"Preview failed: {error}"
+        self.preview_canvas.itemconfig(self._preview_label, text=text, fill="#ff6b6b")
 
-        # write back to planet_data
-        self.planet_data["TERRAIN_DATA"] = terrain
+    def save(self):
+        # Push all values into the planet dict the editor was opened with
+        self._formulas_edited()
+        self.model.source["TERRAIN_DATA"] = self.model.terrain.to_json()
         messagebox.showinfo("Saved", "Terrain settings saved into planet data (in-memory).")
 
     def get_data(self):
         """Return the exact TERRAIN_DATA structure expected by SFS exporter"""
-        tex = {
-            "planetTexture": self.planetTexture.get(),
-            "planetTextureCutout": float(self.planetTextureCutout.get()),
-            "surfaceTexture_A": self.surfaceTexture_A.get(),
-            "surfaceTextureSize_A": {
-                "x": float(self.surfaceTextureSize_A_x.get()),
-                "y": float(self.surfaceTextureSize_A_y.get())
-            },
-            "surfaceTexture_B": self.surfaceTexture_B.get(),
-            "surfaceTextureSize_B": {
-                "x": float(self.surfaceTextureSize_B_x.get()),
-                "y": float(self.surfaceTextureSize_B_y.get())
-            },
-            "terrainTexture_C": self.terrainTexture_C.get(),
-            "terrainTextureSize_C": {
-                "x": float(self.terrainTextureSize_C_x.get()),
-                "y": float(self.terrainTextureSize_C_y.get())
-            },
-            "surfaceLayerSize": float(self.surfaceLayerSize.get()),
-            "minFade": float(self.minFade.get()),
-            "maxFade": float(self.maxFade.get()),
-            "shadowIntensity": float(self.shadowIntensity.get()),
-            "shadowHeight": float(self.shadowHeight.get())
-        }
-
-        # Flat zones
-        flat_list = []
-        for e in self.flat_zones:
-            if "height_var" in e:
-                flat_list.append({
-                    "height": float(e["height_var"].get()),
-                    "angle": float(e["angle_var"].get()),
-                    "width": float(e["width_var"].get()),
-                    "transition": float(e["transition_var"].get())
-                })
-            else:
-                flat_list.append({
-                    "height": float(e.get("height", 0)),
-                    "angle": float(e.get("angle", 0)),
-                    "width": float(e.get("width", 0)),
-                    "transition": float(e.get("transition", 0))
-                })
-
-        # Terrain formula
-        formula_raw = self.formula_text.get("0.0", "end").strip()
-        if formula_raw:
-            terrain_formula = {"Normal": [line for line in formula_raw.splitlines() if line.strip() != ""]}
-        else:
-            terrain_formula = {}
-
-        texture_formula_raw = self.texture_formula_text.get("0.0", "end").strip()
-        texture_formula = [l for l in texture_formula_raw.splitlines() if l.strip()] if texture_formula_raw else []
+        return {"TERRAIN_DATA": self.model.terrain.to_json()}
 
-        terrain = {
-            "TERRAIN_TEXTURE_DATA": tex,
-            "terrainFormulaDifficulties": terrain_formula,
-            "textureFormula": texture_formula,
-            "verticeSize": float(self.verticeSize.get()),
-            "collider": bool(self.collider_var.get()),
-            "flatZones": flat_list
-        }
 
-        return {"TERRAIN_DATA": terrain}
+def _closed_polar_coords(r, cos, sin, cx, cy):
+    """Flat [x0, y0, x1, y1, ...] list for a closed polar outline."""
+    coords = np.empty(2 * (r.size + 1))
+    coords[0:-2:2] = cx + r * cos
+    coords[1:-2:2] = cy - r * sin
+    coords[-2:] = coords[:2]
+    return coords.tolist()
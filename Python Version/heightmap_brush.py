@@ -0,0 +1,110 @@
+# heightmap_brush.py
+"""
+Brush tools for 1D heightmaps (values normalized to 0..1).
+
+A stroke arrives as segments between consecutive mouse events. Each segment is
+applied as one NumPy slice operation over the samples within `radius` of the
+segment, so the cost follows brush size and stroke length, not map size.
+"""
+import numpy as np
+
+TOOLS = ("Draw", "Raise", "Lower", "Smooth", "Flatten", "Noise")
+FALLOFFS = ("Smooth", "Linear", "Constant")
+
+# Height change of one Raise/Lower/Noise application at full strength
+STEP = 0.05
+
+
+def falloff_weights(distance, radius, falloff="Smooth"):
+    """Weight 1 on the stroke, fading to 0 at `radius` samples away."""
+    t = np.clip(distance / (radius + 1.0), 0.0, 1.0)
+    if falloff == "Constant":
+        return (t < 1.0).astype(float)
+    if falloff == "Linear":
+        return 1.0 - t
+    return 0.5 * (1.0 + np.cos(np.pi * t))
+
+
+def _box_blur(values, half_width):
+    """Moving average with edge padding, via a cumulative sum."""
+    if half_width < 1:
+        return values.copy()
+    padded = np.pad(values, half_width + 1, mode="edge")
+    csum = np.cumsum(padded)
+    window = 2 * half_width + 1
+    return (csum[window:] - csum[:-window])[:len(values)] / window
+
+
+def stroke_span(n, start_index, end_index, radius):
+    """(start, stop) range of samples apply_stroke may touch for a segment."""
+    lo_index, hi_index = sorted((int(np.clip(start_index, 0, n - 1)), int(np.clip(end_index, 0, n - 1))))
+    radius = max(0, int(radius))
+    return max(0, lo_index - radius), min(n, hi_index + radius + 1)
+
+
+def apply_stroke(points, tool, start_index, start_height, end_index, end_height,
+                 radius=0, strength=0.5, falloff="Smooth", rng=None):
+    """
+    Apply one stroke segment in place.
+
+    Args:
+        points (ndarray): Heightmap samples, modified in place.
+        tool (str): One of TOOLS.
+        start_index, end_index (int): Sample indices of the segment ends.
+        start_height, end_height (float): Pointer heights (0..1) at those ends.
+            Draw follows them; Flatten pulls toward them (pass the stroke's
+            first height for both to flatten to a level).
+        radius (int): Brush radius in samples.
+        strength (float): 0..1. Scales STEP for Raise/Lower/Noise and is the
+            blend factor for Smooth/Flatten.
+        falloff (str): One of FALLOFFS.
+
+    Returns:
+        (start, stop): The range of samples that may have changed.
+    """
+    n = len(points)
+    if n == 0:
+        return 0, 0
+    if start_index > end_index:
+        start_index, end_index = end_index, start_index
+        start_height, end_height = end_height, start_height
+    start_index = int(np.clip(start_index, 0, n - 1))
+    end_index = int(np.clip(end_index, 0, n - 1))
+    radius = max(0, int(radius))
+
+    lo, hi = stroke_span(n, start_index, end_index, radius)
+    idx = np.arange(lo, hi)
+    distance = np.maximum(0, np.maximum(start_index - idx, idx - end_index))
+    weight = falloff_weights(distance, radius, falloff)
+    current = points[lo:hi]
+    strength = min(1.0, max(0.0, float(strength)))
+
+    if tool in ("Draw", "Flatten"):
+        if end_index > start_index:
+            target = np.interp(idx, (start_index, end_index), (start_height, end_height))
+        else:
+            target = np.full(hi - lo, float(start_height))
+        if tool == "Draw":
+            # The pencil always reaches the pointer on the stroke itself
+            weight = np.where(distance == 0, 1.0, weight)
+        else:
+            weight = weight * strength
+        current += (target - current) * weight
+    elif tool == "Raise":
+        current += STEP * strength * weight
+    elif tool == "Lower":
+        current -= STEP * strength * weight
+    elif tool == "Smooth":
+        # Blur a window padded by the radius so the edges see real neighbours
+        pad_lo = max(0, lo - radius)
+        pad_hi = min(n, hi + radius)
+        blurred = _box_blur(points[pad_lo:pad_hi], max(1, radius // 2))[lo - pad_lo:hi - pad_lo]
+        current += (blurred - current) * weight * strength
+    elif tool == "Noise":
+        rng = rng or np.random.default_rng()
+        current += rng.standard_normal(hi - lo) * STEP * strength * weight
+    else:
+        raise ValueError(f"Unknown brush tool: {tool!r}")
+
+    np.clip(current, 0.0, 1.0, out=current)
+    return lo, hi
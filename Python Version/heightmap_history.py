@@ -0,0 +1,117 @@
+# heightmap_history.py
+"""
+Delta-based undo/redo for heightmap edits.
+
+A stroke is stored as (start index, old slice) instead of a full snapshot, so
+memory and undo/redo cost follow the stroke size, not the map size. Entries
+live in a bounded ring buffer: the oldest are dropped once the total size
+goes over `max_bytes`.
+"""
+from collections import deque
+
+
+class EditHistory:
+    """
+    Usage:
+        history.begin()
+        history.record(points, start, stop)   # before changing points[start:stop]
+        ...                                    # more segments of the same stroke
+        history.commit(points)                 # after the stroke
+        span = history.undo(points)            # -> (start, stop) changed, or None
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_steps=500):
+        self.max_bytes = max_bytes
+        self.max_steps = max_steps
+        self._undo = deque()
+        self._redo = deque()
+        self._pending = None        # [(start, old slice)] of the open stroke
+        self.bytes_used = 0
+
+    # ---------------------------------------------
+    # Recording
+    # ---------------------------------------------
+    def begin(self):
+        self._pending = []
+
+    def record(self, points, start, stop):
+        """Save points[start:stop] before it is modified."""
+        start, stop = max(0, start), min(len(points), stop)
+        if stop <= start:
+            return
+        if self._pending is None:
+            self.begin()
+        self._pending.append((start, points[start:stop].copy()))
+
+    def commit(self, points):
+        """Close the open stroke and push it as a single undo step."""
+        deltas, self._pending = self._pending, None
+        if not deltas:
+            return
+        lo = min(start for start, _ in deltas)
+        hi = max(start + len(old) for start, old in deltas)
+        # Rebuild the pre-stroke state of the touched range: replay the saved
+        # slices newest to oldest, so the earliest value of every sample wins
+        before = points[lo:hi].copy()
+        for start, old in reversed(deltas):
+            before[start - lo:start - lo + len(old)] = old
+        if (before == points[lo:hi]).all():
+            return      # the stroke did not change anything
+
+        self._release(self._redo)
+        self._undo.append((lo, before))
+        self.bytes_used += before.nbytes
+        self._trim()
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._pending = None
+        self.bytes_used = 0
+
+    # ---------------------------------------------
+    # Undo / redo
+    # ---------------------------------------------
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self, points):
+        return self._swap(points, self._undo, self._redo)
+
+    def redo(self, points):
+        return self._swap(points, self._redo, self._undo)
+
+    def _swap(self, points, source, target):
+        if not source:
+            return None
+        start, values = source.pop()
+        stop = start + len(values)
+        if stop > len(points):
+            # Map was resized behind our back; the entry no longer applies
+            self.clear()
+            return None
+        current = points[start:stop].copy()
+        points[start:stop] = values
+        target.append((start, current))
+        self._trim()
+        return start, stop
+
+    # ---------------------------------------------
+    # Memory cap
+    # ---------------------------------------------
+    def _release(self, entries):
+        self.bytes_used -= sum(values.nbytes for _, values in entries)
+        entries.clear()
+
+    def _trim(self):
+        while self._undo and (self.bytes_used > self.max_bytes or len(self._undo) > self.max_steps):
+            _, values = self._undo.popleft()
+            self.bytes_used -= values.nbytes
+        while self._redo and self.bytes_used > self.max_bytes:
+            _, values = self._redo.popleft()
+            self.bytes_used -= values.nbytes
@@ -0,0 +1,104 @@
+# heightmap_io.py
+"""
+Heightmap file formats.
+
+    .npy            NumPy array, opened memory-mapped
+    .f32 / .raw     raw little-endian float32 samples, opened memory-mapped
+    .f16            raw little-endian float16 samples, opened memory-mapped
+    .txt / .json    {"points": [...]} JSON, the SFS-compatible output format
+
+Binary files are opened copy-on-write: pages are read from disk only when
+touched and edits never write back to the source file, so opening a
+multi-hundred-MB heightmap does not load it into RAM.
+"""
+import json
+import os
+
+import numpy as np
+
+from sfs_exporter import atomic_open
+
+RAW_DTYPES = {
+    ".f32": np.dtype("<f4"),
+    ".raw": np.dtype("<f4"),
+    ".f16": np.dtype("<f2"),
+}
+JSON_EXTENSIONS = (".txt", ".json")
+
+FILETYPES = [
+    ("Heightmap Text (SFS)", "*.txt"),
+    ("JSON", "*.json"),
+    ("NumPy array", "*.npy"),
+    ("Raw float32", "*.f32 *.raw"),
+    ("Raw float16", "*.f16"),
+    ("All files", "*.*"),
+]
+
+
+def _extension(path):
+    return os.path.splitext(path)[1].lower()
+
+
+def load_heightmap(path):
+    """Open a heightmap; binary formats come back as copy-on-write memmaps."""
+    ext = _extension(path)
+    if ext == ".npy":
+        points = np.load(path, mmap_mode="c")
+    elif ext in RAW_DTYPES:
+        points = np.memmap(path, dtype=RAW_DTYPES[ext], mode="c")
+    elif ext in JSON_EXTENSIONS:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        points = np.asarray(data["points"] if isinstance(data, dict) else data, dtype=float)
+    else:
+        raise ValueError(f"Unsupported heightmap format: {ext or path}")
+
+    if points.ndim != 1 or len(points) < 2:
+        raise ValueError("A heightmap must be a 1D array with at least 2 points.")
+    return points
+
+
+def as_points(points):
+    """
+    Float sample array for the editor. Float ndarrays are returned as they
+    are, so a memmap from load_heightmap stays a memmap (and MinMaxPyramid
+    reduces it in chunks); anything else is converted to float.
+    """
+    if isinstance(points, np.ndarray) and np.issubdtype(points.dtype, np.floating):
+        return points
+    return np.asarray(points, dtype=float)
+
+
+def save_heightmap(path, points):
+    """Write `points` in the format chosen by the file extension (atomically)."""
+    points = np.asarray(points)
+    ext = _extension(path)
+    if ext == ".npy":
+        with atomic_open(path, "wb") as f:
+            np.save(f, points, allow_pickle=False)
+    elif ext in RAW_DTYPES:
+        with atomic_open(path, "wb") as f:
+            points.astype(RAW_DTYPES[ext], copy=False).tofile(f)
+    elif ext in JSON_EXTENSIONS or not ext:
+        save_heightmap_json(path, points)
+    else:
+        raise ValueError(f"Unsupported heightmap format: {ext}")
+
+
+def save_heightmap_json(path, points):
+    """
+    Write the {"points": [...]} JSON used in SFS files.
+
+    Produces exactly json.dump(..., indent=2) output, but joins the float
+    reprs directly instead of going through the pure-Python indent encoder.
+    """
+    values = np.asarray(points, dtype=float)
+    if not np.all(np.isfinite(values)):
+        raise ValueError("Heightmap contains NaN or infinite values.")
+    with atomic_open(path, "w") as f:
+        if len(values) == 0:
+            f.write('{\n  "points": []\n}')
+            return
+        f.write('{\n  "points": [\n    ')
+        f.write(",\n    ".join(map(repr, values.tolist())))
+        f.write("\n  ]\n}")
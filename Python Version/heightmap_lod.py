@@ -0,0 +1,124 @@
+# heightmap_lod.py
+"""
+Min/max level-of-detail pyramid for drawing very long heightmaps.
+
+Level k stores the min and max of every block of 2**k samples. Drawing a map
+of n samples into W pixel columns reads the deepest level whose blocks still
+fit inside one column, so the cost depends on W rather than on n. Edits only
+rebuild the blocks that cover the edited range on each level.
+
+Memory-mapped maps are never read whole into RAM: their first stored level
+is coarse enough to hold at most MAPPED_LEVEL_SAMPLES blocks, and it is
+reduced from the file CHUNK_SAMPLES at a time.
+"""
+import numpy as np
+
+# Blocks on the finest stored level of a memory-mapped heightmap
+MAPPED_LEVEL_SAMPLES = 1 << 20
+# Samples read from the source per step while reducing the finest level
+CHUNK_SAMPLES = 1 << 22
+
+
+class MinMaxPyramid:
+    """
+    Usage:
+        pyramid = MinMaxPyramid(points)
+        points[a:b] = ...
+        pyramid.update(a, b)
+        lows, highs = pyramid.columns(800)
+    """
+
+    def __init__(self, points):
+        self.points = points
+        self.base = 1           # level of levels[0]
+        self.levels = []        # [(mins, maxs)] for block sizes 2**base, 2**(base+1), ...
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute every level from scratch (after replacing or resizing points)."""
+        n = len(self.points)
+        self.base = 1
+        if isinstance(self.points, np.memmap):
+            while (n >> self.base) > MAPPED_LEVEL_SAMPLES:
+                self.base += 1
+        self.levels = []
+        if n <= 1:
+            return
+        mins = _block_reduce(self.points, 0, n, self.base, np.minimum)
+        maxs = _block_reduce(self.points, 0, n, self.base, np.maximum)
+        self.levels.append((mins, maxs))
+        while len(mins) > 1:
+            mins, maxs = _halve(mins, np.minimum), _halve(maxs, np.maximum)
+            self.levels.append((mins, maxs))
+
+    def update(self, start, stop):
+        """Refresh the blocks covering points[start:stop] on every level."""
+        start = max(0, start)
+        stop = min(len(self.points), stop)
+        if stop <= start or not self.levels:
+            return
+        # Finest stored level straight from the points, the others pairwise
+        start >>= self.base
+        stop = ((stop - 1) >> self.base) + 1
+        mins, maxs = self.levels[0]
+        lo, hi = start << self.base, min(stop << self.base, len(self.points))
+        mins[start:stop] = _block_reduce(self.points, lo, hi, self.base, np.minimum)
+        maxs[start:stop] = _block_reduce(self.points, lo, hi, self.base, np.maximum)
+        below_min, below_max = mins, maxs
+        for mins, maxs in self.levels[1:]:
+            start >>= 1
+            stop = (stop + 1) >> 1
+            lo, hi = 2 * start, min(2 * stop, len(below_min))
+            mins[start:stop] = _halve(below_min[lo:hi], np.minimum)
+            maxs[start:stop] = _halve(below_max[lo:hi], np.maximum)
+            below_min, below_max = mins, maxs
+
+    def columns(self, width, start_col=0, stop_col=None):
+        """
+        Min and max sample per pixel column, for columns [start_col, stop_col)
+        of a `width` pixel wide view of the whole map.
+        """
+        n = len(self.points)
+        width = max(1, int(width))
+        stop_col = width if stop_col is None else min(width, stop_col)
+
+        edges = (np.arange(start_col, stop_col + 1, dtype=np.int64) * n) // width
+        level = int(np.log2(n / width)) if n >= 2 * width else 0
+        if level < self.base:
+            # Finer than the stored levels: at most width * 2**base samples, read directly
+            level = 0
+            mins = maxs = self.points
+        else:
+            mins, maxs = self.levels[level - self.base]
+
+        # Each column reduces the blocks starting inside it; a block may overhang
+        # into the next column by less than one block, invisible at this zoom
+        starts = edges[:-1] >> level
+        end = len(mins) if stop_col == width else int(edges[-1]) >> level
+        end = min(len(mins), max(end, int(starts[-1]) + 1))
+        offset = int(starts[0])
+        lows = np.minimum.reduceat(mins[offset:end], starts - offset)
+        highs = np.maximum.reduceat(maxs[offset:end], starts - offset)
+        return lows, highs
+
+
+def _halve(values, reduce):
+    """Pairwise reduce; an odd trailing sample is kept as its own block (no copy of `values`)."""
+    return reduce.reduceat(values, np.arange(0, len(values), 2))
+
+
+def _block_reduce(points, start, stop, level, reduce):
+    """
+    Reduce points[start:stop] (start a multiple of 2**level) in blocks of
+    2**level samples, reading CHUNK_SAMPLES at a time. The last block may be
+    shorter.
+    """
+    block = 1 << level
+    out = np.empty((stop - start + block - 1) >> level, dtype=np.result_type(points.dtype, float))
+    chunk = max(block, CHUNK_SAMPLES - CHUNK_SAMPLES % block)
+    for lo in range(start, stop, chunk):
+        hi = min(stop, lo + chunk)
+        first = (lo - start) >> level
+        values = points[lo:hi]
+        out[first:first + ((hi - lo + block - 1) >> level)] = reduce.reduceat(values, np.arange(0, hi - lo, block))
+    return out
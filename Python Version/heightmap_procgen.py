@@ -0,0 +1,242 @@
+# heightmap_procgen.py
+"""
+Seeded, vectorized procedural generators for 1D heightmaps (values 0..1).
+
+Every generator is deterministic for a given seed and accepts optional
+`progress(fraction)` and `cancel` (anything with is_set(), e.g. a
+threading.Event) arguments so it can run on a worker thread. Work is split
+into octaves / iterations / craters, and cancellation is checked between them.
+
+Generators that build a new map take the sample count `n`; passes that
+modify an existing map (craters, erosion) take `points` and return a new array.
+"""
+import numpy as np
+
+# Erosion runs on a grid of at most this many samples (see _on_work_grid)
+WORK_SAMPLES = 1 << 16
+
+
+class GenerationCancelled(Exception):
+    """Raised inside a generator when its cancel event is set."""
+
+
+def _step(progress, cancel, fraction):
+    if cancel is not None and cancel.is_set():
+        raise GenerationCancelled()
+    if progress is not None:
+        progress(min(1.0, fraction))
+
+
+def _normalize(values):
+    lo, hi = float(values.min()), float(values.max())
+    if hi <= lo:
+        return np.zeros_like(values)
+    values -= lo
+    values /= hi - lo
+    return values
+
+
+def _value_noise_octave(u, cells, rng):
+    """Periodic smoothstep-interpolated value noise with `cells` lattice cells over u in [0, 1)."""
+    lattice = rng.random(cells + 1)
+    lattice[-1] = lattice[0]        # wrap so the map tiles around the planet
+    x = u * cells
+    i = x.astype(np.int64)
+    t = x - i
+    t *= t * (3.0 - 2.0 * t)
+    lo = lattice[i]
+    return lo + (lattice[i + 1] - lo) * t
+
+
+# ---------------------------------------------
+# NEW MAPS
+# ---------------------------------------------
+def fractal_noise(n, seed=0, octaves=6, base_cells=8, persistence=0.5, progress=None, cancel=None):
+    """Fractal (fBm) value noise: octaves of doubling frequency and shrinking amplitude."""
+    rng = np.random.default_rng(seed)
+    u = np.arange(n) / n
+    total = np.zeros(n)
+    amplitude = 1.0
+    for octave in range(octaves):
+        _step(progress, cancel, octave / octaves)
+        cells = min(base_cells << octave, max(1, n))
+        total += amplitude * _value_noise_octave(u, cells, rng)
+        amplitude *= persistence
+    _step(progress, cancel, 1.0)
+    return _normalize(total)
+
+
+def ridged_noise(n, seed=0, octaves=6, base_cells=8, persistence=0.5, progress=None, cancel=None):
+    """Ridged multifractal noise: sharp crests from folded noise, sharper on higher octaves."""
+    rng = np.random.default_rng(seed)
+    u = np.arange(n) / n
+    total = np.zeros(n)
+    amplitude = 1.0
+    weight = np.ones(n)
+    for octave in range(octaves):
+        _step(progress, cancel, octave / octaves)
+        cells = min(base_cells << octave, max(1, n))
+        ridge = 1.0 - np.abs(2.0 * _value_noise_octave(u, cells, rng) - 1.0)
+        ridge *= ridge
+        ridge *= weight
+        weight = np.clip(ridge * 2.0, 0.0, 1.0)
+        total += amplitude * ridge
+        amplitude *= persistence
+    _step(progress, cancel, 1.0)
+    return _normalize(total)
+
+
+# ---------------------------------------------
+# PASSES OVER AN EXISTING MAP
+# ---------------------------------------------
+def stamp_craters(points, seed=0, count=40, min_radius=0.002, max_radius=0.03, depth=0.15,
+                  progress=None, cancel=None):
+    """
+    Stamp bowl-shaped craters with raised rims. Radii are fractions of the map
+    length; small craters are more common than large ones. Each crater only
+    touches the samples it covers.
+    """
+    points = np.array(points, dtype=float)
+    n = len(points)
+    rng = np.random.default_rng(seed)
+    # Power-law size distribution
+    radii = min_radius * (max_radius / min_radius) ** (rng.random(count) ** 2)
+    centers = rng.random(count)
+    for k in range(count):
+        if k % 16 == 0:
+            _step(progress, cancel, k / max(1, count))
+        r = max(2, int(radii[k] * n))
+        c = int(centers[k] * n)
+        idx = np.arange(c - 2 * r, c + 2 * r + 1)
+        x = (idx - c) / r
+        bowl = np.where(np.abs(x) < 1.0, x * x - 1.0, 0.0)
+        rim = 0.35 * np.exp(-((np.abs(x) - 1.0) * 4.0) ** 2)
+        profile = (bowl + rim) * depth * (radii[k] / max_radius) ** 0.5
+        np.add.at(points, idx % n, profile)     # wraps around the planet
+    _step(progress, cancel, 1.0)
+    return np.clip(points, 0.0, 1.0)
+
+
+def _on_work_grid(points, erode):
+    """
+    Run an erosion pass on at most WORK_SAMPLES samples and add the upsampled
+    change back onto the full map. Erosion only moves material between
+    neighbours, so this keeps its scale (and cost) independent of resolution.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n <= WORK_SAMPLES:
+        return erode(np.array(points))
+    full_x = np.arange(n)
+    work_x = np.linspace(0.0, n - 1, WORK_SAMPLES)
+    coarse = np.interp(work_x, full_x, points)
+    delta = erode(coarse.copy()) - coarse
+    return np.clip(points + np.interp(full_x, work_x, delta), 0.0, 1.0)
+
+
+def thermal_erosion(points, iterations=50, talus=0.002, rate=0.5, progress=None, cancel=None):
+    """
+    Move material downhill wherever the slope exceeds `talus`, given as the
+    height difference over 1/1000 of the map length.
+    """
+    return _on_work_grid(points, lambda p: _thermal(p, iterations, talus, rate, progress, cancel))
+
+
+def _thermal(points, iterations, talus, rate, progress, cancel):
+    talus = talus * 1000.0 / len(points)       # per-sample slope
+    moved = np.empty(len(points) - 1)
+    for it in range(iterations):
+        if it % 4 == 0:
+            _step(progress, cancel, it / max(1, iterations))
+        diff = np.subtract(points[1:], points[:-1], out=moved)     # points[i+1] - points[i]
+        excess = np.abs(diff)
+        excess -= talus
+        np.maximum(excess, 0.0, out=excess)
+        excess *= rate * 0.5
+        np.copysign(excess, diff, out=moved)
+        points[:-1] += moved
+        points[1:] -= moved
+    _step(progress, cancel, 1.0)
+    return points
+
+
+def hydraulic_erosion(points, iterations=60, rain=0.002, solubility=0.3, evaporation=0.05,
+                      progress=None, cancel=None):
+    """
+    Grid-based water erosion: rain dissolves material, water flows to the lower
+    neighbour carrying sediment, and sediment settles as water evaporates.
+    """
+    return _on_work_grid(points, lambda p: _hydraulic(p, iterations, rain, solubility, evaporation,
+                                                      progress, cancel))
+
+
+def _hydraulic(height, iterations, rain, solubility, evaporation, progress, cancel):
+    water = np.zeros_like(height)
+    sediment = np.zeros_like(height)
+    flow = np.empty(len(height) - 1)
+    carried = np.empty(len(height) - 1)
+    share = np.empty_like(height)
+    dissolved = solubility * rain
+    for it in range(iterations):
+        if it % 4 == 0:
+            _step(progress, cancel, it / max(1, iterations))
+        water += rain                   # water stays > 0 from here on
+        height -= dissolved
+        sediment += dissolved
+
+        # flow > 0 moves water from i+1 to i (i+1 has the higher surface)
+        np.subtract(height[1:], height[:-1], out=flow)
+        flow += water[1:]
+        flow -= water[:-1]
+        flow *= 0.5
+        # A cell gives at most half its water to each side, so it never goes negative
+        np.clip(flow, -0.5 * water[:-1], 0.5 * water[1:], out=flow)
+
+        np.divide(sediment, water, out=share)
+        np.copyto(carried, share[:-1])
+        np.copyto(carried, share[1:], where=flow > 0.0)
+        carried *= flow
+
+        water[:-1] += flow
+        water[1:] -= flow
+        sediment[:-1] += carried
+        sediment[1:] -= carried
+
+        water *= 1.0 - evaporation
+        # Sediment above the water's carrying capacity settles
+        np.multiply(water, -solubility, out=share)
+        share += sediment
+        np.maximum(share, 0.0, out=share)
+        sediment -= share
+        height += share
+    height += sediment          # whatever is still suspended settles in place
+    _step(progress, cancel, 1.0)
+    return np.clip(height, 0.0, 1.0)
+
+
+# name -> (function, creates_new_map, detail keyword)
+GENERATORS = {
+    "Fractal noise": (fractal_noise, True, "octaves"),
+    "Ridged noise": (ridged_noise, True, "octaves"),
+    "Craters": (stamp_craters, False, "count"),
+    "Thermal erosion": (thermal_erosion, False, "iterations"),
+    "Hydraulic erosion": (hydraulic_erosion, False, "iterations"),
+}
+
+
+def generate(name, points, seed=0, detail=None, progress=None, cancel=None):
+    """
+    Run generator `name` and return the new map.
+
+    `points` supplies the sample count for new maps and the input for passes.
+    `detail` is the generator's main knob (octaves / crater count / iterations).
+    """
+    func, creates_new, detail_key = GENERATORS[name]
+    kwargs = {"progress": progress, "cancel": cancel}
+    if detail is not None:
+        kwargs[detail_key] = int(detail)
+    if creates_new:
+        return func(len(points), seed=seed, **kwargs)
+    if func is stamp_craters:
+        kwargs["seed"] = seed
+    return func(points, **kwargs)
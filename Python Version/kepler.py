@@ -0,0 +1,100 @@
+# kepler.py
+"""
+Batched two-body (Kepler) propagation, usable without the GUI.
+
+Every function broadcasts over NumPy arrays, so one call can propagate many
+orbits over many times:
+
+    times = np.linspace(0.0, period, 1000)[:, None]      # (T, 1)
+    pos, vel = propagate(times, a, e, arg, direction, mu)  # a, e, ... shaped (N,)
+    # pos and vel are (T, N, 2)
+
+Conventions match ORBIT_DATA: `arg_peri` in degrees, `direction` 1 (prograde)
+or -1 (retrograde), positions in meters with the parent at the origin, and the
+body at periapsis at t = 0 unless `mean_anomaly0` says otherwise. The parent's
+gravitational parameter comes from its surface gravity and radius, as SFS
+stores them in BASE_DATA.
+"""
+import numpy as np
+
+TWO_PI = 2.0 * np.pi
+
+
+def gravitational_parameter(gravity, radius):
+    """mu = g * R**2 (m^3/s^2) from surface gravity (m/s^2) and radius (m)."""
+    return np.asarray(gravity, dtype=float) * np.square(np.asarray(radius, dtype=float))
+
+
+def mean_motion(semi_major_axis, mu):
+    """Mean angular motion n (rad/s)."""
+    return np.sqrt(mu / np.power(semi_major_axis, 3.0))
+
+
+def orbital_period(semi_major_axis, mu):
+    """Orbital period (s)."""
+    return TWO_PI / mean_motion(semi_major_axis, mu)
+
+
+def solve_kepler(mean_anomaly, eccentricity, tolerance=1e-12, max_iterations=30):
+    """
+    Eccentric anomaly E with E - e*sin(E) = M, by Newton iterations run on the
+    whole array at once. Stops when every element has converged.
+    """
+    mean_anomaly = np.mod(mean_anomaly, TWO_PI)
+    eccentricity = np.asarray(eccentricity, dtype=float)
+    # Starting at pi converges reliably for high eccentricities
+    anomaly = np.where(eccentricity < 0.8, mean_anomaly, np.pi)
+    for _ in range(max_iterations):
+        residual = anomaly - eccentricity * np.sin(anomaly) - mean_anomaly
+        if np.all(np.abs(residual) < tolerance):
+            break
+        anomaly -= residual / (1.0 - eccentricity * np.cos(anomaly))
+    return anomaly
+
+
+def _mean_anomaly(times, semi_major_axis, mu, mean_anomaly0):
+    return np.mod(mean_anomaly0 + mean_motion(semi_major_axis, mu) * times, TWO_PI)
+
+
+def propagate(times, semi_major_axis, eccentricity, arg_peri, direction, mu, mean_anomaly0=0.0):
+    """
+    Positions and velocities at `times` (s).
+
+    Returns:
+        (positions, velocities): arrays of the broadcast input shape plus a
+        trailing axis of 2 (x, y), in m and m/s.
+    """
+    a = np.asarray(semi_major_axis, dtype=float)
+    e = np.asarray(eccentricity, dtype=float)
+    direction = np.sign(np.asarray(direction, dtype=float))
+    anomaly = solve_kepler(_mean_anomaly(times, a, mu, mean_anomaly0), e)
+
+    cos_e, sin_e = np.cos(anomaly), np.sin(anomaly)
+    b = a * np.sqrt(1.0 - e * e)
+    rate = mean_motion(a, mu) / (1.0 - e * cos_e)       # dE/dt
+
+    # Orbit frame: periapsis along +x, motion toward +y when prograde
+    x = a * (cos_e - e)
+    y = direction * b * sin_e
+    vx = -a * sin_e * rate
+    vy = direction * b * cos_e * rate
+
+    ang = np.radians(arg_peri)
+    cos_w, sin_w = np.cos(ang), np.sin(ang)
+    positions = np.stack(np.broadcast_arrays(x * cos_w - y * sin_w, x * sin_w + y * cos_w), axis=-1)
+    velocities = np.stack(np.broadcast_arrays(vx * cos_w - vy * sin_w, vx * sin_w + vy * cos_w), axis=-1)
+    return positions, velocities
+
+
+def time_to_periapsis(times, semi_major_axis, mu, mean_anomaly0=0.0):
+    """Seconds until the next periapsis passage (0 exactly at periapsis)."""
+    remaining = np.mod(-_mean_anomaly(times, semi_major_axis, mu, mean_anomaly0), TWO_PI)
+    return remaining / mean_motion(semi_major_axis, mu)
+
+
+def elements_from_orbit_data(orbit):
+    """(semi_major_axis, eccentricity, arg_peri, direction) from an ORBIT_DATA dict."""
+    return (float(orbit.get("semiMajorAxis", 0.0)),
+            float(orbit.get("eccentricity", 0.0)),
+            float(orbit.get("argumentOfPeriapsis", 0.0)),
+            int(orbit.get("direction", 1)) or 1)
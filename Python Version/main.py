@@ -1,35 +1,107 @@
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import importlib
 import os
 import json
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-# Import editors
-from gui.planet_properties import PlanetPropertiesEditor
-from gui.post_properties import PostProcessingEditor
-from gui.atmo_editor import AtmosphereEditor
-from gui.terrain_editor import TerrainEditor
-from gui.landmarks_editor import LandmarksEditor
-from gui.orbit_editor import OrbitEditor
-from gui.heightmap_generator import HeightmapGUI
+# Editors, the heavy modules (numpy, customtkinter) and the loader/exporter
+# are imported when first needed; see EDITOR_TABS / TOOL_TABS
+from gui.lazy_notebook import LazyNotebook
+from planet_model import SECTIONS, PlanetModel
+
+# Per-file import errors listed in the summary dialog
+IMPORT_ERRORS_SHOWN = 10
+
+# Cold start (process start to first drawn frame) we aim to stay under
+STARTUP_TARGET_MS = 1000
+
+# Seconds without edits before the planet is autosaved to a recovery file
+AUTOSAVE_IDLE_SECONDS = 3.0
+
+# Editors of the current planet: (attribute, tab title, module, class).
+# Each tab is built the first time it is selected and edits self.model.
+EDITOR_TABS = (
+    ("planet_properties_tab", "Planet Properties", "gui.planet_properties", "PlanetPropertiesEditor"),
+    ("post_properties_tab", "Post Properties", "gui.post_properties", "PostProcessingEditor"),
+    ("atmo_editor_tab", "Atmosphere", "gui.atmo_editor", "AtmosphereEditor"),
+    ("terrain_editor_tab", "Terrain", "gui.terrain_editor", "TerrainEditor"),
+    ("landmarks_editor_tab", "Landmarks", "gui.landmarks_editor", "LandmarksEditor"),
+    ("orbit_editor_tab", "Orbit", "gui.orbit_editor", "OrbitEditor"),
+    ("heightmap_tab", "Heightmap Generator", "gui.heightmap_generator", "HeightmapGUI"),
+)
+# Tabs that do not edit the current planet: (attribute, tab title, module, class)
+TOOL_TABS = (
+    ("system_view_tab", "Solar System", "gui.system_view", "SystemView"),
+    ("library_tab", "Library", "gui.library_browser", "LibraryBrowser"),
+)
+
 
-# Import loader/exporter
-from sfs_loader import choose_and_load_planet
-from sfs_exporter import SFSExporter
+class StartupProfile:
+    """Collects (label, seconds) timings for --startup-profile; free when disabled."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.timings = []
+
+    def measure(self, label, func, *args, **kwargs):
+        if not self.enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.timings.append((label, time.perf_counter() - start))
+
+    def report(self):
+        total_ms = (time.perf_counter() - _PROCESS_START) * 1000.0
+        print("Startup profile")
+        for label, seconds in self.timings:
+            print(f"  {seconds * 1000.0:8.1f} ms  {label}")
+        verdict = "OK" if total_ms <= STARTUP_TARGET_MS else "OVER TARGET"
+        print(f"  {total_ms:8.1f} ms  first frame (target {STARTUP_TARGET_MS} ms: {verdict})")
+
+    def report_rendering(self, scheduler):
+        """Redraw requests vs. frames actually drawn per canvas (see gui.render_scheduler)."""
+        if not self.enabled:
+            return
+        print("Render profile (requests coalesced into frames)")
+        for line in scheduler.format_stats() or ["  no redraws"]:
+            print(line)
 
 
 class PlanetMakerApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, profile=None, autosave_idle=AUTOSAVE_IDLE_SECONDS):
+        self.profile = profile or StartupProfile()
+        self.profile.measure("Tk root", super().__init__)
         self.title("SFS Planet Maker")
         self.geometry("1000x700")
 
         self.planet_data = {}
+        self.model = PlanetModel(self.planet_data)     # what the editors edit
         self.file_path = None
+        self._project = None        # see the project property
+        self._import_cancel = None
+        self._import_events = None
+        self._export_fragments = None   # sfs_exporter.FragmentCache, made on first export
+        self.autosave = None            # autosave.AutosaveService, None when disabled
 
         self.create_menu()
-        self.create_tabs()
+        self.create_status_bar()
+        self.profile.measure("create_tabs", self.create_tabs)
+        if autosave_idle > 0:
+            self.profile.measure("autosave", self.start_autosave, autosave_idle)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        if self.profile.enabled:
+            self.after_idle(self.profile.report)
 
     # ---------------------------------------------
     # MENU
@@ -39,36 +111,97 @@ class PlanetMakerApp(tk.Tk):
         file_menu = tk.Menu(menubar, tearoff=0)
 
         file_menu.add_command(label="Load Planet", command=self.load_planet)
+        file_menu.add_command(label="Import System Folder...", command=self.import_system)
         file_menu.add_command(label="Export Planet", command=self.export_planet)
+        file_menu.add_command(label="Open Recovery File...", command=self.open_recovery_file)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.quit)
+        file_menu.add_command(label="Exit", command=self.close)
 
         menubar.add_cascade(label="File", menu=file_menu)
         self.config(menu=menubar)
 
+    # ---------------------------------------------
+    # STATUS BAR (planet switcher + import progress)
+    # ---------------------------------------------
+    def create_status_bar(self):
+        bar = ttk.Frame(self)
+        bar.pack(side="bottom", fill="x")
+
+        ttk.Label(bar, text="Planet:").pack(side="left", padx=(6, 2), pady=2)
+        self.planet_switcher = ttk.Combobox(bar, state="readonly", width=30)
+        self.planet_switcher.pack(side="left", padx=2, pady=2)
+        self.planet_switcher.bind("<<ComboboxSelected>>", lambda e: self.switch_planet(self.planet_switcher.get()))
+
+        self.import_cancel_btn = ttk.Button(bar, text="Cancel Import", command=self.cancel_import, state="disabled")
+        self.import_cancel_btn.pack(side="right", padx=6, pady=2)
+        self.import_progress = ttk.Progressbar(bar, length=200, maximum=1.0)
+        self.import_progress.pack(side="right", padx=2, pady=2)
+        self.status_label = ttk.Label(bar, text="")
+        self.status_label.pack(side="right", padx=6, pady=2)
+
+    @property
+    def project(self):
+        """The open planet_project.PlanetProject, created on first use."""
+        if self._project is None:
+            from planet_project import PlanetProject
+            self._project = PlanetProject()
+        return self._project
+
+    def find_body(self, name):
+        """solar_system.Body of the project planet `name`, or None when it is not loaded."""
+        planet = self.project.planets.get(name) if self._project is not None else None
+        if planet is None:
+            return None
+        from solar_system import Body
+        try:
+            return Body.from_planet_data(name, planet, self.project.paths.get(name))
+        except (ValueError, TypeError, AttributeError):
+            return None     # malformed BASE_DATA / ORBIT_DATA: treat as not loaded
+
+    def refresh_switcher(self):
+        self.planet_switcher.configure(values=self.project.names())
+        self.planet_switcher.set(self.project.active or "")
+
     # ---------------------------------------------
     # TABS
     # ---------------------------------------------
     def create_tabs(self):
-        self.tab_control = ttk.Notebook(self)
+        self.tab_control = LazyNotebook(self)
         self.tab_control.pack(expand=True, fill="both")
 
-        # Initialize tabs with empty data
-        self.planet_properties_tab = PlanetPropertiesEditor(self.tab_control, self.planet_data)
-        self.post_properties_tab = PostProcessingEditor(self.tab_control, self.planet_data)
-        self.atmo_editor_tab = AtmosphereEditor(self.tab_control, self.planet_data)
-        self.terrain_editor_tab = TerrainEditor(self.tab_control, self.planet_data)
-        self.landmarks_editor_tab = LandmarksEditor(self.tab_control, self.planet_data)
-        self.orbit_editor_tab = OrbitEditor(self.tab_control, self.planet_data)
-        self.heightmap_tab = HeightmapGUI(self.tab_control, self.planet_data)
+        for attribute, title, module, class_name in EDITOR_TABS:
+            setattr(self, attribute, None)
+            self.tab_control.add_lazy(
+                title,
+                lambda parent, m=module, c=class_name, t=title: self._build_editor(m, c, t, parent),
+                on_built=lambda page, a=attribute: setattr(self, a, page))
+        for attribute, title, module, class_name in TOOL_TABS:
+            setattr(self, attribute, None)
+            self.tab_control.add_lazy(
+                title,
+                lambda parent, m=module, c=class_name, t=title: self._build_tool(m, c, t, parent),
+                on_built=lambda page, a=attribute: setattr(self, a, page))
+
+        # The first tab is visible right away, so it is the only one built at startup
+        self.tab_control.build_selected()
 
-        self.tab_control.add(self.planet_properties_tab.frame, text="Planet Properties")
-        self.tab_control.add(self.post_properties_tab.frame, text="Post Properties")
-        self.tab_control.add(self.atmo_editor_tab.frame, text="Atmosphere")
-        self.tab_control.add(self.terrain_editor_tab.frame, text="Terrain")
-        self.tab_control.add(self.landmarks_editor_tab.frame, text="Landmarks")
-        self.tab_control.add(self.orbit_editor_tab.frame, text="Orbit")
-        self.tab_control.add(self.heightmap_tab.frame, text="Heightmap Generator")
+    def _build_tab(self, module, class_name, title, *args, **kwargs):
+        loaded = self.profile.measure(f"import {module}", importlib.import_module, module)
+        return self.profile.measure(f"build {title} tab", getattr(loaded, class_name), *args, **kwargs)
+
+    def _build_editor(self, module, class_name, title, parent):
+        if class_name == "OrbitEditor":
+            return self._build_tab(module, class_name, title, parent, self.model, find_body=self.find_body)
+        return self._build_tab(module, class_name, title, parent, self.model)
+
+    def _build_tool(self, module, class_name, title, parent):
+        if class_name == "LibraryBrowser":
+            return self._build_tab(module, class_name, title, parent, on_open=self.open_planet_file)
+        return self._build_tab(module, class_name, title, parent)
+
+    def built_editors(self):
+        """Every editor tab built so far."""
+        return [getattr(self, attribute) for attribute, _, _, _ in EDITOR_TABS if getattr(self, attribute) is not None]
 
     # ---------------------------------------------
     # LOAD PLANET
@@ -76,25 +209,148 @@ class PlanetMakerApp(tk.Tk):
     def load_planet(self):
         path = filedialog.askopenfilename(
             title="Select Planet File",
-            filetypes=[("SFS Planet Files", "*.txt")]
+            filetypes=[("SFS Planet Files", "*.txt *.json")]
         )
-        if not path:
-            return
+        if path:
+            self.open_planet_file(path)
 
-        self.planet_data = choose_and_load_planet(path)
-        self.file_path = path
+    def open_planet_file(self, path, name=None):
+        from sfs_loader import load_planet
+        try:
+            planet_data = load_planet(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to load planet file:\n{e}")
+            return
 
-        # Update all editors
-        self.planet_properties_tab.update_data(self.planet_data)
-        self.post_properties_tab.update_data(self.planet_data)
-        self.atmo_editor_tab.update_data(self.planet_data)
-        self.terrain_editor_tab.update_data(self.planet_data)
-        self.landmarks_editor_tab.update_data(self.planet_data)
-        self.orbit_editor_tab.update_data(self.planet_data)
-        self.heightmap_tab.update_data(self.planet_data)
+        # A single file joins the current project like an imported one
+        self.store_editor_data()
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        # A file picked by hand replaces a planet of the same name
+        self.project.add(name, planet_data, path, replace=True)
+        self.project.switch(name)
+        self.refresh_switcher()
+        self.show_active_planet()
 
         messagebox.showinfo("Loaded", f"Loaded planet: {os.path.basename(path)}")
 
+    # ---------------------------------------------
+    # PLANET PROJECT
+    # ---------------------------------------------
+    def store_editor_data(self):
+        """Write the editors' current values back into the active planet before switching away."""
+        current = self.project.active_data
+        if current is None:
+            return
+        collected = self.collect_editor_data()
+        current.update(collected)
+        # Sections the model leaves out when empty (POST_PROCESSING) must not keep their old value
+        for key, _, _ in SECTIONS:
+            if key not in collected:
+                current.pop(key, None)
+
+    def switch_planet(self, name):
+        if not name or name == self.project.active:
+            return
+        self.store_editor_data()
+        self.project.switch(name)
+        self.show_active_planet()
+
+    def show_active_planet(self):
+        self.planet_data = self.project.active_data or {}
+        self.model = PlanetModel.from_dict(self.planet_data)
+        self.file_path = self.project.paths.get(self.project.active)
+        self.update_editors()
+        if self.autosave is not None:
+            self.autosave.watch(self.model, self.project.active)
+
+    def update_editors(self):
+        # Tabs not built yet get self.model when they are first opened
+        for editor in self.built_editors():
+            editor.update_data(self.model)
+
+    # ---------------------------------------------
+    # IMPORT SYSTEM FOLDER
+    # ---------------------------------------------
+    def import_system(self):
+        if self._import_cancel is not None:
+            return
+        folder = filedialog.askdirectory(title="Select a solar system folder")
+        if not folder:
+            return
+
+        self._import_cancel = threading.Event()
+        self._import_events = queue.Queue()
+        threading.Thread(target=self._run_import, args=(folder, self._import_cancel, self._import_events),
+                         daemon=True).start()
+        self.import_progress["value"] = 0.0
+        self.import_cancel_btn.configure(state="normal")
+        self.status_label.configure(text="Importing...")
+        self.after(50, self._poll_import)
+
+    def cancel_import(self):
+        if self._import_cancel is not None:
+            self._import_cancel.set()
+
+    def _run_import(self, folder, cancel, events):
+        """Worker thread: never touches Tk, only the events queue."""
+        from planet_project import ImportCancelled, import_folder
+
+        def progress(done, total, name, error):
+            events.put(("progress", (done, total, name, error)))
+        try:
+            events.put(("done", import_folder(folder, on_progress=progress, cancel=cancel)))
+        except ImportCancelled:
+            events.put(("cancelled", None))
+        except Exception as e:
+            events.put(("error", e))
+
+    def _poll_import(self):
+        while True:
+            try:
+                status, value = self._import_events.get_nowait()
+            except queue.Empty:
+                self.after(50, self._poll_import)
+                return
+            if status != "progress":
+                break
+            done, total, name, error = value
+            self.import_progress["value"] = done / max(1, total)
+            self.status_label.configure(text=f"Importing {done}/{total}: {name}" + (" (failed)" if error else ""))
+
+        self._import_cancel = None
+        self._import_events = None
+        self.import_cancel_btn.configure(state="disabled")
+        if status == "done":
+            self.import_progress["value"] = 1.0
+            self.set_project(value)
+        else:
+            self.import_progress["value"] = 0.0
+            self.status_label.configure(text="Import cancelled." if status == "cancelled" else "Import failed.")
+            if status == "error":
+                messagebox.showerror("Import", f"Import failed:\n{value}")
+
+    def set_project(self, project):
+        if self._project is not None:
+            # Edits to the open planet go into the old project first; the
+            # autosave keeps a recovery file of them when it switches planets
+            self.store_editor_data()
+            if self.model.dirty and not messagebox.askyesno(
+                    "Import", f"{self.project.active or 'The current planet'} has unsaved changes.\n\n"
+                              "Replace the open planets with the imported system?"):
+                self.status_label.configure(text="Import discarded.")
+                return
+        self._project = project
+        self.refresh_switcher()
+        self.show_active_planet()
+        self.status_label.configure(text=f"Imported {len(project.planets)} planet(s)"
+                                         f" from {os.path.basename(project.folder)}")
+        if project.errors:
+            lines = [f"{name}: {error}" for name, error in sorted(project.errors.items())]
+            if len(lines) > IMPORT_ERRORS_SHOWN:
+                lines = lines[:IMPORT_ERRORS_SHOWN] + [f"... and {len(lines) - IMPORT_ERRORS_SHOWN} more"]
+            messagebox.showwarning("Import", f"{len(project.errors)} file(s) could not be loaded:\n\n"
+                                   + "\n".join(lines))
+
     # ---------------------------------------------
     # EXPORT PLANET
     # ---------------------------------------------
@@ -111,29 +367,72 @@ class PlanetMakerApp(tk.Tk):
         # Gather data from all tabs
         planet_data = self.collect_editor_data()
 
+        from sfs_exporter import SFSExporter, FragmentCache
+        if self._export_fragments is None:
+            self._export_fragments = FragmentCache()
         exporter = SFSExporter()
-        exporter.export_planet(save_path, planet_data)
+        # Sections unchanged since the last export are not encoded again
+        exporter.export_planet(save_path, planet_data, fragments=self._export_fragments,
+                               versions=self.model.section_versions())
+        self.model.mark_clean()
 
         messagebox.showinfo("Export Complete", f"Planet saved to:\n{save_path}")
 
 
+    # ---------------------------------------------
+    # AUTOSAVE / RECOVERY
+    # ---------------------------------------------
+    def start_autosave(self, idle_seconds):
+        from autosave import AutosaveService
+        self.autosave = AutosaveService(self.after, self.after_cancel, idle_ms=int(idle_seconds * 1000),
+                                        on_saved=self._autosaved)
+        self.autosave.watch(self.model, self.project.active if self._project else None)
+
+    def _autosaved(self, path, error):
+        if error:
+            self.status_label.configure(text=f"Autosave failed: {error}")
+        else:
+            self.status_label.configure(text=f"Autosaved {time.strftime('%H:%M:%S')}")
+
+    def open_recovery_file(self):
+        from autosave import RECOVERY_FOLDER, recovered_name
+        path = filedialog.askopenfilename(
+            title="Open Recovery File",
+            initialdir=RECOVERY_FOLDER,
+            filetypes=[("Autosaved Planets", "*.autosave.*.txt"), ("SFS Planet Files", "*.txt *.json")]
+        )
+        if path:
+            self.open_planet_file(path, recovered_name(path))
+
+    def close(self):
+        # Pending edits are written to a recovery file before the window goes away
+        if self.autosave is not None:
+            self.autosave.close()
+        if self.profile.enabled:
+            from gui.render_scheduler import RenderScheduler
+            self.profile.report_rendering(RenderScheduler.for_widget(self))
+        self.destroy()
+
     # ---------------------------------------------
     # COLLECT DATA FROM EDITORS
     # ---------------------------------------------
     def collect_editor_data(self):
-        data = {}
-
-        data.update(self.planet_properties_tab.get_data())
-        data.update(self.post_properties_tab.get_data())
-        data.update(self.atmo_editor_tab.get_data())
-        data.update(self.orbit_editor_tab.get_data())
-        data.update(self.terrain_editor_tab.get_data())
-        data.update(self.landmarks_editor_tab.get_data())
+        # The editors write into self.model as they are edited, so this never reads Tk;
+        # sections not edited since the last call are reused, not rebuilt
         #Removed heightmaps
-
-        return data
+        return self.model.to_dict()
 
 
 if __name__ == "__main__":
-    app = PlanetMakerApp()
+    parser = argparse.ArgumentParser(description="SFS Planet Maker")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print import and tab construction times once the window is up,"
+                             " and redraw coalescing counts on exit")
+    parser.add_argument("--autosave-idle", type=float, default=AUTOSAVE_IDLE_SECONDS, metavar="SECONDS",
+                        help="autosave to a recovery file after this many idle seconds (0 disables)")
+    args = parser.parse_args()
+
+    profile = StartupProfile(args.startup_profile)
+    profile.timings.append(("interpreter imports (tkinter, ...)", time.perf_counter() - _PROCESS_START))
+    app = PlanetMakerApp(profile, autosave_idle=args.autosave_idle)
     app.mainloop()
@@ -0,0 +1,151 @@
+# orbit_conflicts.py
+"""
+Find sibling orbits that cross and spheres of influence (SOI) that overlap.
+
+Every body occupies a radial band around its parent: from periapsis to
+apoapsis, widened by its SOI radius on both sides. Two siblings can only meet
+if their bands overlap, so the bands of each parent's children are sorted and
+swept once (O(n log n) plus the number of conflicts) instead of comparing all
+pairs.
+
+Usage:
+    python orbit_conflicts.py planets_folder
+"""
+import argparse
+import heapq
+import sys
+
+import numpy as np
+
+from solar_system import SolarSystem
+
+# SFS: SOI = semiMajorAxis * (mass / parent mass) ** 0.4 * multiplierSOI
+SOI_EXPONENT = 0.4
+
+
+class OrbitBand:
+    """Radial extent of one body's orbit around its parent (meters)."""
+
+    __slots__ = ("name", "parent", "periapsis", "apoapsis", "soi")
+
+    def __init__(self, name, parent, periapsis, apoapsis, soi):
+        self.name = name
+        self.parent = parent
+        self.periapsis = periapsis
+        self.apoapsis = apoapsis
+        self.soi = soi
+
+    @property
+    def low(self):
+        return self.periapsis - self.soi
+
+    @property
+    def high(self):
+        return self.apoapsis + self.soi
+
+
+class Conflict:
+    """Two siblings whose orbits ("orbit") or only their SOIs ("soi") overlap."""
+
+    __slots__ = ("parent", "first", "second", "kind", "overlap")
+
+    def __init__(self, parent, first, second, kind, overlap):
+        self.parent = parent
+        self.first = first
+        self.second = second
+        self.kind = kind
+        self.overlap = overlap
+
+    def describe(self):
+        if self.kind == "orbit":
+            what = "orbits cross"
+        else:
+            what = "SOIs overlap"
+        return f"{self.parent}: {self.first} / {self.second} {what} (by {self.overlap:,.0f} m)"
+
+
+# ---------------------------------------------
+# BANDS
+# ---------------------------------------------
+def compute_bands(system):
+    """OrbitBand for every body that orbits something, computed with array math."""
+    names, parent_index, a, e, _, _, radius, parent_mu = system.arrays()
+    gravity = np.array([system.bodies[name].gravity for name in names])
+    multiplier = np.array([system.bodies[name].multiplier_soi for name in names])
+    mu = gravity * radius * radius
+
+    orbiting = np.flatnonzero((parent_index >= 0) & (a > 0))
+    periapsis = a * (1.0 - e)
+    apoapsis = a * (1.0 + e)
+    # Unknown masses give no SOI; the orbit band is still checked
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where((parent_mu > 0) & (mu > 0), mu / parent_mu, 0.0)
+    soi = a * np.power(ratio, SOI_EXPONENT) * multiplier
+
+    return [OrbitBand(names[i], names[parent_index[i]], float(periapsis[i]), float(apoapsis[i]), float(soi[i]))
+            for i in orbiting]
+
+
+# ---------------------------------------------
+# SWEEP
+# ---------------------------------------------
+def _sweep(parent, bands):
+    conflicts = []
+    active = []         # heap of (high, order, band) still reaching the current position
+    for order, band in enumerate(sorted(bands, key=lambda b: b.low)):
+        while active and active[0][0] < band.low:
+            heapq.heappop(active)
+        for _, _, other in active:
+            first, second = sorted((other.name, band.name))
+            orbit_overlap = min(other.apoapsis, band.apoapsis) - max(other.periapsis, band.periapsis)
+            if orbit_overlap >= 0:
+                conflicts.append(Conflict(parent, first, second, "orbit", orbit_overlap))
+            else:
+                conflicts.append(Conflict(parent, first, second, "soi",
+                                          min(other.high, band.high) - max(other.low, band.low)))
+        heapq.heappush(active, (band.high, order, band))
+    return conflicts
+
+
+def find_conflicts(bands):
+    """All conflicting sibling pairs, orbit crossings first, then by parent and name."""
+    siblings = {}
+    for band in bands:
+        siblings.setdefault(band.parent, []).append(band)
+    conflicts = []
+    for parent, group in siblings.items():
+        conflicts.extend(_sweep(parent, group))
+    conflicts.sort(key=lambda c: (c.kind != "orbit", c.parent, c.first, c.second))
+    return conflicts
+
+
+def check_system(system):
+    return find_conflicts(compute_bands(system))
+
+
+# ---------------------------------------------
+# CLI
+# ---------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report crossing orbits and overlapping SOIs in a planet folder.")
+    parser.add_argument("folder", help="Folder of planet files")
+    args = parser.parse_args(argv)
+
+    try:
+        system = SolarSystem.load_folder(args.folder)
+    except OSError as e:
+        print(f"Failed to read {args.folder}: {e}", file=sys.stderr)
+        return 2
+    for path, error in system.errors:
+        print(f"SKIP  {path}: {error}", file=sys.stderr)
+
+    conflicts = check_system(system)
+    for conflict in conflicts:
+        print(conflict.describe())
+    crossing = sum(1 for c in conflicts if c.kind == "orbit")
+    print(f"\n{len(system.bodies)} bodies: {crossing} orbit crossing(s), {len(conflicts) - crossing} SOI overlap(s)")
+    return 1 if conflicts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
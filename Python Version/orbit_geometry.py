@@ -0,0 +1,184 @@
+# orbit_geometry.py
+"""
+Vectorized Keplerian orbit geometry (no Tk).
+
+Positions are in meters in the orbital plane with the parent body (the
+focus) at the origin and periapsis along the direction `arg_peri` degrees
+from +x. The orbit editor maps them to pixels with to_pixels().
+"""
+import numpy as np
+
+
+def orbit_shape(semi_major_axis, eccentricity):
+    """(a, e, b, c) with a >= 1 m, e clamped to [0, 0.99], b the semi-minor axis, c the focal distance."""
+    a = max(1.0, float(semi_major_axis))
+    e = min(0.99, max(0.0, float(eccentricity)))
+    return a, e, a * np.sqrt(1.0 - e * e), a * e
+
+
+def rotation(arg_peri):
+    """2x2 matrix rotating orbit-frame vectors by `arg_peri` degrees."""
+    ang = np.radians(arg_peri)
+    cos, sin = np.cos(ang), np.sin(ang)
+    return np.array([[cos, -sin], [sin, cos]])
+
+
+def points_at_eccentric_anomaly(semi_major_axis, eccentricity, arg_peri, anomalies):
+    """
+    Positions (N x 2, meters) at the given eccentric anomalies (radians).
+    E = 0 is periapsis and E = pi is apoapsis.
+    """
+    a, e, b, c = orbit_shape(semi_major_axis, eccentricity)
+    anomalies = np.asarray(anomalies, dtype=float)
+    local = np.empty((len(anomalies), 2))
+    np.cos(anomalies, out=local[:, 0])
+    local[:, 0] *= a
+    local[:, 0] -= c
+    np.sin(anomalies, out=local[:, 1])
+    local[:, 1] *= b
+    return local @ rotation(arg_peri).T
+
+
+def apsides(semi_major_axis, eccentricity, arg_peri):
+    """(periapsis, apoapsis) positions in meters."""
+    peri, apo = points_at_eccentric_anomaly(semi_major_axis, eccentricity, arg_peri, (0.0, np.pi))
+    return peri, apo
+
+
+# ---------------------------------------------
+# VIEWPORT CLIPPING
+# ---------------------------------------------
+def _edge_crossings(coef_cos, coef_sin, offset, value):
+    """Eccentric anomalies where coef_cos*cos(E) + coef_sin*sin(E) + offset == value."""
+    amplitude = np.hypot(coef_cos, coef_sin)
+    if amplitude == 0.0:
+        return []
+    ratio = (value - offset) / amplitude
+    if abs(ratio) > 1.0:
+        return []
+    phase = np.arctan2(coef_sin, coef_cos)
+    spread = np.arccos(ratio)
+    return [phase - spread, phase + spread]
+
+
+def visible_arcs(semi_major_axis, eccentricity, arg_peri, bounds):
+    """
+    Ranges of eccentric anomaly where the orbit lies inside `bounds`.
+
+    The crossings with each edge of the rectangle are solved in closed form
+    (x(E) and y(E) are both A*cos(E) + B*sin(E) + C), so the cost does not
+    depend on how far the view is zoomed in.
+
+    Args:
+        bounds (tuple): (xmin, ymin, xmax, ymax) in meters, focus at the origin.
+
+    Returns:
+        list of (start, stop) with start < stop; stop may exceed 2*pi when an
+        arc wraps through periapsis.
+    """
+    a, e, b, c = orbit_shape(semi_major_axis, eccentricity)
+    rot = rotation(arg_peri)
+    # x(E) = rot[0,0]*a*cos(E) + rot[0,1]*b*sin(E) - rot[0,0]*c, same for y with row 1
+    axes = [(rot[row, 0] * a, rot[row, 1] * b, -rot[row, 0] * c) for row in (0, 1)]
+    xmin, ymin, xmax, ymax = bounds
+
+    cuts = [0.0, 2.0 * np.pi]
+    for (coef_cos, coef_sin, offset), limits in zip(axes, ((xmin, xmax), (ymin, ymax))):
+        for value in limits:
+            cuts.extend(np.mod(_edge_crossings(coef_cos, coef_sin, offset, value), 2.0 * np.pi))
+    cuts = np.unique(cuts)
+
+    # Between consecutive crossings the orbit is entirely inside or outside
+    mids = 0.5 * (cuts[:-1] + cuts[1:])
+    probe = points_at_eccentric_anomaly(a, e, arg_peri, mids)
+    inside = ((probe[:, 0] >= xmin) & (probe[:, 0] <= xmax) &
+              (probe[:, 1] >= ymin) & (probe[:, 1] <= ymax))
+
+    arcs = []
+    for start, stop, keep in zip(cuts[:-1], cuts[1:], inside):
+        if not keep:
+            continue
+        if arcs and arcs[-1][1] == start:
+            arcs[-1] = (arcs[-1][0], stop)
+        else:
+            arcs.append((start, stop))
+    # Join the arc ending at 2*pi with the one starting at 0
+    if len(arcs) > 1 and arcs[0][0] == 0.0 and arcs[-1][1] == 2.0 * np.pi:
+        first = arcs.pop(0)
+        arcs[-1] = (arcs[-1][0], first[1] + 2.0 * np.pi)
+    return arcs
+
+
+def sample_step(a_px, tolerance_px):
+    """Eccentric-anomaly step keeping chords of an a_px-pixel orbit within tolerance_px."""
+    return np.minimum(2.0 * np.pi / 16, np.sqrt(8.0 * tolerance_px / np.maximum(a_px, 1e-9)))
+
+
+def viewport_orbit(semi_major_axis, eccentricity, arg_peri, center, meters_per_pixel, size,
+                   tolerance_px=0.25, max_points=4096, margin_px=8):
+    """
+    Pixel polylines for the parts of the orbit visible in a `size` = (width,
+    height) canvas, sampled just densely enough to stay within `tolerance_px`.
+
+    The ellipse is an affine image of a circle of radius a, so a chord spanning
+    dE of eccentric anomaly strays at most a*dE**2/8 from the curve; solving
+    for dE gives the step. Only visible arcs are sampled and the total is
+    capped at `max_points`, so the cost stays bounded at any zoom level.
+
+    Returns:
+        list of (N x 2) pixel arrays, one per visible arc (at most four).
+    """
+    mpp = max(1.0, float(meters_per_pixel))
+    cx, cy = center
+    width, height = size
+    bounds = ((-margin_px - cx) * mpp, (-margin_px - cy) * mpp,
+              (width + margin_px - cx) * mpp, (height + margin_px - cy) * mpp)
+    arcs = visible_arcs(semi_major_axis, eccentricity, arg_peri, bounds)
+    if not arcs:
+        return []
+
+    step = sample_step(orbit_shape(semi_major_axis, eccentricity)[0] / mpp, tolerance_px)
+    counts = [int(np.ceil((stop - start) / step)) + 1 for start, stop in arcs]
+    if sum(counts) > max_points:
+        scale = max_points / sum(counts)
+        counts = [max(2, int(count * scale)) for count in counts]
+
+    anomalies = np.concatenate([np.linspace(start, stop, count) for (start, stop), count in zip(arcs, counts)])
+    pixels = to_pixels(points_at_eccentric_anomaly(semi_major_axis, eccentricity, arg_peri, anomalies),
+                       center, mpp)
+    return np.split(pixels, np.cumsum(counts)[:-1])
+
+
+def full_orbits(semi_major_axes, eccentricities, arg_peris, centers, meters_per_pixel, tolerance_px=0.25):
+    """
+    Whole closed orbits for many bodies in one vectorized pass, for orbits
+    known to be entirely on screen. All share the sample count the largest
+    one needs.
+
+    Args:
+        centers: N x 2 pixel positions of each orbit's focus (its parent).
+
+    Returns:
+        N x S x 2 pixel array.
+    """
+    mpp = max(1.0, float(meters_per_pixel))
+    a = np.maximum(1.0, np.asarray(semi_major_axes, dtype=float))[:, None]
+    e = np.clip(np.asarray(eccentricities, dtype=float), 0.0, 0.99)[:, None]
+    if not len(a):
+        return np.empty((0, 2, 2))
+    steps = int(np.ceil(2.0 * np.pi / sample_step(float(a.max()) / mpp, tolerance_px)))
+    anomalies = np.linspace(0.0, 2.0 * np.pi, steps + 1)
+    x = a * np.cos(anomalies) - a * e
+    y = a * np.sqrt(1.0 - e * e) * np.sin(anomalies)
+    ang = np.radians(np.asarray(arg_peris, dtype=float))[:, None]
+    cos_w, sin_w = np.cos(ang), np.sin(ang)
+    pixels = np.empty((len(a), steps + 1, 2))
+    pixels[..., 0] = (x * cos_w - y * sin_w) / mpp
+    pixels[..., 1] = (x * sin_w + y * cos_w) / mpp
+    pixels += np.asarray(centers, dtype=float)[:, None, :]
+    return pixels
+
+
+def to_pixels(points, center, meters_per_pixel):
+    """Map meter positions (N x 2 or 2,) to canvas pixels around `center`."""
+    return np.asarray(points) / max(1.0, float(meters_per_pixel)) + np.asarray(center, dtype=float)
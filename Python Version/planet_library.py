@@ -0,0 +1,204 @@
+# planet_library.py
+"""
+Searchable index over a folder of planet files, cached on disk.
+
+Each planet's metadata (name, radius, gravity, parent, semi-major axis,
+atmosphere height, formula line count) is extracted once and stored in
+`<folder>/.library_index.cache` together with the file's mtime and size. A
+refresh re-parses only files whose mtime or size changed, so reopening a
+folder of thousands of planets costs one stat() per file.
+
+Searches run on NumPy columns built from the records, so filtering 10k
+planets by name and several numeric ranges takes about a millisecond.
+
+Usage:
+    library = PlanetLibrary("planets")
+    library.refresh()
+    for record in library.search("ear", radius=(1e5, 1e6)):
+        print(record.name, record.path)
+"""
+import json
+import os
+
+import numpy as np
+
+from sfs_batch import PLANET_FILE_EXTENSIONS
+from sfs_exporter import atomic_open
+from sfs_loader import load_planet
+from terrain_formula import is_blank_line
+
+PLANETS_DIR = "planets"
+# Not a planet file extension, so folder scans (sfs_batch, solar_system, ...) never pick it up
+INDEX_FILENAME = ".library_index.cache"
+INDEX_VERSION = 1
+
+# Numeric metadata that search() can filter on
+NUMERIC_FIELDS = ("radius", "gravity", "semi_major_axis", "atmosphere_height", "formula_lines")
+
+
+class PlanetRecord:
+    """Metadata of one planet file. Missing numbers are None."""
+
+    __slots__ = ("name", "path", "mtime_ns", "size", "radius", "gravity", "parent",
+                 "semi_major_axis", "atmosphere_height", "formula_lines", "error")
+
+    def __init__(self, name, path, mtime_ns, size, radius=None, gravity=None, parent=None,
+                 semi_major_axis=None, atmosphere_height=None, formula_lines=None, error=None):
+        self.name = name
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.radius = radius
+        self.gravity = gravity
+        self.parent = parent
+        self.semi_major_axis = semi_major_axis
+        self.atmosphere_height = atmosphere_height
+        self.formula_lines = formula_lines
+        self.error = error
+
+    @classmethod
+    def from_planet_data(cls, name, path, mtime_ns, size, planet_data):
+        base = planet_data.get("BASE_DATA") or {}
+        orbit = planet_data.get("ORBIT_DATA") or {}
+        atmosphere = planet_data.get("ATMOSPHERE_PHYSICS_DATA") or {}
+        terrain = planet_data.get("TERRAIN_DATA") or {}
+        formula = (terrain.get("terrainFormulaDifficulties") or {}).get("Normal") or []
+        return cls(
+            name, path, mtime_ns, size,
+            radius=_number(base.get("radius")),
+            gravity=_number(base.get("gravity")),
+            parent=orbit.get("parent") or None,
+            semi_major_axis=_number(orbit.get("semiMajorAxis")),
+            atmosphere_height=_number(atmosphere.get("height")),
+            formula_lines=sum(1 for line in formula if isinstance(line, str) and not is_blank_line(line)),
+        )
+
+    def to_json(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != "path"}
+
+    @classmethod
+    def from_json(cls, path, data):
+        record = cls(data["name"], path, data["mtime_ns"], data["size"])
+        for slot in cls.__slots__[4:]:
+            setattr(record, slot, data.get(slot))
+        return record
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PlanetLibrary:
+    def __init__(self, folder=PLANETS_DIR, index_path=None):
+        self.folder = folder
+        self.index_path = index_path or os.path.join(folder, INDEX_FILENAME)
+        self.records = []           # sorted by name
+        self._columns = {}          # field -> float array (NaN when missing)
+        self._names = []            # lowercase names, same order as records
+
+    # ---------------------------------------------
+    # INDEX
+    # ---------------------------------------------
+    def _read_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return {}
+        return index.get("entries") or {}
+
+    def _write_index(self):
+        entries = {os.path.basename(r.path): r.to_json() for r in self.records}
+        try:
+            with atomic_open(self.index_path) as f:
+                json.dump({"version": INDEX_VERSION, "entries": entries}, f)
+        except OSError as e:
+            # A read-only folder still gets a working (uncached) library
+            print(f"Could not write library index {self.index_path}: {e}")
+
+    def refresh(self, progress=None):
+        """
+        Bring the index up to date with the folder.
+
+        Args:
+            progress (callable): Called as progress(done, total) while files are parsed.
+
+        Returns:
+            int: Number of files that had to be (re)parsed.
+        """
+        cached = self._read_index()
+        os.makedirs(self.folder, exist_ok=True)
+        entries = [e for e in os.scandir(self.folder)
+                   if e.is_file() and e.name.lower().endswith(PLANET_FILE_EXTENSIONS)
+                   and not e.name.startswith(".")]      # hidden files, like the other folder scans
+
+        records, stale = [], []
+        for entry in entries:
+            stat = entry.stat()
+            data = cached.get(entry.name)
+            if data and data.get("mtime_ns") == stat.st_mtime_ns and data.get("size") == stat.st_size:
+                records.append(PlanetRecord.from_json(entry.path, data))
+            else:
+                stale.append((entry, stat))
+
+        for done, (entry, stat) in enumerate(stale, 1):
+            records.append(self._parse(entry, stat))
+            if progress:
+                progress(done, len(stale))
+
+        records.sort(key=lambda r: r.name.lower())
+        self.records = records
+        self._build_columns()
+        if stale or len(cached) != len(records):
+            self._write_index()
+        return len(stale)
+
+    def _parse(self, entry, stat):
+        name = os.path.splitext(entry.name)[0]
+        try:
+            # Lazy load: the HEIGHTMAP section is never decoded for the index
+            planet = load_planet(entry.path)
+            if not isinstance(planet, dict):
+                raise ValueError("not a planet object")
+            return PlanetRecord.from_planet_data(name, entry.path, stat.st_mtime_ns, stat.st_size, planet)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            return PlanetRecord(name, entry.path, stat.st_mtime_ns, stat.st_size, error=f"{type(e).__name__}: {e}")
+
+    def _build_columns(self):
+        self._names = [r.name.lower() for r in self.records]
+        self._columns = {
+            field: np.array([np.nan if getattr(r, field) is None else getattr(r, field) for r in self.records],
+                            dtype=float)
+            for field in NUMERIC_FIELDS
+        }
+
+    # ---------------------------------------------
+    # SEARCH
+    # ---------------------------------------------
+    def search(self, name="", **ranges):
+        """
+        Records whose name contains `name` (case-insensitive) and whose numeric
+        fields fall inside the given (low, high) ranges; either bound may be
+        None. Records missing a filtered field never match.
+
+        Example:
+            library.search("moon", gravity=(None, 2.0), formula_lines=(1, None))
+        """
+        mask = np.ones(len(self.records), dtype=bool)
+        for field, (low, high) in ranges.items():
+            if field not in self._columns:
+                raise ValueError(f"Unknown field: {field!r}")
+            column = self._columns[field]
+            if low is not None:
+                mask &= column >= low           # NaN compares False
+            if high is not None:
+                mask &= column <= high
+        needle = name.strip().lower()
+        if needle:
+            mask &= np.fromiter((needle in n for n in self._names), dtype=bool, count=len(self._names))
+        return [self.records[i] for i in np.flatnonzero(mask)]
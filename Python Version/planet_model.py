@@ -0,0 +1,503 @@
+# planet_model.py
+"""
+Tk-free planet data model.
+
+Every SFS section (BASE_DATA, ATMOSPHERE_PHYSICS_DATA, TERRAIN_DATA, ...) is a
+small __slots__ class whose attributes are the section's JSON keys. Editors
+bind their widgets to these objects, so reading the planet back (export,
+batch tools, project switching) is a plain serialization that never touches
+Tcl.
+
+Assigning an attribute notifies the section's listeners, which is how
+widgets follow changes made elsewhere:
+
+    model = PlanetModel.from_dict(planet_data)
+    model.orbit.subscribe(lambda section, name, value: print(name, value))
+    model.orbit.eccentricity = 0.2          # prints "eccentricity 0.2"
+    model.to_dict()["ORBIT_DATA"]["eccentricity"]
+
+Every section also counts its changes: `version` grows whenever one of its
+fields, nested sections or list items changes, which lets exports and
+autosaves re-encode only the sections that changed (see
+sfs_exporter.FragmentCache and PlanetModel.section_versions).
+
+Usage:
+    model = PlanetModel.from_dict(load_planet("planets/Earth.txt"))
+    model.base.radius = 315000.0
+    SFSExporter().export_planet("Earth.txt", model.to_dict())
+"""
+import copy
+
+
+class ListOf:
+    """FIELDS default for a JSON list of `item` sections (flat zones, fog keys, ...)."""
+
+    __slots__ = ("item",)
+
+    def __init__(self, item):
+        self.item = item
+
+
+class SectionList(list):
+    """
+    List of sections (a ListOf field) that counts its changes like a section.
+    Every mutation bumps `version` and the owning section's version.
+    """
+
+    __slots__ = ("_parent", "_version")
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self._parent = None
+        self._version = 0
+        for item in self:
+            _adopt(item, self)
+
+    @property
+    def version(self):
+        return self._version
+
+    def _touch(self):
+        self._version += 1
+        if self._parent is not None:
+            self._parent._touch()
+
+    def _mutated(self):
+        for item in self:
+            _adopt(item, self)
+        self._touch()
+
+
+def _mutator(name):
+    method = getattr(list, name)
+
+    def mutate(self, *args):
+        result = method(self, *args)
+        self._mutated()
+        return result
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(SectionList, _name, _mutator(_name))
+del _name
+
+
+def _adopt(value, parent):
+    """Make `value` report its changes to `parent` (sections and section lists only)."""
+    if isinstance(value, (Section, SectionList)):
+        object.__setattr__(value, "_parent", parent)
+
+
+def _fresh(default):
+    """A new value for a field from its FIELDS default."""
+    if isinstance(default, ListOf):
+        return SectionList()
+    if isinstance(default, SectionList):
+        return SectionList(item.copy() for item in default)
+    if isinstance(default, Section):
+        return default.copy()
+    if isinstance(default, (dict, list)):
+        return copy.deepcopy(default)
+    return default
+
+
+def _from_json(default, value):
+    """Convert a decoded JSON value to the field's type; falls back to the default."""
+    if isinstance(default, ListOf):
+        if not isinstance(value, list):
+            return SectionList()
+        return SectionList(default.item.from_json(v) for v in value if isinstance(v, dict))
+    if isinstance(default, Section):
+        return type(default).from_json(value, template=default)
+    if isinstance(default, (dict, list)):
+        return copy.deepcopy(value) if isinstance(value, type(default)) else copy.deepcopy(default)
+    if isinstance(default, bool):
+        return value if isinstance(value, bool) else default
+    if isinstance(default, (int, float)):
+        try:
+            return type(default)(value)
+        except (TypeError, ValueError):
+            return default
+    if isinstance(default, str):
+        return value if isinstance(value, str) else default
+    return value
+
+
+def _to_json(value):
+    if isinstance(value, Section):
+        return value.to_json()
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, dict):
+        return copy.deepcopy(value)
+    return value
+
+
+# ---------------------------------------------
+# SECTIONS
+# ---------------------------------------------
+class Section:
+    """
+    Base of all model sections.
+
+    Subclasses list their (json key, default) pairs in FIELDS, in export
+    order, and declare the same names in __slots__. A default that is a
+    Section instance nests that section (copied per object); ListOf(cls)
+    holds a list of `cls` sections.
+    """
+
+    __slots__ = ("_listeners", "_parent", "_version")
+    FIELDS = ()
+
+    def __init__(self, **values):
+        object.__setattr__(self, "_listeners", [])
+        object.__setattr__(self, "_parent", None)
+        object.__setattr__(self, "_version", 0)
+        for name, default in self.FIELDS:
+            value = values[name] if name in values else _fresh(default)
+            _adopt(value, self)
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        old = getattr(self, name)
+        object.__setattr__(self, name, value)
+        if old != value:
+            _adopt(value, self)
+            self._touch()
+            for listener in list(self._listeners):
+                listener(self, name, value)
+
+    @property
+    def version(self):
+        """Number of changes made to this section and everything inside it."""
+        return self._version
+
+    def _touch(self):
+        object.__setattr__(self, "_version", self._version + 1)
+        if self._parent is not None:
+            self._parent._touch()
+
+    def subscribe(self, listener):
+        """Call listener(section, name, value) whenever an attribute changes."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @classmethod
+    def from_json(cls, data, template=None):
+        """Build from a decoded JSON section; missing or mistyped keys get defaults."""
+        data = data if isinstance(data, dict) else {}
+        section = cls()
+        for name, default in cls.FIELDS:
+            if template is not None and not isinstance(default, ListOf):
+                default = getattr(template, name)
+            if name in data:
+                value = _from_json(default, data[name])
+            elif template is not None:
+                value = _fresh(default)
+            else:
+                continue
+            _adopt(value, section)
+            object.__setattr__(section, name, value)
+        return section
+
+    def to_json(self):
+        return {name: _to_json(getattr(self, name)) for name, _ in self.FIELDS}
+
+    def copy(self):
+        """Deep copy without listeners."""
+        return type(self)(**{name: _fresh(getattr(self, name)) for name, _ in self.FIELDS})
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_json() == other.to_json()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_json()!r})"
+
+
+class Vector2(Section):
+    FIELDS = (("x", 0.0), ("y", 0.0))
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class Color(Section):
+    FIELDS = (("r", 1.0), ("g", 1.0), ("b", 1.0), ("a", 1.0))
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class BaseData(Section):
+    FIELDS = (
+        ("radius", 0.0),
+        ("radiusDifficultyScale", {}),
+        ("gravity", 0.0),
+        ("gravityDifficultyScale", {}),
+        ("timewarpHeight", 0.0),
+        ("velocityArrowsHeight", 0.0),
+        ("mapColor", Color()),
+        ("significant", True),
+        ("rotateCamera", True),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class PostKey(Section):
+    FIELDS = (
+        ("height", 0.0),
+        ("shadowIntensity", 1.0),
+        ("starIntensity", 0.0),
+        ("hueShift", 0.0),
+        ("saturation", 1.0),
+        ("contrast", 1.0),
+        ("red", 1.0),
+        ("green", 1.0),
+        ("blue", 1.0),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class PostProcessing(Section):
+    FIELDS = (("keys", ListOf(PostKey)),)
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class AtmospherePhysics(Section):
+    FIELDS = (
+        ("height", 30000.0),
+        ("density", 0.005),
+        ("curve", 10.0),
+        ("curveScale", {}),
+        ("parachuteMultiplier", 1.0),
+        ("upperAtmosphere", 0.333),
+        ("heightDifficultyScale", {}),
+        ("shockwaveIntensity", 1.0),
+        ("minHeatingVelocityMultiplier", 1.0),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class Gradient(Section):
+    FIELDS = (("positionZ", 4000.0), ("height", 45000.0), ("texture", "Atmo_Earth"))
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class Clouds(Section):
+    FIELDS = (
+        ("texture", "Earth_Clouds"),
+        ("startHeight", 1200.0),
+        ("width", 40845.87),
+        ("height", 36000.0),
+        ("alpha", 0.1),
+        ("velocity", 2.0),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class FogKey(Section):
+    FIELDS = (
+        ("color", Color(r=0.647058845, g=0.848739564, b=1.0, a=0.416)),
+        ("distance", 30000.0),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class Fog(Section):
+    FIELDS = (("keys", ListOf(FogKey)),)
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class AtmosphereVisuals(Section):
+    FIELDS = (("GRADIENT", Gradient()), ("CLOUDS", Clouds()), ("FOG", Fog()))
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class TerrainTexture(Section):
+    FIELDS = (
+        ("planetTexture", "Earth"),
+        ("planetTextureCutout", 1.0),
+        ("surfaceTexture_A", "Blured"),
+        ("surfaceTextureSize_A", Vector2(x=20.0, y=8.0)),
+        ("surfaceTexture_B", "None"),
+        ("surfaceTextureSize_B", Vector2(x=-1.0, y=-1.0)),
+        ("terrainTexture_C", "Blured"),
+        ("terrainTextureSize_C", Vector2(x=100.0, y=30.0)),
+        ("surfaceLayerSize", 40.0),
+        ("minFade", 0.0),
+        ("maxFade", 1.0),
+        ("shadowIntensity", 6.0),
+        ("shadowHeight", 15.0),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class FlatZone(Section):
+    FIELDS = (("height", 0.0), ("angle", 0.0), ("width", 0.0), ("transition", 0.0))
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class TerrainData(Section):
+    FIELDS = (
+        ("TERRAIN_TEXTURE_DATA", TerrainTexture()),
+        ("terrainFormulaDifficulties", {}),
+        ("textureFormula", []),
+        ("verticeSize", 4.0),
+        ("collider", True),
+        ("flatZones", ListOf(FlatZone)),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class OrbitData(Section):
+    FIELDS = (
+        ("parent", "Sun"),
+        ("semiMajorAxis", 7480000000.0),
+        ("smaDifficultyScale", {}),
+        ("eccentricity", 0.0),
+        ("argumentOfPeriapsis", 0.0),
+        ("direction", 1),
+        ("multiplierSOI", 2.5),
+        ("soiDifficultyScale", {}),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+    def to_json(self):
+        data = super().to_json()
+        # An orbit always needs a parent body; a cleared parent field exports as the Sun
+        data["parent"] = data["parent"] or "Sun"
+        return data
+
+
+class Landmark(Section):
+    FIELDS = (("name", ""), ("angle", 0.0), ("startAngle", 0.0), ("endAngle", 0.0))
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+# ---------------------------------------------
+# PLANET
+# ---------------------------------------------
+# (planet data key, PlanetModel attribute, section class) in export order;
+# LANDMARKS is a bare JSON list of Landmark sections
+SECTIONS = (
+    ("BASE_DATA", "base", BaseData),
+    ("POST_PROCESSING", "post_processing", PostProcessing),
+    ("ATMOSPHERE_PHYSICS_DATA", "atmosphere_physics", AtmospherePhysics),
+    ("ATMOSPHERE_VISUALS_DATA", "atmosphere_visuals", AtmosphereVisuals),
+    ("ORBIT_DATA", "orbit", OrbitData),
+    ("TERRAIN_DATA", "terrain", TerrainData),
+    ("LANDMARKS", "landmarks", ListOf(Landmark)),
+)
+
+
+class PlanetModel:
+    """
+    Every editable section of one planet.
+
+    `source` is the dict the model was read from. Sections the model does not
+    cover (HEIGHTMAP, ACHIEVEMENT_DATA, unknown keys) stay there untouched and
+    are never decoded by the model.
+
+    subscribe(listener) calls listener() after any change to any section
+    (e.g. to schedule an autosave); code that changes `source` directly calls
+    touch() to report it.
+    """
+
+    __slots__ = tuple(attribute for _, attribute, _ in SECTIONS) + ("source", "_clean", "_collected", "_listeners")
+
+    def __init__(self, source=None):
+        self._listeners = []
+        self.source = source if source is not None else {}
+        for _, attribute, cls in SECTIONS:
+            setattr(self, attribute, _fresh(cls) if isinstance(cls, ListOf) else cls())
+        self._collected = {}        # key -> (section, version, JSON data) from to_dict()
+        self.mark_clean()
+
+    @classmethod
+    def from_dict(cls, planet_data):
+        planet_data = planet_data if isinstance(planet_data, dict) else {}
+        model = cls(planet_data)
+        for key, attribute, section_cls in SECTIONS:
+            if key in planet_data:
+                value = planet_data[key]
+                if isinstance(section_cls, ListOf):
+                    setattr(model, attribute, _from_json(section_cls, value))
+                else:
+                    setattr(model, attribute, section_cls.from_json(value))
+        model.mark_clean()
+        return model
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if isinstance(value, (Section, SectionList)):
+            # A section reports its changes here; replacing one is a change too
+            _adopt(value, self)
+            self._touch()
+
+    def subscribe(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def touch(self):
+        """Report a change made outside the sections (e.g. a new HEIGHTMAP in `source`)."""
+        self._touch()
+
+    def _touch(self):
+        for listener in list(self._listeners):
+            listener()
+
+    def section_versions(self):
+        """
+        {planet data key: (section, version)} for every section. The pair only
+        stays equal while that very section object is unchanged, so it can key
+        caches across planet switches.
+        """
+        return {key: (getattr(self, attribute), getattr(self, attribute).version)
+                for key, attribute, _ in SECTIONS}
+
+    def dirty_sections(self):
+        """Keys of the sections changed (or replaced) since loading or the last mark_clean()."""
+        return [key for key, (section, version) in self.section_versions().items()
+                if self._clean[key][0] is not section or self._clean[key][1] != version]
+
+    @property
+    def dirty(self):
+        """True when something changed since loading or the last mark_clean()."""
+        return bool(self.dirty_sections())
+
+    def mark_clean(self):
+        """Call after the model was saved."""
+        self._clean = self.section_versions()   # what dirty_sections() compares against
+
+    @classmethod
+    def coerce(cls, planet_data):
+        """`planet_data` itself if it is already a PlanetModel, else a model read from it."""
+        return planet_data if isinstance(planet_data, cls) else cls.from_dict(planet_data or {})
+
+    def to_dict(self):
+        """
+        The edited sections as plain JSON data, ready for SFSExporter.
+        POST_PROCESSING is left out when it has no keys.
+
+        Only sections changed since the previous call are converted again; the
+        others are the very same objects as last time, so treat the result as
+        read-only.
+        """
+        data = {}
+        for key, (section, version) in self.section_versions().items():
+            cached = self._collected.get(key)
+            if cached is None or cached[0] is not section or cached[1] != version:
+                cached = self._collected[key] = (section, version, _to_json(section))
+            data[key] = cached[2]
+        if not data["POST_PROCESSING"]["keys"]:
+            del data["POST_PROCESSING"]
+        return data
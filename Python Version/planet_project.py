@@ -0,0 +1,155 @@
+# planet_project.py
+"""
+In-memory multi-planet model plus a parallel folder import.
+
+A PlanetProject holds several planets at once (e.g. a whole solar system),
+keyed by name, with one of them active. Switching planets is a dict lookup,
+so editors can flip between them instantly.
+
+import_folder() reads and parses every planet file of a folder on a process
+pool, reporting progress per file. It never touches Tk; the GUI runs it on a
+worker thread and polls the progress queue.
+
+Usage:
+    project = import_folder("my_system", on_progress=print)
+    project.switch("Earth")
+    project.active_data["BASE_DATA"]["radius"]
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sfs_batch import jobs_from_folder
+from sfs_loader import load_planet
+
+# Below this many files a process pool costs more than it saves
+POOL_MIN_FILES = 8
+
+
+class ImportCancelled(Exception):
+    """Raised by import_folder when its cancel event is set."""
+
+
+class PlanetProject:
+    def __init__(self, folder=None):
+        self.folder = folder
+        self.planets = {}           # name -> planet data (dict / LazyPlanet)
+        self.paths = {}             # name -> file the planet was read from
+        self.errors = {}            # name -> error message for files that failed
+        self.active = None          # name of the planet being edited
+
+    def add(self, name, planet_data, path=None, replace=False):
+        """
+        Add a planet under `name`. Unless `replace` is set, a second file with
+        the same name (Earth.txt next to Earth.json) is not loaded; the clash is
+        recorded in .errors. Returns False when the planet was not added.
+        """
+        other = self.paths.get(name)
+        if not replace and path and other and other != path:
+            self._collision(name, path, other)
+            return False
+        self.planets[name] = planet_data
+        if path:
+            self.paths[name] = path
+        if self.active is None:
+            self.active = name
+        return True
+
+    def _collision(self, name, path, kept):
+        self.add_error(name, f"{os.path.basename(path)} not loaded: {os.path.basename(kept)} has the same name")
+
+    def add_error(self, name, message):
+        # A name can collect more than one error (a name clash and a failed load)
+        self.errors[name] = f"{self.errors[name]}; {message}" if name in self.errors else message
+
+    def remove(self, name):
+        self.planets.pop(name, None)
+        self.paths.pop(name, None)
+        if self.active == name:
+            self.active = next(iter(self.planets), None)
+
+    def names(self):
+        return sorted(self.planets, key=str.lower)
+
+    def switch(self, name):
+        """Make `name` the active planet and return its data."""
+        if name not in self.planets:
+            raise KeyError(f"No planet named {name!r} in the project")
+        self.active = name
+        return self.planets[name]
+
+    @property
+    def active_data(self):
+        return self.planets.get(self.active) if self.active is not None else None
+
+
+def _load_one(name, path):
+    """Worker: parse one file. Never raises; errors are returned as text."""
+    start = time.perf_counter()
+    try:
+        planet = load_planet(path)
+        if not isinstance(planet, dict):
+            raise ValueError("not a planet object")
+        return name, path, planet, None, time.perf_counter() - start
+    except Exception as e:
+        return name, path, None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+def import_folder(folder, workers=None, on_progress=None, cancel=None):
+    """
+    Load every planet file (*.txt / *.json) of `folder` in parallel.
+
+    Args:
+        folder (str): Folder of planet files.
+        workers (int): Process count, defaults to all cores; 1 loads in-process.
+        on_progress (callable): Called as on_progress(done, total, name, error)
+            after each file; `error` is None on success. Runs on the calling thread.
+        cancel: Anything with is_set() (e.g. threading.Event); checked between files.
+
+    Returns:
+        PlanetProject: Every planet that loaded, plus .errors for those that did not.
+        HEIGHTMAP sections stay undecoded until accessed (see sfs_loader.LazyPlanet).
+    """
+    project = PlanetProject(folder)
+    # Files sharing a name are dropped before loading, so the pool's finishing
+    # order never decides which one is kept: the first in sorted order wins
+    jobs, kept = [], {}
+    for name, path in jobs_from_folder(folder):
+        if name in kept:
+            project._collision(name, path, kept[name])
+        else:
+            kept[name] = path
+            jobs.append((name, path))
+    workers = workers or os.cpu_count() or 1
+
+    def collect(done, result):
+        name, path, planet, error, _ = result
+        if error is None:
+            project.add(name, planet, path)
+        else:
+            project.add_error(name, error)
+        if on_progress:
+            on_progress(done, len(jobs), name, error)
+
+    if workers == 1 or len(jobs) < POOL_MIN_FILES:
+        for done, (name, path) in enumerate(jobs, 1):
+            if cancel is not None and cancel.is_set():
+                raise ImportCancelled()
+            collect(done, _load_one(name, path))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = [pool.submit(_load_one, name, path) for name, path in jobs]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    if cancel is not None and cancel.is_set():
+                        raise ImportCancelled()
+                    collect(done, future.result())
+            except ImportCancelled:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    # Start on the first planet alphabetically, not whichever finished first
+    names = project.names()
+    project.active = names[0] if names else None
+    return project
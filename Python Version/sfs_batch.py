@@ -0,0 +1,218 @@
+# sfs_batch.py
+"""
+Headless batch export of many planets through SFSExporter.
+
+Never imports tkinter/customtkinter, so it can run on build machines.
+
+Usage:
+    python sfs_batch.py manifest.json -o out_dir
+    python sfs_batch.py planets_folder -o out_dir -j 8
+
+A manifest is a JSON file holding either a {"PlanetName": {planet dict}, ...}
+mapping or a list of {"name": "PlanetName", "data": {planet dict}} entries.
+A folder is exported file by file (*.txt and *.json planet files).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sfs_exporter import SFSExporter
+from sfs_loader import load_planet
+
+PLANET_FILE_EXTENSIONS = (".txt", ".json")
+
+
+class BatchResult:
+    """Outcome of exporting a single planet."""
+
+    __slots__ = ("name", "output_path", "seconds", "error")
+
+    def __init__(self, name, output_path, seconds, error=None):
+        self.name = name
+        self.output_path = output_path
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+# ---------------------------------------------
+# JOB COLLECTION
+# ---------------------------------------------
+def check_planet_name(name):
+    """
+    Raise ValueError unless `name` is usable as a plain file name, so
+    "<output_dir>/<name>.txt" can never point outside the output folder.
+    """
+    separators = {"/", "\\", os.sep, os.altsep} - {None}
+    if (not name or name in (".", "..") or "\0" in name
+            or any(sep in name for sep in separators)):
+        raise ValueError(f"Invalid planet name {name!r}: it must be a plain file name.")
+    return name
+
+
+def jobs_from_manifest(manifest):
+    """
+    Turn a manifest (dict or list, already decoded) into (name, planet_data) jobs.
+    Names that are not plain file names (e.g. "../x" or "a/b") are rejected.
+    """
+    if isinstance(manifest, dict):
+        return [(check_planet_name(str(name)), data) for name, data in manifest.items()]
+
+    if isinstance(manifest, list):
+        jobs = []
+        for i, entry in enumerate(manifest):
+            if not isinstance(entry, dict) or "data" not in entry:
+                raise ValueError(f"Manifest entry {i} must be an object with 'name' and 'data'.")
+            jobs.append((check_planet_name(str(entry.get("name") or f"planet_{i}")), entry["data"]))
+        return jobs
+
+    raise ValueError("Manifest must be a JSON object or list.")
+
+
+def jobs_from_folder(folder):
+    """
+    Collect (name, source_path) jobs for every planet file in a folder.
+    The files are read inside the worker processes, not here. Hidden files
+    (temp files, the planet library index, ...) are skipped.
+    """
+    jobs = []
+    for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+        if entry.name.startswith("."):
+            continue
+        if entry.is_file() and entry.name.lower().endswith(PLANET_FILE_EXTENSIONS):
+            jobs.append((os.path.splitext(entry.name)[0], entry.path))
+    return jobs
+
+
+def collect_jobs(source):
+    """Return export jobs for a manifest file or a folder of planet files."""
+    if os.path.isdir(source):
+        return jobs_from_folder(source)
+
+    with open(source, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return jobs_from_manifest(manifest)
+
+
+# ---------------------------------------------
+# WORKER
+# ---------------------------------------------
+def _export_one(name, planet, output_dir):
+    """
+    Export one planet. `planet` is either a planet dict or a path to a planet file.
+    Runs inside a worker process; never raises, errors are returned.
+    """
+    output_path = os.path.join(output_dir, f"{name}.txt")
+    start = time.perf_counter()
+    try:
+        if isinstance(planet, str):
+            planet = load_planet(planet, lazy=False)
+        # Quiet: prints from several worker processes would interleave with the report
+        SFSExporter().export_planet(output_path, planet, quiet=True)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return BatchResult(name, output_path, time.perf_counter() - start, error)
+
+
+# ---------------------------------------------
+# BATCH EXPORT
+# ---------------------------------------------
+def export_batch(jobs, output_dir, workers=None, on_result=None):
+    """
+    Export planets in parallel across a process pool.
+
+    Args:
+        jobs (list): (name, planet_dict_or_path) tuples.
+        output_dir (str): Folder that receives "<name>.txt" files.
+        workers (int): Process count, defaults to all cores.
+        on_result (callable): Called with each BatchResult as it completes.
+
+    Returns:
+        list[BatchResult] in the same order as `jobs`.
+
+    Raises:
+        ValueError: A name is duplicated or is not a plain file name.
+    """
+    for name, _ in jobs:
+        check_planet_name(name)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    duplicates = [n for n, count in Counter(name for name, _ in jobs).items() if count > 1]
+    if duplicates:
+        raise ValueError(f"Duplicate planet names in batch: {', '.join(sorted(duplicates))}")
+
+    results = [None] * len(jobs)
+    if workers == 1:
+        for i, (name, planet) in enumerate(jobs):
+            results[i] = _export_one(name, planet, output_dir)
+            if on_result:
+                on_result(results[i])
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_export_one, name, planet, output_dir): i
+            for i, (name, planet) in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker crashed or the job could not be pickled
+                result = BatchResult(jobs[i][0], None, 0.0, f"{type(e).__name__}: {e}")
+            results[i] = result
+            if on_result:
+                on_result(result)
+
+    return results
+
+
+def format_result(result):
+    if result.ok:
+        return f"OK    {result.seconds * 1000:8.1f} ms  {result.name} -> {result.output_path}"
+    return f"FAIL  {result.seconds * 1000:8.1f} ms  {result.name}: {result.error}"
+
+
+# ---------------------------------------------
+# CLI
+# ---------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export many SFS planets in parallel.")
+    parser.add_argument("source", help="Manifest JSON file or folder of planet files")
+    parser.add_argument("-o", "--output", required=True, help="Output folder")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = collect_jobs(args.source)
+    except (OSError, ValueError) as e:
+        print(f"Failed to read {args.source}: {e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        results = export_batch(jobs, args.output, workers=args.jobs,
+                               on_result=lambda r: print(format_result(r), flush=True))
+    except ValueError as e:
+        print(f"Cannot export {args.source}: {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if not r.ok]
+    print(f"\nExported {len(results) - len(failed)}/{len(results)} planets in {elapsed:.2f} s"
+          f" ({len(failed)} failed)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,165 @@
 # sfs_exporter.py
+import contextlib
 import json
 import os
+import stat
+import tempfile
+import time
+
+
+def _read_umask():
+    """
+    The process umask, read without changing it: os.umask() can only read it by
+    setting it, which races with other threads creating files at the same time.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    # No /proc: create a file asking for 0666 and see which bits the umask removed
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            probe = os.path.join(folder, "umask")
+            os.close(os.open(probe, os.O_CREAT | os.O_WRONLY, 0o666))
+            return 0o666 & ~stat.S_IMODE(os.stat(probe).st_mode)
+    except OSError:
+        return 0o022
+
+
+_UMASK = _read_umask()
+
+
+@contextlib.contextmanager
+def atomic_open(filepath: str, mode: str = "w"):
+    """
+    Open a temp file next to `filepath` that replaces it only on success.
+
+    The temp file is fsynced and renamed over `filepath` when the block exits
+    normally; on any error it is removed, so a crash never leaves a truncated
+    file behind. The result keeps the permissions of the file it replaces, or
+    gets the usual umask-based ones for a new file (mkstemp creates 0600).
+    """
+    folder = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(folder, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix="." + os.path.basename(filepath) + ".", suffix=".tmp")
+    try:
+        if "b" in mode:
+            f = os.fdopen(fd, mode)
+        else:
+            f = os.fdopen(fd, mode, encoding="utf-8", newline="")
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = stat.S_IMODE(os.stat(filepath).st_mode)
+        except OSError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_chunks(filepath: str, chunks) -> int:
+    """
+    Write an iterable of text chunks to `filepath` atomically.
+
+    Returns:
+        int: Number of bytes written (UTF-8).
+    """
+    size = 0
+    with atomic_open(filepath, "wb") as f:
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            f.write(data)
+            size += len(data)
+    return size
+
+
+def format_rate(num_bytes: int, seconds: float) -> str:
+    """Human readable size and throughput, e.g. '12.3 MB in 0.41 s (30.0 MB/s)'."""
+    rate = num_bytes / seconds if seconds > 0 else float("inf")
+    return f"{num_bytes / 1e6:.1f} MB in {seconds:.2f} s ({rate / 1e6:.1f} MB/s)"
+
+
+def _encode_array(obj):
+    # NumPy arrays (e.g. HEIGHTMAP points kept as arrays in memory) become plain lists
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class RawJSON:
+    """Already encoded JSON text that FragmentCache.chunks() writes out as is."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FragmentCache:
+    """
+    Encoded JSON of the top-level sections of the last export, reused while
+    a section is unchanged.
+
+    A section is only re-encoded when its version token differs from the one
+    it was cached with; tokens are (section object, version) pairs as given
+    by PlanetModel.section_versions(). Sections without a token (HEIGHTMAP,
+    ACHIEVEMENT_DATA, ...) are streamed straight through every time, except
+    RawJSON values, which are written verbatim. Without RawJSON values the
+    spliced output is byte-for-byte what json.dumps(indent=2) gives.
+
+    Usage:
+        fragments = FragmentCache()
+        exporter.export_planet(path, model.to_dict(), fragments=fragments,
+                               versions=model.section_versions())
+    """
+
+    def __init__(self):
+        self._fragments = {}        # key -> (section, version, encoded text)
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._fragments.clear()
+
+    def chunks(self, data, versions, encoder):
+        """Yield the encoding of the dict `data` (indent=2), reusing cached sections."""
+        if not data:
+            yield "{}"
+            return
+        separator = "{\n  "
+        for key, value in data.items():
+            yield separator + json.dumps(key) + ": "
+            separator = ",\n  "
+            if isinstance(value, RawJSON):
+                yield value.text
+                continue
+            token = versions.get(key)
+            if token is None:
+                # One level deeper than a top-level encode, so indent every line once more
+                for chunk in encoder.iterencode(value):
+                    yield chunk.replace("\n", "\n  ")
+                continue
+            cached = self._fragments.get(key)
+            if cached is not None and cached[0] is token[0] and cached[1] == token[1]:
+                self.hits += 1
+            else:
+                self.misses += 1
+                cached = self._fragments[key] = (token[0], token[1], encoder.encode(value).replace("\n", "\n  "))
+            yield cached[2]
+        yield "\n}"
+
 
 class SFSExporter:
     """
@@ -10,13 +169,27 @@ class SFSExporter:
     def __init__(self):
         pass
 
-    def export_planet(self, filepath: str, planet_data: dict):
+    def export_planet(self, filepath: str, planet_data: dict, stream: bool = True,
+                      fragments: FragmentCache = None, versions: dict = None, quiet: bool = False):
         """
         Export a planet to a .txt file in SFS format.
 
+        The file is always replaced atomically. In streaming mode (default) the
+        JSON is encoded chunk by chunk straight into the temp file instead of
+        being built as one big string first, which keeps peak memory low for
+        planets with large embedded HEIGHTMAP arrays.
+
         Args:
             filepath (str): Path to save the .txt file.
             planet_data (dict): Planet data dictionary structured like SFS.
+            stream (bool): Encode incrementally instead of in memory.
+            fragments (FragmentCache): Reuse the encoding of sections whose
+                token in `versions` is unchanged since the previous export.
+            versions (dict): Section key -> version token, see FragmentCache.
+            quiet (bool): Do not print the summary line (e.g. for autosaves).
+
+        Returns:
+            int: Number of bytes written.
         """
 
         if not isinstance(filepath, str) or not filepath:
@@ -47,30 +220,39 @@ class SFSExporter:
         # Merge provided data with default structure to avoid missing keys
         full_data = {**default_structure, **planet_data}
 
+        # Defaults filled in above have no version, they are just encoded again
+        versions = {key: token for key, token in (versions or {}).items() if key in planet_data}
+
+        # The fixes below copy a section before changing it: the section dicts
+        # may be shared with the caller (PlanetModel.to_dict() reuses them)
+
         # Handle empty terrainFormulaDifficulties
         if "terrainFormulaDifficulties" in full_data.get("TERRAIN_DATA", {}):
             if not full_data["TERRAIN_DATA"]["terrainFormulaDifficulties"]:
-                full_data["TERRAIN_DATA"]["terrainFormulaDifficulties"] = {}
+                full_data["TERRAIN_DATA"] = {**full_data["TERRAIN_DATA"], "terrainFormulaDifficulties": {}}
 
         # Handle empty post-processing keys
         if "keys" not in full_data.get("POST_PROCESSING", {}):
-            full_data["POST_PROCESSING"]["keys"] = []
+            full_data["POST_PROCESSING"] = {**full_data["POST_PROCESSING"], "keys": []}
 
         # Handle missing flatZones
         if "flatZones" not in full_data.get("TERRAIN_DATA", {}):
-            full_data["TERRAIN_DATA"]["flatZones"] = []
+            full_data["TERRAIN_DATA"] = {**full_data["TERRAIN_DATA"], "flatZones": []}
 
-        # Ensure all keys are serializable
+        start = time.perf_counter()
+        encoder = json.JSONEncoder(indent=2, default=_encode_array)
         try:
-            json_text = json.dumps(full_data, indent=2)
-        except Exception as e:
+            if fragments is not None:
+                # Unchanged sections are spliced in from the previous export
+                size = atomic_write_chunks(filepath, fragments.chunks(full_data, versions, encoder))
+            elif stream:
+                # Same output as json.dumps(indent=2), one section at a time
+                size = atomic_write_chunks(filepath, encoder.iterencode(full_data))
+            else:
+                size = atomic_write_chunks(filepath, [encoder.encode(full_data)])
+        except (TypeError, ValueError) as e:
             raise ValueError(f"Failed to serialize planet data: {e}")
 
-        # Create directory if it does not exist
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-        # Save to file
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(json_text)
-
-        print(f"Planet exported successfully to: {filepath}")
+        if not quiet:
+            print(f"Planet exported to: {filepath} - {format_rate(size, time.perf_counter() - start)}")
+        return size
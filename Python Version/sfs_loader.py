@@ -1,21 +1,301 @@
 import json
-from tkinter import filedialog, messagebox
+import re
 
-def choose_and_load_planet():
+# ---------------------------------------------
+# JSON BACKEND
+# ---------------------------------------------
+# Tried in order; the first one that imports is used. orjson and ujson are
+# optional and much faster on big numeric arrays, the stdlib always works.
+JSON_BACKENDS = ("orjson", "ujson", "json")
+
+# Sections that are only decoded when first accessed, plus any section whose
+# raw JSON is at least LAZY_MIN_BYTES long
+LAZY_SECTIONS = ("HEIGHTMAP",)
+LAZY_MIN_BYTES = 1 << 20
+
+_backend_name = None
+_backend_loads = None
+
+
+def set_json_backend(name=None):
+    """
+    Select the decoder used by load_planet: "orjson", "ujson", "json", or
+    None for the fastest one installed. Returns the name actually selected.
+    """
+    global _backend_name, _backend_loads
+    for candidate in ((name,) if name else JSON_BACKENDS):
+        try:
+            module = __import__(candidate)
+        except ImportError:
+            if name:
+                raise
+            continue
+        _backend_name, _backend_loads = candidate, module.loads
+        return candidate
+    raise ImportError("No JSON backend available")
+
+
+def json_backend():
+    """Name of the decoder load_planet uses."""
+    if _backend_name is None:
+        set_json_backend()
+    return _backend_name
+
+
+def _loads(text):
+    if _backend_loads is None:
+        set_json_backend()
+    try:
+        return _backend_loads(text)
+    except ValueError:
+        raise
+    except Exception as e:
+        # Some backends raise their own error types; callers only expect ValueError
+        raise ValueError(str(e)) from e
+
+
+# ---------------------------------------------
+# LAZY SECTIONS
+# ---------------------------------------------
+class _RawSection:
+    """Undecoded JSON text of one top-level section."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class LazyPlanet(dict):
+    """
+    Planet dict whose big sections stay undecoded until first accessed.
+
+    It behaves like a plain dict: every access path (indexing, get, items,
+    values, iteration, copying, json encoding) decodes a pending section on
+    the way, so callers never see the raw text. is_loaded() tells whether a
+    section has been decoded yet.
+
+    A pending section is only checked for balanced brackets and strings when
+    the file is loaded; any other syntax error in it is raised as ValueError
+    by the first access.
+    """
+
+    def _resolve(self, key, value):
+        if isinstance(value, _RawSection):
+            value = _loads(value.text)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __getitem__(self, key):
+        return self._resolve(key, dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __iter__(self):
+        # Overriding __iter__ makes dict(planet) / {**planet} go through keys()
+        # and __getitem__ instead of copying the raw entries
+        return dict.__iter__(self)
+
+    def keys(self):
+        return dict.keys(self)
+
+    def items(self):
+        return [(key, self[key]) for key in dict.__iter__(self)]
+
+    def values(self):
+        return [self[key] for key in dict.__iter__(self)]
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            dict.__delitem__(self, key)
+            return value
+        return dict.pop(self, key, *default)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def copy(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def is_loaded(self, key):
+        return not isinstance(dict.__getitem__(self, key), _RawSection)
+
+    def raw_text(self, key):
+        """Undecoded JSON text of `key` if it is still pending, else None."""
+        value = dict.get(self, key)
+        return value.text if isinstance(value, _RawSection) else None
+
+    def __reduce__(self):
+        # Pickle the raw entries so pending sections stay undecoded (e.g. when
+        # a planet parsed in a worker process is sent back)
+        return _lazy_planet_from_entries, (list(dict.items(self)),)
+
+
+def _lazy_planet_from_entries(entries):
+    planet = LazyPlanet()
+    for key, value in entries:
+        dict.__setitem__(planet, key, value)
+    return planet
+
+
+# Structural characters of a JSON value; everything between them (numbers,
+# literals, whitespace, commas, colons) is skipped with str.find
+_STRUCTURE = '"[]{}'
+_CLOSING = {"[": "]", "{": "}"}
+_STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+def _skip_ws(text, pos):
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _value_end(text, pos):
+    """Index just past the JSON value starting at text[pos]."""
+    if text[pos] not in "[{":
+        return _decoder.raw_decode(text, pos)[1]
+    open_brackets = []
+    # Next position of each structural character; only stale entries are searched
+    # again, so the scan stays linear and runs at str.find speed
+    upcoming = dict.fromkeys(_STRUCTURE, pos)
+    while True:
+        for char, at in upcoming.items():
+            if 0 <= at < pos:
+                upcoming[char] = text.find(char, pos)
+        found = [at for at in upcoming.values() if at >= 0]
+        if not found:
+            raise ValueError("Unterminated JSON value")
+        pos = min(found)
+        char = text[pos]
+        pos += 1
+        if char == '"':
+            end = _STRING_END.match(text, pos)
+            if end is None:
+                raise ValueError("Unterminated JSON string")
+            pos = end.end()
+        elif char in "[{":
+            open_brackets.append(_CLOSING[char])
+        else:
+            if open_brackets.pop() != char:
+                raise ValueError(f"Mismatched {char!r} at char {pos - 1}")
+            if not open_brackets:
+                return pos
+
+
+def _check_end(text, pos):
+    pos = _skip_ws(text, pos)
+    if pos != len(text):
+        raise ValueError(f"Extra data after the planet object at char {pos}")
+
+
+def _split_sections(text):
+    """Yield (key, raw value text) for each member of the top-level JSON object."""
+    pos = _skip_ws(text, 0)
+    if not text.startswith("{", pos):
+        raise ValueError("Planet file must contain a JSON object")
+    pos = _skip_ws(text, pos + 1)
+    if text.startswith("}", pos):
+        _check_end(text, pos + 1)
+        return
+    while True:
+        if not text.startswith('"', pos):
+            raise ValueError(f"Expected a section name at char {pos}")
+        key, pos = json.decoder.scanstring(text, pos + 1)
+        pos = _skip_ws(text, pos)
+        if not text.startswith(":", pos):
+            raise ValueError(f"Expected ':' at char {pos}")
+        start = _skip_ws(text, pos + 1)
+        end = _value_end(text, start)
+        yield key, text[start:end]
+        pos = _skip_ws(text, end)
+        if text.startswith("}", pos):
+            _check_end(text, pos + 1)
+            return
+        if not text.startswith(",", pos):
+            raise ValueError(f"Expected ',' or '}}' at char {pos}")
+        pos = _skip_ws(text, pos + 1)
+
+
+# ---------------------------------------------
+# LOADING
+# ---------------------------------------------
+def loads_planet(text, lazy=True):
+    """Decode planet JSON text; see load_planet."""
+    if not lazy:
+        return _loads(text)
+    try:
+        sections = list(_split_sections(text))
+    except ValueError:
+        # Let the real decoder produce the error message (or parse odd input)
+        return _loads(text)
+
+    planet = LazyPlanet()
+    for key, raw in sections:
+        if key in LAZY_SECTIONS or len(raw) >= LAZY_MIN_BYTES:
+            dict.__setitem__(planet, key, _RawSection(raw))
+        else:
+            dict.__setitem__(planet, key, _loads(raw))
+    return planet
+
+
+def load_planet(path, lazy=True):
     """
-    Opens a file dialog to select a JSON planet file and returns the loaded data as a Python dict.
+    Load a planet file (*.txt or *.json, both JSON) without any UI.
+
+    Args:
+        path (str): Planet file.
+        lazy (bool): Keep HEIGHTMAP and other big sections undecoded until
+            they are first accessed (returns a LazyPlanet). With False the
+            whole file is decoded up front into a plain dict.
+
+    Returns:
+        dict: The planet data.
+
+    Raises:
+        OSError: The file cannot be read.
+        ValueError: The file is not a JSON object or has data after it. With
+            lazy=True, syntax errors inside a pending section are raised on
+            its first access instead (see LazyPlanet); lazy=False checks the
+            whole file here.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return loads_planet(text, lazy)
+
+
+def choose_and_load_planet(path=None):
     """
-    file_path = filedialog.askopenfilename(
-        title="Select a planet JSON file",
-        filetypes=[("JSON Files", "*.json")]
-    )
-    if not file_path:
+    Load `path`, or ask for a planet file with a dialog when no path is given.
+    Shows an error box and returns None when loading fails.
+    """
+    from tkinter import filedialog, messagebox
+
+    if not path:
+        path = filedialog.askopenfilename(
+            title="Select a planet file",
+            filetypes=[("Planet Files", "*.txt *.json"), ("All Files", "*.*")]
+        )
+    if not path:
         return None
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data
+        return load_planet(path)
     except Exception as e:
         messagebox.showerror("Error", f"Failed to load planet file:\n{e}")
         return None
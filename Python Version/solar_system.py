@@ -0,0 +1,189 @@
+# solar_system.py
+"""
+A whole solar system: every planet of a folder plus a parent -> children
+index built from ORBIT_DATA.parent. No Tk, so it can also be used headless.
+
+Usage:
+    system = SolarSystem.load_folder("planets")
+    system.children["Sun"]            # names of the bodies orbiting the Sun
+    names, xy = system.world_positions(time=0.0)
+
+Parents that are named in ORBIT_DATA but have no file of their own (usually
+the Sun) are added as placeholder roots, so the tree is always complete.
+"""
+import os
+
+import numpy as np
+
+from kepler import gravitational_parameter, propagate
+from sfs_batch import PLANET_FILE_EXTENSIONS
+from sfs_loader import load_planet
+
+
+class Body:
+    """One planet's place in the system. Distances in meters, angles in degrees."""
+
+    __slots__ = ("name", "parent", "path", "radius", "gravity",
+                 "semi_major_axis", "eccentricity", "arg_peri", "direction", "multiplier_soi")
+
+    def __init__(self, name, parent=None, path=None, radius=0.0, gravity=0.0,
+                 semi_major_axis=0.0, eccentricity=0.0, arg_peri=0.0, direction=1, multiplier_soi=2.5):
+        self.name = name
+        self.parent = parent
+        self.path = path
+        self.radius = radius
+        self.gravity = gravity
+        self.semi_major_axis = semi_major_axis
+        self.eccentricity = eccentricity
+        self.arg_peri = arg_peri
+        self.direction = direction
+        self.multiplier_soi = multiplier_soi
+
+    @classmethod
+    def from_planet_data(cls, name, planet_data, path=None):
+        base = planet_data.get("BASE_DATA") or {}
+        orbit = planet_data.get("ORBIT_DATA") or {}
+        parent = orbit.get("parent") or None
+        return cls(
+            name,
+            parent=parent if parent != name else None,
+            path=path,
+            radius=float(base.get("radius", 0.0)),
+            gravity=float(base.get("gravity", 0.0)),
+            semi_major_axis=float(orbit.get("semiMajorAxis", 0.0)) if parent else 0.0,
+            eccentricity=min(0.99, max(0.0, float(orbit.get("eccentricity", 0.0)))),
+            arg_peri=float(orbit.get("argumentOfPeriapsis", 0.0)),
+            direction=int(orbit.get("direction", 1)) or 1,
+            multiplier_soi=float(orbit.get("multiplierSOI", 2.5)),
+        )
+
+    @property
+    def placeholder(self):
+        """True for a parent that is referenced but was not loaded."""
+        return self.path is None and self.radius == 0.0 and self.gravity == 0.0
+
+
+class SolarSystem:
+    def __init__(self, bodies=()):
+        self.bodies = {}            # name -> Body
+        self.children = {}          # name -> [child names], sorted
+        self.roots = []             # bodies without a parent, sorted
+        self.errors = []            # (path, message) for files that failed to load
+        for body in bodies:
+            self.bodies[body.name] = body
+        self.rebuild_index()
+
+    # ---------------------------------------------
+    # LOADING
+    # ---------------------------------------------
+    @classmethod
+    def from_planets(cls, planets):
+        """Build from a {name: planet_data} mapping."""
+        return cls(Body.from_planet_data(name, data) for name, data in planets.items())
+
+    @classmethod
+    def load_folder(cls, folder):
+        """Load every planet file (*.txt / *.json, not hidden) of a folder; unreadable files end up in .errors."""
+        bodies, errors = [], []
+        for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+            if entry.name.startswith("."):
+                continue
+            if not (entry.is_file() and entry.name.lower().endswith(PLANET_FILE_EXTENSIONS)):
+                continue
+            try:
+                # Lazy: the HEIGHTMAP section is never decoded here
+                data = load_planet(entry.path)
+                bodies.append(Body.from_planet_data(os.path.splitext(entry.name)[0], data, entry.path))
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                errors.append((entry.path, f"{type(e).__name__}: {e}"))
+        system = cls(bodies)
+        system.errors = errors
+        return system
+
+    # ---------------------------------------------
+    # HIERARCHY INDEX
+    # ---------------------------------------------
+    def rebuild_index(self):
+        """Recompute children/roots after bodies were added, removed or re-parented."""
+        for body in list(self.bodies.values()):
+            if body.parent and body.parent not in self.bodies:
+                self.bodies[body.parent] = Body(body.parent)
+
+        self.children = {name: [] for name in self.bodies}
+        for body in self.bodies.values():
+            if body.parent:
+                self.children[body.parent].append(body.name)
+        for names in self.children.values():
+            names.sort()
+
+        # A parent cycle (A orbits B orbits A) has no root; break it at its first name
+        self.roots = sorted(name for name, body in self.bodies.items() if not body.parent)
+        reachable = set(self._walk(self.roots))
+        for name in sorted(self.bodies):
+            if name not in reachable:
+                self.bodies[name].parent = None
+                self.children = {p: [c for c in kids if c != name] for p, kids in self.children.items()}
+                self.roots.append(name)
+                reachable.update(self._walk([name]))
+
+    def _walk(self, names):
+        stack = list(reversed(names))
+        while stack:
+            name = stack.pop()
+            yield name
+            stack.extend(reversed(self.children.get(name, ())))
+
+    def ordered(self):
+        """Every body name, parents before their children (depth-first, sorted)."""
+        return list(self._walk(self.roots))
+
+    def depth(self, name):
+        depth = 0
+        while self.bodies[name].parent:
+            name = self.bodies[name].parent
+            depth += 1
+        return depth
+
+    # ---------------------------------------------
+    # POSITIONS
+    # ---------------------------------------------
+    def arrays(self):
+        """
+        Per-body arrays in ordered() order, for vectorized work:
+        (names, parent_index (-1 for roots), a, e, arg_peri, direction, radius, mu_of_parent).
+        """
+        names = self.ordered()
+        index = {name: i for i, name in enumerate(names)}
+        bodies = [self.bodies[name] for name in names]
+        parent_index = np.array([index[b.parent] if b.parent else -1 for b in bodies], dtype=np.int64)
+        a = np.array([b.semi_major_axis for b in bodies])
+        e = np.array([b.eccentricity for b in bodies])
+        arg = np.array([b.arg_peri for b in bodies])
+        direction = np.array([b.direction for b in bodies], dtype=float)
+        radius = np.array([b.radius for b in bodies])
+        mu = gravitational_parameter([b.gravity for b in bodies], radius)
+        parent_mu = np.where(parent_index >= 0, mu[parent_index], 0.0)
+        return names, parent_index, a, e, arg, direction, radius, parent_mu
+
+    def world_positions(self, time=0.0, arrays=None):
+        """
+        (names, positions): every body's position (N x 2, meters) relative to
+        the roots, all propagated together with one batched Kepler call.
+        Bodies start at periapsis at time 0; bodies whose parent has no usable
+        gravity stay at periapsis.
+        """
+        names, parent_index, a, e, arg, direction, _, parent_mu = arrays or self.arrays()
+        local = np.zeros((len(names), 2))
+        moving = (parent_index >= 0) & (a > 0)
+        if moving.any():
+            # mu only sets the speed; without it the body is shown at periapsis
+            known = parent_mu[moving] > 0
+            local[moving] = propagate(np.where(known, time, 0.0), a[moving], e[moving], arg[moving],
+                                      direction[moving], np.where(known, parent_mu[moving], 1.0))[0]
+
+        # Parents come before children, so one pass accumulates the frames
+        world = local
+        for i, parent in enumerate(parent_index):
+            if parent >= 0:
+                world[i] += world[parent]
+        return names, world
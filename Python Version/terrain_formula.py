@@ -0,0 +1,590 @@
+# terrain_formula.py
+"""
+Parser and NumPy-vectorized evaluator for SFS terrain formulas.
+
+TERRAIN_DATA stores the terrain as formula lines, e.g.
+
+    "OUTPUT = AddHeightMap(Perlin, 5000, 600)"
+    "Hills = AddHeightMap(Perlin, 800, 120, Linear)"
+    "OUTPUT = OUTPUT + Hills * 0.5"
+
+Each line assigns an expression to a variable; OUTPUT is the terrain height in
+meters. AddHeightMap(map, width, height[, curve]) adds a heightmap to the
+variable being assigned, sampled every `width` meters along the surface and
+scaled to `height` meters. Expressions support + - * /, parentheses, numbers,
+variables and the functions in FUNCTIONS.
+
+The game's heightmap textures are not shipped with this tool, so every map name
+resolves to a deterministic procedural stand-in unless real samples are
+registered with register_heightmap().
+
+Usage:
+    formula = TerrainFormula(terrain["terrainFormulaDifficulties"]["Normal"])
+    heights = formula.evaluate(angles, radius)   # one batched call
+"""
+import re
+import zlib
+
+import numpy as np
+
+HEIGHTMAP_SAMPLES = 4096
+
+# name -> normalized (0..1) periodic samples
+HEIGHTMAPS = {}
+
+# curve name -> function applied to normalized heightmap samples
+CURVES = {
+    "Linear": lambda v: v,
+    "None": lambda v: v,
+    "Flat": lambda v: v * v * (3.0 - 2.0 * v),
+    "Sharp": lambda v: v * v,
+    "Round": lambda v: np.sqrt(v),
+}
+
+
+class FormulaError(ValueError):
+    """Raised for formula lines that cannot be parsed or evaluated."""
+
+    def __init__(self, message, line_number=None):
+        if line_number is not None:
+            message = f"Line {line_number}: {message}"
+        super().__init__(message)
+        self.line_number = line_number
+
+
+# ---------------------------------------------
+# HEIGHTMAPS
+# ---------------------------------------------
+def register_heightmap(name, values):
+    """Register real heightmap samples (any range, normalized to 0..1) under `name`."""
+    values = np.asarray(values, dtype=float).ravel()
+    if values.size < 2:
+        raise ValueError("A heightmap needs at least 2 samples.")
+    lo, hi = float(values.min()), float(values.max())
+    HEIGHTMAPS[name] = (values - lo) / (hi - lo) if hi > lo else np.zeros_like(values)
+
+
+def _procedural_heightmap(name, samples=HEIGHTMAP_SAMPLES, octaves=6):
+    """Periodic fractal value noise seeded from the map name."""
+    rng = np.random.default_rng(zlib.crc32(name.encode("utf-8")))
+    u = np.arange(samples) / samples
+    total = np.zeros(samples)
+    amplitude = 1.0
+    for octave in range(octaves):
+        cells = 8 << octave
+        lattice = rng.random(cells)
+        x = u * cells
+        i = x.astype(int)
+        t = x - i
+        t = t * t * (3.0 - 2.0 * t)
+        total += amplitude * (lattice[i % cells] * (1.0 - t) + lattice[(i + 1) % cells] * t)
+        amplitude *= 0.5
+    total -= total.min()
+    return total / total.max()
+
+
+class _Wrapped:
+    __slots__ = ("base", "values")
+
+    def __init__(self, samples):
+        self.base = samples
+        self.values = np.append(samples, samples[0])
+
+
+_WRAPPED = {}
+
+
+def get_heightmap(name):
+    samples = HEIGHTMAPS.get(name)
+    if samples is None:
+        samples = HEIGHTMAPS[name] = _procedural_heightmap(name)
+    return samples
+
+
+def sample_heightmap(name, positions, width):
+    """Linearly interpolated, wrapping lookup of a heightmap at surface positions (m)."""
+    samples = get_heightmap(name)
+    n = samples.size
+    # Repeat the first sample at the end so i0 + 1 never needs wrapping
+    wrapped = _WRAPPED.get(name)
+    if wrapped is None or wrapped.base is not samples:
+        wrapped = _WRAPPED[name] = _Wrapped(samples)
+    u = np.asarray(positions, dtype=float) * (n / width)
+    i0 = np.floor(u)
+    u -= i0
+    i0 = i0.astype(np.int64)
+    if n & (n - 1) == 0:
+        i0 &= n - 1     # power of two: cheap wrap, also correct for negatives
+    else:
+        i0 %= n
+    lo = wrapped.values[i0]
+    return lo + (wrapped.values[i0 + 1] - lo) * u
+
+
+# ---------------------------------------------
+# PARSER
+# ---------------------------------------------
+_TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)|([A-Za-z_]\w*)|(\+=|-=|\*=|/=|[-+*/(),=]))")
+
+ASSIGN_OPS = ("=", "+=", "-=", "*=", "/=")
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m:
+            raise FormulaError(f"Unexpected character {text[pos:].lstrip()[:1]!r}")
+        number, name, op = m.groups()
+        if number is not None:
+            tokens.append(("num", float(number)))
+        elif name is not None:
+            tokens.append(("name", name))
+        else:
+            tokens.append(("op", op))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser producing tuple ASTs:
+    ("num", value) / ("var", name) / ("neg", node) / ("bin", op, left, right) / ("call", name, args)
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, value=None):
+        tok = self.peek()
+        if tok[0] is None or (kind and tok[0] != kind) or (value and tok[1] != value):
+            expected = value or kind or "token"
+            found = tok[1] if tok[0] else "end of line"
+            raise FormulaError(f"Expected {expected!r}, found {found!r}")
+        self.pos += 1
+        return tok
+
+    def expr(self):
+        node = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            op = self.take()[1]
+            node = ("bin", op, node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek() in (("op", "*"), ("op", "/")):
+            op = self.take()[1]
+            node = ("bin", op, node, self.unary())
+        return node
+
+    def unary(self):
+        if self.peek() == ("op", "-"):
+            self.take()
+            return ("neg", self.unary())
+        if self.peek() == ("op", "+"):
+            self.take()
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.peek()
+        if kind == "num":
+            self.take()
+            return ("num", value)
+        if kind == "name":
+            self.take()
+            if self.peek() == ("op", "("):
+                self.take()
+                args = []
+                if self.peek() != ("op", ")"):
+                    args.append(self.expr())
+                    while self.peek() == ("op", ","):
+                        self.take()
+                        args.append(self.expr())
+                self.take("op", ")")
+                return ("call", value, args)
+            return ("var", value)
+        if (kind, value) == ("op", "("):
+            self.take()
+            node = self.expr()
+            self.take("op", ")")
+            return node
+        raise FormulaError(f"Unexpected {value!r}" if kind else "Unexpected end of line")
+
+
+class FormulaLine:
+    """One parsed assignment: `target op expr`."""
+
+    __slots__ = ("text", "number", "target", "op", "expr", "uses")
+
+    def __init__(self, text, number, target, op, expr, uses):
+        self.text = text
+        self.number = number
+        self.target = target
+        self.op = op
+        self.expr = expr
+        self.uses = uses    # frozenset of variable names read by this line
+
+
+def _collect_uses(node, uses):
+    kind = node[0]
+    if kind == "var":
+        uses.add(node[1])
+    elif kind == "neg":
+        _collect_uses(node[1], uses)
+    elif kind == "bin":
+        _collect_uses(node[2], uses)
+        _collect_uses(node[3], uses)
+    elif kind == "call":
+        spec = FUNCTIONS.get(node[1])
+        args = node[2]
+        if spec is not None and spec[2]:
+            args = args[1:3]   # heightmap and curve arguments are names, not variables
+        for arg in args:
+            _collect_uses(arg, uses)
+
+
+def _reads_target(node):
+    """True if the expression implicitly reads the assigned variable (AddHeightMap)."""
+    kind = node[0]
+    if kind == "call":
+        return node[1] == "AddHeightMap" or any(_reads_target(a) for a in node[2])
+    if kind == "neg":
+        return _reads_target(node[1])
+    if kind == "bin":
+        return _reads_target(node[2]) or _reads_target(node[3])
+    return False
+
+
+def is_blank_line(text):
+    stripped = text.strip()
+    return not stripped or stripped.startswith(("//", "#"))
+
+
+def parse_line(text, line_number=None):
+    """Parse one formula line into a FormulaLine."""
+    try:
+        tokens = _tokenize(text)
+        if len(tokens) < 3 or tokens[0][0] != "name" or tokens[1] not in [("op", op) for op in ASSIGN_OPS]:
+            raise FormulaError("Expected '<variable> = <expression>'")
+        parser = _Parser(tokens[2:])
+        expr = parser.expr()
+        if parser.pos != len(parser.tokens):
+            raise FormulaError(f"Unexpected {parser.peek()[1]!r}")
+        target, op = tokens[0][1], tokens[1][1]
+
+        uses = set()
+        _collect_uses(expr, uses)
+        if op != "=" or _reads_target(expr):
+            uses.add(target)
+        _check_calls(expr)
+    except FormulaError as e:
+        if line_number is None or e.line_number is not None:
+            raise
+        raise FormulaError(str(e), line_number) from None
+    return FormulaLine(text, line_number, target, op, expr, frozenset(uses))
+
+
+def _check_calls(node):
+    kind = node[0]
+    if kind == "call":
+        name, args = node[1], node[2]
+        spec = FUNCTIONS.get(name)
+        if spec is None:
+            raise FormulaError(f"Unknown function {name!r}")
+        lo, hi = spec[1]
+        if not lo <= len(args) <= hi:
+            raise FormulaError(f"{name} takes {lo}-{hi} arguments, got {len(args)}")
+        if spec[2] and args[0][0] != "var":
+            raise FormulaError(f"{name} expects a heightmap name as first argument")
+        if spec[2] and len(args) > 3 and args[3][0] != "var":
+            raise FormulaError(f"{name} expects a curve name as fourth argument")
+        for arg in (args[1:3] if spec[2] else args):
+            _check_calls(arg)
+    elif kind == "neg":
+        _check_calls(node[1])
+    elif kind == "bin":
+        _check_calls(node[2])
+        _check_calls(node[3])
+
+
+# ---------------------------------------------
+# EVALUATION
+# ---------------------------------------------
+def _heightmap(ctx, name, width, height, curve=None):
+    if np.ndim(width):
+        raise FormulaError("Heightmap width must be a constant")
+    if width <= 0:
+        raise FormulaError("Heightmap width must be positive")
+    values = sample_heightmap(name, ctx.positions, width)
+    if curve is not None:
+        values = CURVES.get(curve, CURVES["Linear"])(values)
+    return values * height
+
+
+def _add_heightmap(ctx, name, width, height, curve=None):
+    return ctx.target_value + _heightmap(ctx, name, width, height, curve)
+
+
+# name -> (implementation, (min_args, max_args), first_arg_is_heightmap_name)
+FUNCTIONS = {
+    "AddHeightMap": (_add_heightmap, (3, 4), True),
+    "HeightMap": (_heightmap, (3, 4), True),
+    "Min": (lambda ctx, a, b: np.minimum(a, b), (2, 2), False),
+    "Max": (lambda ctx, a, b: np.maximum(a, b), (2, 2), False),
+    "Clamp": (lambda ctx, x, lo, hi: np.clip(x, lo, hi), (3, 3), False),
+    "Abs": (lambda ctx, x: np.abs(x), (1, 1), False),
+    "Pow": (lambda ctx, x, p: np.power(np.maximum(x, 0.0), p), (2, 2), False),
+    "Lerp": (lambda ctx, a, b, t: a + (b - a) * t, (3, 3), False),
+}
+
+_BINARY = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": np.divide,
+}
+
+_COMPOUND = {"+=": "+", "-=": "-", "*=": "*", "/=": "/"}
+
+
+class _Context:
+    __slots__ = ("positions", "variables", "target_value")
+
+    def __init__(self, positions, variables):
+        self.positions = positions
+        self.variables = variables
+        self.target_value = 0.0
+
+
+def _eval(node, ctx):
+    kind = node[0]
+    if kind == "num":
+        return node[1]
+    if kind == "var":
+        try:
+            return ctx.variables[node[1]]
+        except KeyError:
+            raise FormulaError(f"Variable {node[1]!r} is used before it is assigned") from None
+    if kind == "neg":
+        return -_eval(node[1], ctx)
+    if kind == "bin":
+        return _BINARY[node[1]](_eval(node[2], ctx), _eval(node[3], ctx))
+    # call
+    func, _, takes_map = FUNCTIONS[node[1]]
+    args = node[2]
+    if takes_map:
+        curve = args[3][1] if len(args) > 3 else None
+        values = [_eval(a, ctx) for a in args[1:3]]
+        return func(ctx, args[0][1], *values, curve)
+    return func(ctx, *[_eval(a, ctx) for a in args])
+
+
+def evaluate_line(line, positions, variables):
+    """Evaluate one FormulaLine against `variables` and return the new target value."""
+    ctx = _Context(positions, variables)
+    ctx.target_value = variables.get(line.target, 0.0)
+    try:
+        value = _eval(line.expr, ctx)
+        if line.op != "=":
+            if line.target not in variables:
+                raise FormulaError(f"Variable {line.target!r} is used before it is assigned")
+            value = _BINARY[_COMPOUND[line.op]](variables[line.target], value)
+    except FormulaError as e:
+        if e.line_number is not None or line.number is None:
+            raise
+        raise FormulaError(str(e), line.number) from None
+    return np.broadcast_to(np.asarray(value, dtype=float), positions.shape)
+
+
+def surface_positions(angles, radius):
+    """Distance along the surface (m) for an array of angles in radians."""
+    return np.asarray(angles, dtype=float) * float(radius)
+
+
+class TerrainFormula:
+    """
+    A compiled list of formula lines.
+
+    Parsing happens once in the constructor; evaluate() runs the whole formula
+    on an array of angles with NumPy, so cost is a handful of array operations
+    per line regardless of the sample count.
+    """
+
+    OUTPUT = "OUTPUT"
+
+    def __init__(self, lines):
+        self.lines = []
+        for number, text in enumerate(lines or [], start=1):
+            if not is_blank_line(text):
+                self.lines.append(parse_line(text, number))
+
+    def evaluate_variables(self, angles, radius):
+        """Run every line and return the final {variable: array} mapping."""
+        positions = surface_positions(angles, radius)
+        variables = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for line in self.lines:
+                variables[line.target] = evaluate_line(line, positions, variables)
+        return variables
+
+    def evaluate(self, angles, radius):
+        """Return OUTPUT for every angle (zeros when the formula never sets it)."""
+        variables = self.evaluate_variables(angles, radius)
+        output = variables.get(self.OUTPUT)
+        if output is None:
+            return np.zeros(np.shape(angles))
+        return np.array(output, dtype=float)
+
+
+def build_dependency_graph(lines):
+    """
+    For parsed FormulaLines, return a tuple per line with the indices of the
+    lines it reads from (the latest earlier definition of each variable it uses).
+    """
+    last_definition = {}
+    graph = []
+    for i, line in enumerate(lines):
+        graph.append(tuple(sorted(last_definition[v] for v in line.uses if v in last_definition)))
+        last_definition[line.target] = i
+    return graph
+
+
+class IncrementalFormula:
+    """
+    Re-evaluates a formula that is being edited, recomputing only what changed.
+
+    Every line gets a key made of its text and the keys of the lines it
+    depends on (see build_dependency_graph). Results are memoized by that key,
+    so editing one line changes its key and the keys of the lines downstream
+    of it, while every other line is served from the cache. Keys are compared
+    exactly; each distinct (text, dependency keys) tuple is numbered once, so
+    keys stay flat however deep the dependencies go.
+
+    Usage:
+        inc = IncrementalFormula(angles, radius)
+        heights = inc.evaluate(text.splitlines())   # call again after each edit
+    """
+
+    OUTPUT = TerrainFormula.OUTPUT
+
+    def __init__(self, angles, radius):
+        self._parsed = {}       # line text -> FormulaLine
+        self._keys = {}         # (line text, dependency keys) -> line key (int)
+        self._next_key = 0
+        self._results = {}      # line key -> evaluated array
+        self.evaluated = 0      # lines computed by the last evaluate()
+        self.reused = 0         # lines served from the cache by the last evaluate()
+        self.set_samples(angles, radius)
+
+    def set_samples(self, angles, radius):
+        """Change the sample angles/radius; invalidates every cached result."""
+        self.angles = np.asarray(angles, dtype=float)
+        self.radius = float(radius)
+        self.positions = surface_positions(self.angles, self.radius)
+        self._results = {}
+        self._keys = {}
+
+    def _parse(self, text, number):
+        line = self._parsed.get(text)
+        if line is None:
+            try:
+                line = parse_line(text)
+            except FormulaError as e:
+                raise FormulaError(str(e), number) from None
+            if len(self._parsed) > 4096:
+                self._parsed.clear()
+            self._parsed[text] = line
+        return line
+
+    def evaluate_variables(self, lines):
+        """Evaluate `lines` and return the final {variable: array} mapping."""
+        parsed, numbers = [], []
+        for number, text in enumerate(lines or [], start=1):
+            if not is_blank_line(text):
+                parsed.append(self._parse(text, number))
+                numbers.append(number)
+
+        graph = build_dependency_graph(parsed)
+        keys = []
+        values = []
+        results = {}
+        key_table = {}
+        self.evaluated = self.reused = 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i, line in enumerate(parsed):
+                signature = (line.text, tuple(keys[d] for d in graph[i]))
+                key = self._keys.get(signature)
+                if key is None:
+                    key = self._keys[signature] = self._next_key
+                    self._next_key += 1
+                key_table[signature] = key
+                keys.append(key)
+                value = results.get(key)
+                if value is None:
+                    value = self._results.get(key)
+                if value is None:
+                    variables = {parsed[d].target: values[d] for d in graph[i]}
+                    try:
+                        value = evaluate_line(line, self.positions, variables)
+                    except FormulaError as e:
+                        raise FormulaError(str(e), numbers[i]) from None
+                    self.evaluated += 1
+                else:
+                    self.reused += 1
+                results[key] = value
+                values.append(value)
+
+        # Keep only results (and keys) reachable from the current text
+        self._results = results
+        self._keys = key_table
+
+        variables = {}
+        for line, value in zip(parsed, values):
+            variables[line.target] = value
+        return variables
+
+    def evaluate(self, lines):
+        """Return OUTPUT for the sample angles (zeros when never assigned)."""
+        output = self.evaluate_variables(lines).get(self.OUTPUT)
+        if output is None:
+            return np.zeros(self.angles.shape)
+        return np.array(output, dtype=float)
+
+
+# ---------------------------------------------
+# TERRAIN_DATA helpers
+# ---------------------------------------------
+def terrain_heights(terrain_data, angles, radius, difficulty="Normal"):
+    """Terrain height (m above radius) of a TERRAIN_DATA block at `angles`."""
+    lines = (terrain_data.get("terrainFormulaDifficulties") or {}).get(difficulty, [])
+    return TerrainFormula(lines).evaluate(angles, radius)
+
+
+def texture_values(terrain_data, angles, radius):
+    """Evaluated textureFormula OUTPUT at `angles`."""
+    return TerrainFormula(terrain_data.get("textureFormula", [])).evaluate(angles, radius)
+
+
+def apply_flat_zones(heights, angles, radius, flat_zones):
+    """
+    Blend `heights` toward each flat zone's height.
+
+    A zone is flat over `width` meters of surface centered on `angle` (radians)
+    and blends back into the terrain over `transition` meters on both sides.
+    """
+    heights = np.array(heights, dtype=float)
+    angles = np.asarray(angles, dtype=float)
+    for zone in flat_zones or []:
+        delta = np.abs((angles - float(zone.get("angle", 0.0)) + np.pi) % (2 * np.pi) - np.pi)
+        distance = delta * float(radius) - float(zone.get("width", 0.0)) / 2
+        transition = max(float(zone.get("transition", 0.0)), 1e-9)
+        weight = np.clip(1.0 - distance / transition, 0.0, 1.0)
+        heights += (float(zone.get("height", 0.0)) - heights) * weight
+    return heights
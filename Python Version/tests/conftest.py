@@ -0,0 +1,7 @@
+# tests/conftest.py
+# The app's modules import each other as top-level modules (see main.py), so
+# the tests run with "Python Version" on the import path.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
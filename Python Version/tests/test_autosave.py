@@ -0,0 +1,183 @@
+import json
+import time
+
+import pytest
+
+import autosave
+from autosave import AutosaveService, recovered_name, recovery_files, recovery_prefix, take_snapshot
+from planet_model import PlanetModel
+from sfs_loader import load_planet, loads_planet
+
+PLANET = {
+    "version": "1.5",
+    "BASE_DATA": {"radius": 1000.0, "gravity": 9.8},
+    "ORBIT_DATA": {"parent": "Sun", "eccentricity": 0.1},
+    "HEIGHTMAP": {"points": [0.0, 0.5, 1.0]},
+    "ACHIEVEMENT_DATA": {"Landed": True},
+}
+
+
+class FakeTk:
+    """after / after_cancel on a clock the test advances by hand."""
+
+    def __init__(self):
+        self.now_ms = 0.0
+        self.timers = {}
+        self.next_id = 0
+
+    def monotonic(self):
+        return self.now_ms / 1000.0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = (self.now_ms + ms, callback)
+        return self.next_id
+
+    def after_cancel(self, timer):
+        self.timers.pop(timer, None)
+
+    def advance(self, ms):
+        target = self.now_ms + ms
+        while True:
+            due = [(at, timer) for timer, (at, _) in self.timers.items() if at <= target]
+            if not due:
+                break
+            at, timer = min(due)
+            self.now_ms = at
+            self.timers.pop(timer)[1]()
+        self.now_ms = target
+
+
+@pytest.fixture
+def tk(monkeypatch):
+    fake = FakeTk()
+    monkeypatch.setattr(autosave.time, "monotonic", fake.monotonic)
+    return fake
+
+
+@pytest.fixture
+def service(tk, tmp_path):
+    saved = []
+    service = AutosaveService(tk.after, tk.after_cancel, folder=str(tmp_path), idle_ms=1000, keep=3,
+                              on_saved=lambda path, error: saved.append((path, error)))
+    service.saved = saved
+    yield service
+    service.close()
+
+
+def _wait_for_saves(tk, service, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while len(service.saved) < count:
+        assert time.monotonic() < deadline, "autosave did not finish"
+        time.sleep(0.005)
+        tk.advance(autosave.RESULT_POLL_MS)
+
+
+def test_edits_are_debounced_into_one_save(tk, service):
+    model = PlanetModel.from_dict(dict(PLANET))
+    service.watch(model, "Earth")
+    for i in range(10):
+        model.base.radius = 2000.0 + i
+        tk.advance(500)             # never idle for a full second
+    assert service.saved == []
+    tk.advance(1000)
+    _wait_for_saves(tk, service, 1)
+    tk.advance(10000)
+    assert len(service.saved) == 1
+    path, error = service.saved[0]
+    assert error is None
+    assert recovered_name(path) == "Earth"
+    data = load_planet(path)
+    assert data["BASE_DATA"]["radius"] == 2009.0
+    assert data["HEIGHTMAP"] == PLANET["HEIGHTMAP"]
+
+
+def test_no_edits_no_save(tk, service, tmp_path):
+    service.watch(PlanetModel.from_dict(dict(PLANET)), "Earth")
+    tk.advance(10000)
+    service.close()
+    assert service.saved == [] and recovery_files(str(tmp_path)) == []
+
+
+def test_old_recovery_files_are_rotated(tk, service, tmp_path):
+    model = PlanetModel.from_dict(dict(PLANET))
+    service.watch(model, "Earth")
+    for i in range(5):
+        model.orbit.eccentricity = 0.2 + i / 10
+        tk.advance(1000)
+        _wait_for_saves(tk, service, i + 1)
+        time.sleep(0.01)            # distinct file stamps and mtimes
+    files = recovery_files(str(tmp_path), "Earth")
+    assert len(files) == 3
+    assert load_planet(files[0])["ORBIT_DATA"]["eccentricity"] == pytest.approx(0.6)
+
+
+def test_close_saves_pending_edits(tk, service, tmp_path):
+    model = PlanetModel.from_dict(dict(PLANET))
+    service.watch(model, "Mars")
+    model.base.gravity = 3.7
+    service.close()
+    files = recovery_files(str(tmp_path), "Mars")
+    assert len(files) == 1
+    assert load_planet(files[0])["BASE_DATA"]["gravity"] == 3.7
+
+
+def test_switching_planets_saves_the_previous_one(tk, service, tmp_path):
+    earth = PlanetModel.from_dict(dict(PLANET))
+    service.watch(earth, "Earth")
+    earth.base.radius = 1.0
+    service.watch(PlanetModel.from_dict(dict(PLANET)), "Mars")
+    _wait_for_saves(tk, service, 1)
+    earth.base.radius = 2.0         # no longer watched
+    tk.advance(10000)
+    assert [recovered_name(path) for path, _ in service.saved] == ["Earth"]
+
+
+def test_write_errors_are_reported(tk, tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    saved = []
+    service = AutosaveService(tk.after, tk.after_cancel, folder=str(blocker / "sub"), idle_ms=10,
+                              on_saved=lambda path, error: saved.append(error))
+    service.saved = saved
+    model = PlanetModel.from_dict(dict(PLANET))
+    service.watch(model, "Earth")
+    model.base.radius = 5.0
+    tk.advance(10)
+    _wait_for_saves(tk, service, 1)
+    service.close()
+    assert saved[0] and saved[0].split(":")[0].endswith("Error")
+
+
+def test_snapshot_keeps_lazy_sections_undecoded():
+    source = loads_planet(json.dumps(PLANET, indent=2))
+    model = PlanetModel.from_dict(source)
+    snapshot = take_snapshot(model, "Earth")
+    assert not source.is_loaded("HEIGHTMAP")
+    assert json.loads(snapshot.data["HEIGHTMAP"].text) == PLANET["HEIGHTMAP"]
+    assert snapshot.data["ACHIEVEMENT_DATA"] == PLANET["ACHIEVEMENT_DATA"]
+
+
+def test_recovery_names():
+    assert recovery_prefix("Earth").startswith("Earth.") and recovery_prefix("Earth").endswith(".autosave.")
+    assert "/" not in recovery_prefix("../a/b c")
+    assert recovery_prefix("").startswith("Untitled.")
+    for name in ["Earth", "A B", "A_B", "A/B", "../a/b c", "Ünïcode ☄", "x.autosave.y", "50%"]:
+        assert recovered_name(f"/x/{recovery_prefix(name)}20260101-000000-000.txt") == name
+
+
+def test_similar_names_never_share_recovery_files(tk, service, tmp_path):
+    names = ["A B", "A_B", "A/B", "a b"]
+    assert len({recovery_prefix(name).lower() for name in names}) == len(names)
+    for name in names:
+        model = PlanetModel.from_dict(dict(PLANET))
+        service.watch(model, name)
+        for i in range(4):
+            model.base.radius = 10.0 + i
+            tk.advance(1000)
+            _wait_for_saves(tk, service, len(service.saved) + 1)
+            time.sleep(0.01)
+    # Rotating one planet's files never removes another's
+    for name in names:
+        files = recovery_files(str(tmp_path), name)
+        assert len(files) == 3 and {recovered_name(path) for path in files} == {name}
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from heightmap_brush import TOOLS, apply_stroke, stroke_span
+
+
+@pytest.mark.parametrize("tool", TOOLS)
+def test_stroke_stays_inside_its_span_and_range(tool):
+    rng = np.random.default_rng(0)
+    points = rng.random(500)
+    before = points.copy()
+    lo, hi = apply_stroke(points, tool, 300, 0.9, 200, 0.1, radius=10, strength=1.0, rng=rng)
+    assert (lo, hi) == stroke_span(500, 200, 300, 10) == (190, 311)
+    np.testing.assert_array_equal(points[:lo], before[:lo])
+    np.testing.assert_array_equal(points[hi:], before[hi:])
+    assert points.min() >= 0.0 and points.max() <= 1.0
+
+
+def test_draw_reaches_the_pointer():
+    points = np.zeros(100)
+    apply_stroke(points, "Draw", 10, 0.2, 20, 0.4, radius=3)
+    np.testing.assert_allclose(points[10:21], np.linspace(0.2, 0.4, 11))
+
+
+def test_span_is_clipped_to_the_map():
+    assert stroke_span(100, -5, 3, 10) == (0, 14)
+    assert stroke_span(100, 95, 120, 10) == (85, 100)
+
+
+def test_unknown_tool():
+    with pytest.raises(ValueError):
+        apply_stroke(np.zeros(10), "Spray", 1, 0.5, 2, 0.5)
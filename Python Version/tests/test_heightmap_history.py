@@ -0,0 +1,65 @@
+import numpy as np
+
+from heightmap_brush import apply_stroke, stroke_span
+from heightmap_history import EditHistory
+
+
+def _stroke(history, points, tool, i0, i1, radius=8):
+    history.begin()
+    for a, b in zip(range(i0, i1, 5), range(i0 + 5, i1 + 5, 5)):
+        history.record(points, *stroke_span(len(points), a, b, radius))
+        apply_stroke(points, tool, a, 0.8, b, 0.3, radius=radius, strength=0.7)
+    history.commit(points)
+
+
+def test_undo_redo_round_trip():
+    points = np.random.default_rng(1).random(1000)
+    history = EditHistory()
+    states = [points.copy()]
+    for tool, i0, i1 in [("Raise", 100, 200), ("Draw", 150, 400), ("Smooth", 0, 60), ("Lower", 900, 999)]:
+        _stroke(history, points, tool, i0, i1)
+        states.append(points.copy())
+
+    for state in reversed(states[:-1]):
+        assert history.undo(points) is not None
+        np.testing.assert_array_equal(points, state)
+    assert not history.can_undo and history.undo(points) is None
+
+    for state in states[1:]:
+        history.redo(points)
+        np.testing.assert_array_equal(points, state)
+    assert not history.can_redo
+
+
+def test_new_stroke_drops_redo():
+    points = np.full(100, 0.5)
+    history = EditHistory()
+    _stroke(history, points, "Raise", 10, 20)
+    history.undo(points)
+    _stroke(history, points, "Lower", 50, 60)
+    assert not history.can_redo
+    assert history.bytes_used == sum(values.nbytes for _, values in history._undo)
+
+
+def test_no_op_stroke_is_not_recorded():
+    points = np.ones(100)
+    history = EditHistory()
+    _stroke(history, points, "Raise", 10, 20)     # already at the top
+    assert not history.can_undo
+
+
+def test_memory_cap_drops_the_oldest_steps():
+    points = np.zeros(1000)
+    history = EditHistory(max_bytes=3000)
+    for i in range(20):
+        _stroke(history, points, "Raise", 10 * i, 10 * i + 100)
+    assert 0 < history.bytes_used <= 3000
+    assert history.can_undo
+
+
+def test_resized_map_clears_history():
+    points = np.zeros(100)
+    history = EditHistory()
+    _stroke(history, points, "Raise", 80, 95)
+    assert history.undo(np.zeros(50)) is None
+    assert not history.can_undo and history.bytes_used == 0
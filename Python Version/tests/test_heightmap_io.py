@@ -0,0 +1,90 @@
+import json
+import types
+
+import numpy as np
+import pytest
+
+import heightmap_lod
+from heightmap_history import EditHistory
+from heightmap_io import as_points, load_heightmap, save_heightmap
+from heightmap_lod import MinMaxPyramid
+
+
+@pytest.mark.parametrize("ext", [".npy", ".f32", ".raw", ".f16", ".txt", ".json"])
+def test_io_round_trip(tmp_path, ext):
+    values = np.linspace(0.0, 1.0, 33)
+    path = str(tmp_path / f"map{ext}")
+    save_heightmap(path, values)
+    loaded = load_heightmap(path)
+    tolerance = 1e-3 if ext == ".f16" else 1e-7
+    np.testing.assert_allclose(loaded, values, atol=tolerance)
+    assert isinstance(loaded, np.memmap) == (ext not in (".txt", ".json"))
+
+
+def test_memmaps_are_copy_on_write(tmp_path):
+    path = tmp_path / "map.f32"
+    save_heightmap(str(path), np.zeros(8))
+    loaded = load_heightmap(str(path))
+    loaded[:] = 1.0
+    np.testing.assert_array_equal(load_heightmap(str(path)), 0.0)
+
+
+def test_json_output_matches_json_dump(tmp_path):
+    values = np.random.default_rng(5).random(20)
+    path = tmp_path / "map.txt"
+    save_heightmap(str(path), values)
+    assert path.read_text() == json.dumps({"points": values.tolist()}, indent=2)
+
+
+def test_io_rejects_bad_input(tmp_path):
+    with pytest.raises(ValueError):
+        save_heightmap(str(tmp_path / "map.txt"), [0.0, float("nan")])
+    with pytest.raises(ValueError):
+        save_heightmap(str(tmp_path / "map.png"), [0.0, 1.0])
+    (tmp_path / "one.json").write_text('{"points": [1.0]}')
+    with pytest.raises(ValueError):
+        load_heightmap(str(tmp_path / "one.json"))
+
+
+# ---------------------------------------------
+# IMPORT PATH
+# ---------------------------------------------
+@pytest.fixture
+def mapped_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(heightmap_lod, "MAPPED_LEVEL_SAMPLES", 64)
+    path = tmp_path / "map.npy"
+    np.save(path, np.random.default_rng(6).random(1000))
+    return str(path)
+
+
+def test_as_points_keeps_memmaps(mapped_file):
+    loaded = load_heightmap(mapped_file)
+    assert as_points(loaded) is loaded
+    assert MinMaxPyramid(as_points(loaded)).base > 1
+    assert as_points([0, 1]).dtype == float
+    assert as_points(np.arange(3)).dtype == float
+
+
+def test_gui_import_keeps_the_memmap(mapped_file):
+    pytest.importorskip("customtkinter")
+    from gui.heightmap_generator import HeightmapGUI
+
+    gui = types.SimpleNamespace(points=np.zeros(2), history=EditHistory(), pyramid=None,
+                                resolution_var=types.SimpleNamespace(set=lambda value: None),
+                                request_redraw=lambda *span: None)
+    HeightmapGUI.set_points(gui, load_heightmap(mapped_file))
+    assert isinstance(gui.points, np.memmap)
+    assert gui.pyramid.base > 1
+
+
+def test_gui_reports_a_broken_lazy_heightmap(monkeypatch):
+    pytest.importorskip("customtkinter")
+    from gui import heightmap_generator
+    from sfs_loader import loads_planet
+
+    errors = []
+    monkeypatch.setattr(heightmap_generator.messagebox, "showerror", lambda title, text: errors.append(text))
+    shown = []
+    gui = types.SimpleNamespace(default_count=16, cancel_generation=lambda: None, set_points=shown.append)
+    heightmap_generator.HeightmapGUI.update_data(gui, loads_planet('{"HEIGHTMAP": {"points": [1,, 2]}}'))
+    assert errors and len(shown[0]) == 16 and not shown[0].any()
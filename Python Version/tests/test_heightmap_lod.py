@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import heightmap_lod
+from heightmap_io import load_heightmap
+from heightmap_lod import MinMaxPyramid
+
+
+def _assert_levels_equal(one, two):
+    assert len(one) == len(two)
+    for (min1, max1), (min2, max2) in zip(one, two):
+        np.testing.assert_array_equal(min1, min2)
+        np.testing.assert_array_equal(max1, max2)
+
+
+@pytest.mark.parametrize("n", [2, 3, 17, 1000, 4097])
+def test_pyramid_levels(n):
+    points = np.random.default_rng(n).random(n)
+    pyramid = MinMaxPyramid(points)
+    assert len(pyramid.levels[-1][0]) == 1
+    assert pyramid.levels[-1][0][0] == points.min()
+    assert pyramid.levels[-1][1][0] == points.max()
+    for k, (mins, maxs) in enumerate(pyramid.levels, start=pyramid.base):
+        block = 1 << k
+        np.testing.assert_array_equal(mins, [points[i:i + block].min() for i in range(0, n, block)])
+        np.testing.assert_array_equal(maxs, [points[i:i + block].max() for i in range(0, n, block)])
+
+
+def test_update_matches_rebuild():
+    points = np.random.default_rng(2).random(5000)
+    pyramid = MinMaxPyramid(points)
+    for start, stop in [(0, 1), (1234, 1500), (4990, 5000), (2047, 2049)]:
+        points[start:stop] = np.random.default_rng(start).random(stop - start) * 3 - 1
+        pyramid.update(start, stop)
+        _assert_levels_equal(pyramid.levels, MinMaxPyramid(points).levels)
+
+
+def test_columns_cover_every_sample():
+    points = np.random.default_rng(3).random(10000)
+    pyramid = MinMaxPyramid(points)
+    for width in (1, 7, 100, 5000, 20000):
+        lows, highs = pyramid.columns(width)
+        assert lows.min() == points.min() and highs.max() == points.max()
+
+
+def test_columns_of_part_of_the_view():
+    points = np.arange(1024.0)
+    lows, highs = MinMaxPyramid(points).columns(16, 2, 4)
+    np.testing.assert_array_equal(lows, [128, 192])
+    np.testing.assert_array_equal(highs, [191, 255])
+
+
+def test_memmap_pyramid_matches_in_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(heightmap_lod, "MAPPED_LEVEL_SAMPLES", 64)
+    monkeypatch.setattr(heightmap_lod, "CHUNK_SAMPLES", 100)
+    values = np.random.default_rng(4).random(1001).astype("<f4")
+    path = tmp_path / "map.f32"
+    values.tofile(path)
+    mapped = MinMaxPyramid(load_heightmap(str(path)))
+    in_memory = MinMaxPyramid(values.copy())
+    assert mapped.base > 1
+    _assert_levels_equal(mapped.levels, in_memory.levels[mapped.base - 1:])
+
+    mapped.points[500:520] = 2.0
+    in_memory.points[500:520] = 2.0
+    mapped.update(500, 520)
+    in_memory.update(500, 520)
+    _assert_levels_equal(mapped.levels, in_memory.levels[mapped.base - 1:])
+    np.testing.assert_array_equal(mapped.columns(40)[1], in_memory.columns(40)[1])
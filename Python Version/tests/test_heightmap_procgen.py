@@ -0,0 +1,32 @@
+import threading
+
+import numpy as np
+import pytest
+
+from heightmap_procgen import GENERATORS, GenerationCancelled, generate
+
+
+@pytest.mark.parametrize("name", list(GENERATORS))
+def test_generators_are_deterministic(name):
+    start = np.random.default_rng(6).random(2048)
+    one = generate(name, start.copy(), seed=3, detail=4)
+    two = generate(name, start.copy(), seed=3, detail=4)
+    assert one.shape == start.shape
+    np.testing.assert_array_equal(one, two)
+    assert np.all(np.isfinite(one))
+
+
+def test_seed_changes_the_map():
+    points = np.zeros(1024)
+    assert not np.array_equal(generate("Fractal noise", points, seed=1), generate("Fractal noise", points, seed=2))
+
+
+def test_generation_reports_progress_and_can_be_cancelled():
+    seen = []
+    generate("Fractal noise", np.zeros(1024), progress=seen.append)
+    assert seen and seen[-1] == pytest.approx(1.0)
+
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(GenerationCancelled):
+        generate("Thermal erosion", np.zeros(1024), cancel=cancel)
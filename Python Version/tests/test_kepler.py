@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from kepler import (elements_from_orbit_data, gravitational_parameter, orbital_period, propagate, solve_kepler,
+                    time_to_periapsis)
+
+MU = float(gravitational_parameter(9.8, 6.3e5))
+A = 2.0e6
+
+
+@pytest.mark.parametrize("e", [0.0, 0.3, 0.9, 0.99])
+def test_solve_kepler_residual(e):
+    mean = np.linspace(0.0, 2 * np.pi, 1000, endpoint=False)
+    anomaly = solve_kepler(mean, e)
+    np.testing.assert_allclose(anomaly - e * np.sin(anomaly), mean, atol=1e-10)
+
+
+@pytest.mark.parametrize("e, direction", [(0.0, 1), (0.4, 1), (0.8, -1), (0.95, 1)])
+def test_energy_and_angular_momentum_are_conserved(e, direction):
+    times = np.linspace(0.0, 3 * orbital_period(A, MU), 2000)
+    pos, vel = propagate(times, A, e, 37.0, direction, MU)
+    r = np.linalg.norm(pos, axis=-1)
+    speed2 = np.sum(vel * vel, axis=-1)
+    # vis-viva: v^2/2 - mu/r = -mu/(2a)
+    np.testing.assert_allclose(0.5 * speed2 - MU / r, -MU / (2 * A), rtol=1e-9)
+    # h = x*vy - y*vx, positive for prograde orbits
+    h = pos[:, 0] * vel[:, 1] - pos[:, 1] * vel[:, 0]
+    np.testing.assert_allclose(h, direction * np.sqrt(MU * A * (1 - e * e)), rtol=1e-9)
+
+
+def test_propagation_is_periodic_and_starts_at_periapsis():
+    period = orbital_period(A, MU)
+    pos, _ = propagate(np.array([0.0, period, 2 * period]), A, 0.5, 90.0, 1, MU)
+    np.testing.assert_allclose(pos[1], pos[0], atol=1e-3)
+    np.testing.assert_allclose(pos[2], pos[0], atol=1e-3)
+    # arg_peri 90 degrees: periapsis at distance a(1-e) along +y
+    np.testing.assert_allclose(pos[0], [0.0, A * 0.5], atol=1e-6)
+
+
+def test_time_to_periapsis():
+    period = orbital_period(A, MU)
+    remaining = time_to_periapsis(np.array([0.0, 0.25 * period, 0.75 * period]), A, MU)
+    np.testing.assert_allclose(remaining, [0.0, 0.75 * period, 0.25 * period], atol=1e-6)
+
+
+def test_elements_from_orbit_data_defaults():
+    assert elements_from_orbit_data({}) == (0.0, 0.0, 0.0, 1)
+    assert elements_from_orbit_data({"semiMajorAxis": 5, "direction": -1})[::3] == (5.0, -1)
@@ -0,0 +1,62 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from orbit_conflicts import OrbitBand, check_system, compute_bands, find_conflicts
+from solar_system import Body, SolarSystem
+
+
+def _all_pairs(bands):
+    """Reference: every sibling pair whose bands (orbit +- SOI) touch."""
+    pairs = {}
+    for one, two in itertools.combinations(bands, 2):
+        if one.parent != two.parent or max(one.low, two.low) > min(one.high, two.high):
+            continue
+        orbits_cross = min(one.apoapsis, two.apoapsis) >= max(one.periapsis, two.periapsis)
+        pairs[(one.parent,) + tuple(sorted((one.name, two.name)))] = "orbit" if orbits_cross else "soi"
+    return pairs
+
+
+def _random_bands(rng, count, parents):
+    bands = []
+    for i in range(count):
+        peri = rng.uniform(0, 1000)
+        bands.append(OrbitBand(f"b{i}", rng.choice(parents), peri, peri + rng.uniform(0, 100), rng.uniform(0, 20)))
+    return bands
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_sweep_matches_all_pairs(seed):
+    rng = np.random.default_rng(seed)
+    bands = _random_bands(rng, 60, ["Sun", "Earth", "Jupiter"])
+    found = {(c.parent, c.first, c.second): c.kind for c in find_conflicts(bands)}
+    assert found == _all_pairs(bands)
+
+
+def test_conflicts_are_ordered_orbit_first():
+    bands = [OrbitBand("A", "Sun", 100, 200, 1), OrbitBand("B", "Sun", 150, 250, 1),
+             OrbitBand("C", "Sun", 300, 300, 10), OrbitBand("D", "Sun", 315, 315, 10)]
+    conflicts = find_conflicts(bands)
+    assert [(c.first, c.second, c.kind) for c in conflicts] == [("A", "B", "orbit"), ("C", "D", "soi")]
+    assert conflicts[0].overlap == 50
+    assert conflicts[1].overlap == 5
+
+
+def test_touching_bands_conflict():
+    conflicts = find_conflicts([OrbitBand("A", "Sun", 0, 10, 0), OrbitBand("B", "Sun", 10, 20, 0)])
+    assert [c.kind for c in conflicts] == ["orbit"]
+
+
+def test_check_system():
+    system = SolarSystem([
+        Body("Sun", radius=7e8, gravity=274),
+        Body("Earth", "Sun", radius=6.4e6, gravity=9.8, semi_major_axis=1.5e11),
+        Body("Twin", "Sun", radius=6.4e6, gravity=9.8, semi_major_axis=1.5e11, eccentricity=0.01),
+        Body("Mars", "Sun", radius=3.4e6, gravity=3.7, semi_major_axis=2.3e11),
+        Body("Moon", "Earth", radius=1.7e6, gravity=1.6, semi_major_axis=3.8e8),
+    ])
+    bands = {band.name: band for band in compute_bands(system)}
+    assert set(bands) == {"Earth", "Twin", "Mars", "Moon"}
+    assert bands["Earth"].soi > 0
+    assert [(c.first, c.second, c.kind) for c in check_system(system)] == [("Earth", "Twin", "orbit")]
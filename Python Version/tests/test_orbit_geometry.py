@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from orbit_geometry import (apsides, orbit_shape, points_at_eccentric_anomaly, to_pixels, viewport_orbit,
+                            visible_arcs)
+
+
+def test_orbit_shape_clamps_its_inputs():
+    assert orbit_shape(0.0, -1.0) == (1.0, 0.0, 1.0, 0.0)
+    a, e, b, c = orbit_shape(1000.0, 2.0)
+    assert (a, e) == (1000.0, 0.99)
+    assert b == pytest.approx(1000.0 * np.sqrt(1 - 0.99 ** 2)) and c == pytest.approx(990.0)
+
+
+def test_points_lie_on_the_ellipse_around_the_focus():
+    a, e, arg = 1000.0, 0.6, 30.0
+    anomalies = np.linspace(0.0, 2 * np.pi, 50)
+    points = points_at_eccentric_anomaly(a, e, arg, anomalies)
+    # r = a * (1 - e*cos(E)) from the focus
+    np.testing.assert_allclose(np.linalg.norm(points, axis=1), a * (1 - e * np.cos(anomalies)))
+    # Periapsis along arg_peri
+    np.testing.assert_allclose(points[0], a * (1 - e) * np.array([np.cos(np.radians(arg)), np.sin(np.radians(arg))]))
+
+
+def test_to_pixels():
+    np.testing.assert_allclose(to_pixels([[100.0, -50.0]], (10, 20), 10.0), [[20.0, 15.0]])
+
+
+def test_apsides():
+    peri, apo = apsides(1000.0, 0.5, 90.0)
+    np.testing.assert_allclose(peri, [0.0, 500.0], atol=1e-9)
+    np.testing.assert_allclose(apo, [0.0, -1500.0], atol=1e-9)
+
+
+# ---------------------------------------------
+# VIEWPORT CLIPPING
+# ---------------------------------------------
+TWO_PI = 2 * np.pi
+SAMPLES = np.linspace(0.0, TWO_PI, 20000, endpoint=False)
+
+
+def _inside(points, bounds):
+    xmin, ymin, xmax, ymax = bounds
+    return ((points[:, 0] >= xmin) & (points[:, 0] <= xmax) &
+            (points[:, 1] >= ymin) & (points[:, 1] <= ymax))
+
+
+def _covered(arcs):
+    mask = np.zeros(len(SAMPLES), dtype=bool)
+    for start, stop in arcs:
+        assert start < stop
+        mask |= np.mod(SAMPLES - start, TWO_PI) <= stop - start
+    return mask
+
+
+CASES = [
+    (1000.0, 0.0, 0.0, (-2000, -2000, 2000, 2000)),      # whole orbit
+    (1000.0, 0.0, 0.0, (5000, 5000, 6000, 6000)),        # none of it
+    (1000.0, 0.5, 30.0, (-200, -3000, 3000, 3000)),      # one side cut off
+    (1000.0, 0.7, 120.0, (-300, -300, 300, 300)),        # window around the focus
+    (1000.0, 0.3, 0.0, (500, -100, 900, 100)),           # arc through periapsis
+    (1000.0, 0.9, 250.0, (-1200, -800, 400, 1500)),
+]
+
+
+@pytest.mark.parametrize("a, e, arg, bounds", CASES)
+def test_visible_arcs_match_brute_force(a, e, arg, bounds):
+    arcs = visible_arcs(a, e, arg, bounds)
+    points = points_at_eccentric_anomaly(a, e, arg, SAMPLES)
+    expected = _inside(points, bounds)
+    got = _covered(arcs)
+    # Samples sitting right on an edge may go either way
+    xmin, ymin, xmax, ymax = bounds
+    edge = np.min(np.abs([points[:, 0] - xmin, points[:, 0] - xmax,
+                          points[:, 1] - ymin, points[:, 1] - ymax]), axis=0) < 1.0
+    assert np.array_equal(got[~edge], expected[~edge])
+
+
+def test_random_views_match_brute_force():
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        a = rng.uniform(100, 5000)
+        e = rng.uniform(0, 0.95)
+        arg = rng.uniform(0, 360)
+        x0, y0 = rng.uniform(-2 * a, 2 * a, 2)
+        bounds = (x0, y0, x0 + rng.uniform(1, 3 * a), y0 + rng.uniform(1, 3 * a))
+        test_visible_arcs_match_brute_force(a, e, arg, bounds)
+
+
+def test_arcs_are_sorted_and_disjoint():
+    arcs = visible_arcs(1000.0, 0.6, 45.0, (-500, -500, 200, 200))
+    for (_, stop), (start, _) in zip(arcs, arcs[1:]):
+        assert stop < start
+
+
+def test_viewport_orbit_stays_near_the_canvas():
+    width, height, margin = 400, 300, 8
+    polylines = viewport_orbit(1.0e6, 0.4, 60.0, (100, 150), 2000.0, (width, height), margin_px=margin)
+    assert polylines
+    for line in polylines:
+        assert np.all(line[:, 0] >= -margin - 1e-6) and np.all(line[:, 0] <= width + margin + 1e-6)
+        assert np.all(line[:, 1] >= -margin - 1e-6) and np.all(line[:, 1] <= height + margin + 1e-6)
+
+
+def test_viewport_orbit_respects_max_points():
+    polylines = viewport_orbit(1.0e9, 0.2, 0.0, (200, 200), 1.0, (400, 400), max_points=500)
+    assert sum(len(line) for line in polylines) <= 500 + 4
+
+
+def test_offscreen_orbit_has_no_polylines():
+    assert viewport_orbit(1000.0, 0.0, 0.0, (1.0e6, 1.0e6), 1.0, (100, 100)) == []
@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+from planet_library import INDEX_FILENAME, PlanetLibrary
+from planet_project import import_folder
+from sfs_batch import jobs_from_folder
+from solar_system import SolarSystem
+
+
+def _planet(radius, gravity, parent="Sun", lines=("OUTPUT = 1",)):
+    return {
+        "BASE_DATA": {"radius": radius, "gravity": gravity},
+        "ORBIT_DATA": {"parent": parent, "semiMajorAxis": radius * 100},
+        "ATMOSPHERE_PHYSICS_DATA": {"height": radius / 10},
+        "TERRAIN_DATA": {"terrainFormulaDifficulties": {"Normal": list(lines)}},
+        "HEIGHTMAP": {"points": [0.0, 1.0]},
+    }
+
+
+@pytest.fixture
+def folder(tmp_path):
+    planets = {
+        "Sun": _planet(7e8, 274, parent=None, lines=()),
+        "Earth": _planet(6.4e6, 9.8),
+        "Mars": _planet(3.4e6, 3.7, lines=("a = 1", "", "// comment", "OUTPUT = a")),
+        "Moon": _planet(1.7e6, 1.6, parent="Earth"),
+    }
+    for name, data in planets.items():
+        (tmp_path / f"{name}.txt").write_text(json.dumps(data), encoding="utf-8")
+    (tmp_path / "notes.md").write_text("not a planet")
+    return tmp_path
+
+
+def test_refresh_reparses_only_changed_files(folder):
+    library = PlanetLibrary(str(folder))
+    assert library.refresh() == 4
+    assert os.path.exists(folder / INDEX_FILENAME)
+    assert PlanetLibrary(str(folder)).refresh() == 0
+
+    (folder / "Mars.txt").write_text(json.dumps(_planet(3.5e6, 3.7)), encoding="utf-8")
+    (folder / "Broken.txt").write_text("{ nope", encoding="utf-8")
+    library = PlanetLibrary(str(folder))
+    assert library.refresh() == 2
+    records = {record.name: record for record in library.records}
+    assert records["Mars"].radius == 3.5e6
+    assert records["Broken"].error
+
+
+def test_search(folder):
+    library = PlanetLibrary(str(folder))
+    library.refresh()
+    assert [r.name for r in library.search()] == ["Earth", "Mars", "Moon", "Sun"]
+    assert [r.name for r in library.search("M")] == ["Mars", "Moon"]
+    assert [r.name for r in library.search(gravity=(None, 5.0))] == ["Mars", "Moon"]
+    assert [r.name for r in library.search("m", radius=(2e6, None))] == ["Mars"]
+    assert [r.name for r in library.search(formula_lines=(2, 2))] == ["Mars"]
+    with pytest.raises(ValueError):
+        library.search(mass=(1, 2))
+
+
+def test_index_is_not_read_as_a_planet(folder):
+    """The index lives in the planets folder; every folder scan must skip it."""
+    PlanetLibrary(str(folder)).refresh()
+    (folder / ".Earth.txt.tmp").write_text("{}")
+    names = {"Earth", "Mars", "Moon", "Sun"}
+
+    assert {name for name, _ in jobs_from_folder(str(folder))} == names
+
+    system = SolarSystem.load_folder(str(folder))
+    assert set(system.bodies) == names and not system.errors
+
+    project = import_folder(str(folder), workers=1)
+    assert set(project.planets) == names and not project.errors
+
+    library = PlanetLibrary(str(folder))
+    library.refresh()
+    assert {r.name for r in library.records} == names
@@ -0,0 +1,144 @@
+import importlib
+import json
+import os
+import types
+
+import pytest
+
+from planet_model import FlatZone, PlanetModel, PostKey, SectionList
+
+PLANET = {
+    "version": "1.5",
+    "BASE_DATA": {"radius": 315000.0, "gravity": 9.8, "timewarpHeight": 30000.0,
+                  "mapColor": {"r": 0.5, "g": 0.6, "b": 0.7, "a": 1.0}, "significant": True},
+    "POST_PROCESSING": {"keys": [{"height": 0.0, "contrast": 1.2}, {"height": 5000.0, "red": 0.8}]},
+    "ORBIT_DATA": {"parent": "Sun", "semiMajorAxis": 1.5e10, "eccentricity": 0.1, "direction": -1},
+    "TERRAIN_DATA": {"terrainFormulaDifficulties": {"Normal": ["OUTPUT = 1"]},
+                     "flatZones": [{"height": 10.0, "angle": 1.5, "width": 300.0, "transition": 50.0}]},
+    "LANDMARKS": [{"name": "Peak", "angle": 10.0, "startAngle": 5.0, "endAngle": 15.0}],
+    "HEIGHTMAP": {"points": [0.0, 1.0]},
+}
+
+
+def test_round_trip_keeps_known_values():
+    data = PlanetModel.from_dict(PLANET).to_dict()
+    assert data["BASE_DATA"]["radius"] == 315000.0
+    assert data["BASE_DATA"]["mapColor"] == {"r": 0.5, "g": 0.6, "b": 0.7, "a": 1.0}
+    assert [key["contrast"] for key in data["POST_PROCESSING"]["keys"]] == [1.2, 1.0]
+    assert data["ORBIT_DATA"]["direction"] == -1
+    assert data["TERRAIN_DATA"]["flatZones"] == PLANET["TERRAIN_DATA"]["flatZones"]
+    assert data["LANDMARKS"] == PLANET["LANDMARKS"]
+    assert "HEIGHTMAP" not in data
+    # Round-tripping the output again changes nothing
+    assert PlanetModel.from_dict(data).to_dict() == data
+
+
+def test_missing_sections_get_defaults():
+    data = PlanetModel.from_dict({}).to_dict()
+    assert data["ORBIT_DATA"]["parent"] == "Sun"
+    assert data["LANDMARKS"] == []
+    assert "POST_PROCESSING" not in data
+
+
+def test_empty_orbit_parent_exports_as_the_sun():
+    model = PlanetModel.from_dict({"ORBIT_DATA": {"parent": ""}})
+    assert model.to_dict()["ORBIT_DATA"]["parent"] == "Sun"
+    model.orbit.parent = "Earth"
+    assert model.to_dict()["ORBIT_DATA"]["parent"] == "Earth"
+    model.orbit.parent = ""
+    assert model.to_dict()["ORBIT_DATA"]["parent"] == "Sun"
+    assert model.orbit.parent == ""     # the editor field itself stays as typed
+
+
+def test_attribute_listener():
+    model = PlanetModel.from_dict(PLANET)
+    seen = []
+    model.orbit.subscribe(lambda section, name, value: seen.append((name, value)))
+    model.orbit.eccentricity = 0.2
+    model.orbit.eccentricity = 0.2      # unchanged: no call
+    assert seen == [("eccentricity", 0.2)]
+
+
+def test_versions_and_dirty_sections():
+    model = PlanetModel.from_dict(PLANET)
+    assert not model.dirty
+    before = model.base.version
+    model.base.mapColor.r = 0.1                 # nested section
+    assert model.base.version > before
+    model.terrain.flatZones.append(FlatZone())  # section list
+    model.terrain.flatZones[0].height = 20.0    # item of a section list
+    assert model.dirty_sections() == ["BASE_DATA", "TERRAIN_DATA"]
+    model.mark_clean()
+    assert not model.dirty
+    model.landmarks = SectionList()             # replacing a section
+    assert model.dirty_sections() == ["LANDMARKS"]
+
+
+def test_model_listeners_see_every_change():
+    model = PlanetModel.from_dict(PLANET)
+    calls = []
+    model.subscribe(lambda: calls.append(1))
+    model.atmosphere_physics.height = 1234.0
+    model.post_processing.keys[1].red = 0.1
+    model.post_processing.keys.pop()
+    model.touch()
+    assert len(calls) == 4
+    model.unsubscribe(model._listeners[0])
+    model.base.radius = 1.0
+    assert len(calls) == 4
+
+
+def test_to_dict_reuses_unchanged_sections():
+    model = PlanetModel.from_dict(PLANET)
+    first = model.to_dict()
+    model.orbit.eccentricity = 0.3
+    second = model.to_dict()
+    assert second["BASE_DATA"] is first["BASE_DATA"]
+    assert second["ORBIT_DATA"] is not first["ORBIT_DATA"]
+    assert second["ORBIT_DATA"]["eccentricity"] == 0.3
+    assert first["ORBIT_DATA"]["eccentricity"] == 0.1
+
+
+def test_post_processing_dropped_when_emptied():
+    model = PlanetModel.from_dict(PLANET)
+    model.post_processing.keys.clear()
+    assert "POST_PROCESSING" not in model.to_dict()
+    model.post_processing.keys.append(PostKey(height=1.0))
+    assert model.to_dict()["POST_PROCESSING"]["keys"][0]["height"] == 1.0
+
+
+def test_copy_is_independent():
+    model = PlanetModel.from_dict(PLANET)
+    copy = model.base.copy()
+    copy.mapColor.r = 0.0
+    assert model.base.mapColor.r == 0.5
+    assert copy != model.base and model.base.copy() == model.base
+
+
+def test_output_is_json_serializable():
+    json.dumps(PlanetModel.from_dict(PLANET).to_dict())
+
+
+# ---------------------------------------------
+# APP: store_editor_data
+# ---------------------------------------------
+@pytest.fixture
+def main_module():
+    pytest.importorskip("customtkinter")
+    cwd = os.getcwd()       # main changes into its own folder on import
+    try:
+        yield importlib.import_module("main")
+    finally:
+        os.chdir(cwd)
+
+
+def test_store_editor_data_drops_emptied_post_processing(main_module):
+    planet = dict(PLANET)
+    model = PlanetModel.from_dict(planet)
+    model.post_processing.keys.clear()
+    app = types.SimpleNamespace(project=types.SimpleNamespace(active_data=planet),
+                                collect_editor_data=model.to_dict)
+    main_module.PlanetMakerApp.store_editor_data(app)
+    assert "POST_PROCESSING" not in planet
+    assert planet["HEIGHTMAP"] == PLANET["HEIGHTMAP"]
+    assert planet["BASE_DATA"]["radius"] == 315000.0
@@ -0,0 +1,80 @@
+import importlib
+import json
+import os
+import types
+
+import pytest
+
+import planet_project
+from planet_project import PlanetProject, import_folder
+
+
+def _write(folder, filename, radius):
+    (folder / filename).write_text(json.dumps({"BASE_DATA": {"radius": radius}}))
+
+
+@pytest.fixture
+def folder(tmp_path):
+    _write(tmp_path, "Earth.json", 1.0)
+    _write(tmp_path, "Earth.txt", 2.0)
+    _write(tmp_path, "Mars.txt", 3.0)
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_same_name_files_are_reported_not_overwritten(folder, monkeypatch, workers):
+    monkeypatch.setattr(planet_project, "POOL_MIN_FILES", 1)
+    project = import_folder(str(folder), workers=workers)
+    assert project.names() == ["Earth", "Mars"]
+    # The first file in sorted order is kept, whichever finishes loading first
+    assert project.planets["Earth"]["BASE_DATA"]["radius"] == 1.0
+    assert project.paths["Earth"].endswith("Earth.json")
+    assert "Earth.txt" in project.errors["Earth"] and "Mars" not in project.errors
+
+
+def test_add_keeps_the_first_file_unless_replacing():
+    project = PlanetProject()
+    assert project.add("Earth", {"a": 1}, "one/Earth.txt")
+    assert not project.add("Earth", {"a": 2}, "two/Earth.txt")
+    assert project.planets["Earth"] == {"a": 1} and "Earth" in project.errors
+
+    assert project.add("Earth", {"a": 1}, "one/Earth.txt")        # same file again
+    assert project.add("Earth", {"a": 3}, "two/Earth.txt", replace=True)
+    assert project.planets["Earth"] == {"a": 3} and project.paths["Earth"] == "two/Earth.txt"
+
+
+# ---------------------------------------------
+# REPLACING THE OPEN PROJECT
+# ---------------------------------------------
+@pytest.fixture
+def main_module():
+    pytest.importorskip("customtkinter")
+    cwd = os.getcwd()       # main changes into its own folder on import
+    try:
+        yield importlib.import_module("main")
+    finally:
+        os.chdir(cwd)
+
+
+def _app(dirty):
+    stored = []
+    app = types.SimpleNamespace(_project=PlanetProject(), model=types.SimpleNamespace(dirty=dirty),
+                                store_editor_data=lambda: stored.append(True),
+                                refresh_switcher=lambda: None, show_active_planet=lambda: None,
+                                status_label=types.SimpleNamespace(configure=lambda **kwargs: None))
+    app.project = app._project
+    app.project.add("Earth", {})
+    return app, stored
+
+
+@pytest.mark.parametrize("dirty, answer, replaced", [(False, False, True), (True, True, True), (True, False, False)])
+def test_import_stores_edits_before_replacing_the_project(main_module, monkeypatch, dirty, answer, replaced):
+    asked = []
+    monkeypatch.setattr(main_module.messagebox, "askyesno", lambda *args: asked.append(args) or answer)
+    app, stored = _app(dirty)
+    old, new = app._project, PlanetProject("system")
+
+    main_module.PlanetMakerApp.set_project(app, new)
+    assert stored == [True]
+    assert bool(asked) == dirty
+    assert app._project is (new if replaced else old)
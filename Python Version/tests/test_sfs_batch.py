@@ -0,0 +1,61 @@
+import json
+import os
+
+import pytest
+
+from sfs_batch import check_planet_name, collect_jobs, export_batch, jobs_from_manifest, main
+
+
+@pytest.mark.parametrize("name", ["", ".", "..", "../Earth", "a/b", "a\\b", "bad\0name"])
+def test_unsafe_names_are_rejected(name):
+    with pytest.raises(ValueError):
+        check_planet_name(name)
+
+
+def test_plain_names_pass():
+    assert check_planet_name("Earth 2.0") == "Earth 2.0"
+
+
+def test_manifest_forms():
+    assert jobs_from_manifest({"A": {}, "B": {"x": 1}}) == [("A", {}), ("B", {"x": 1})]
+    assert jobs_from_manifest([{"name": "A", "data": {}}, {"data": {}}]) == [("A", {}), ("planet_1", {})]
+    with pytest.raises(ValueError):
+        jobs_from_manifest([{"name": "A"}])
+    with pytest.raises(ValueError):
+        jobs_from_manifest({"../../etc/x": {}})
+
+
+def test_export_batch(tmp_path):
+    source = tmp_path / "planets"
+    source.mkdir()
+    (source / "Earth.txt").write_text(json.dumps({"BASE_DATA": {"radius": 1.0}}))
+    (source / "Broken.json").write_text("{")
+    (source / ".hidden.txt").write_text("{}")
+    out = tmp_path / "out"
+
+    results = export_batch(collect_jobs(str(source)), str(out), workers=1)
+    assert [(r.name, r.ok) for r in results] == [("Broken", False), ("Earth", True)]
+    assert json.loads((out / "Earth.txt").read_text())["BASE_DATA"] == {"radius": 1.0}
+    assert sorted(os.listdir(out)) == ["Earth.txt"]
+
+
+def test_export_batch_rejects_duplicates_and_unsafe_names(tmp_path):
+    with pytest.raises(ValueError):
+        export_batch([("A", {}), ("A", {})], str(tmp_path), workers=1)
+    with pytest.raises(ValueError):
+        export_batch([("../A", {})], str(tmp_path / "out"), workers=1)
+    assert not os.path.exists(tmp_path / "A.txt")
+
+
+def test_cli_exit_codes(tmp_path, capsys):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"Earth": {}}))
+    assert main([str(manifest), "-o", str(tmp_path / "out"), "-j", "1"]) == 0
+    manifest.write_text(json.dumps({"../Earth": {}}))
+    assert main([str(manifest), "-o", str(tmp_path / "out"), "-j", "1"]) == 2
+    capsys.readouterr()
+
+
+def test_workers_do_not_print(tmp_path, capsys):
+    export_batch([("A", {}), ("B", {})], str(tmp_path), workers=1)
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,174 @@
+import json
+import os
+import stat
+
+import numpy as np
+import pytest
+
+import sfs_exporter
+from planet_model import FlatZone, PlanetModel
+from sfs_exporter import FragmentCache, RawJSON, SFSExporter, atomic_open, atomic_write_chunks
+
+# Every section export_planet fills in, in its order, so the output equals json.dumps(PLANET)
+PLANET = {
+    "version": "1.5",
+    "BASE_DATA": {"radius": 315000.0, "gravity": 9.8, "name": "Ünïcode ☄"},
+    "ATMOSPHERE_PHYSICS_DATA": {"height": 3000.0},
+    "ATMOSPHERE_VISUALS_DATA": {},
+    "TERRAIN_DATA": {"terrainFormulaDifficulties": {"Normal": ["OUTPUT = 1"]}, "flatZones": []},
+    "POST_PROCESSING": {"keys": [{"height": 0.0}]},
+    "ORBIT_DATA": {"parent": "Sun", "semiMajorAxis": 1.5e10},
+    "ACHIEVEMENT_DATA": {"Landed": True},
+    "LANDMARKS": [],
+    "HEIGHTMAP": {"points": [0.0, 0.5, 1.0]},
+}
+
+
+def _export(path, data, **kwargs):
+    SFSExporter().export_planet(str(path), data, quiet=True, **kwargs)
+    return path.read_text(encoding="utf-8")
+
+
+# ---------------------------------------------
+# EXPORT
+# ---------------------------------------------
+@pytest.mark.parametrize("stream", [True, False])
+def test_export_matches_json_dumps(tmp_path, stream):
+    path = tmp_path / "Earth.txt"
+    text = _export(path, PLANET, stream=stream)
+    assert text == json.dumps(PLANET, indent=2, ensure_ascii=True)
+
+
+def test_export_fills_missing_sections_without_changing_the_input(tmp_path):
+    data = {"TERRAIN_DATA": {"terrainFormulaDifficulties": {}}, "POST_PROCESSING": {}}
+    text = _export(tmp_path / "a.txt", data)
+    written = json.loads(text)
+    assert written["POST_PROCESSING"] == {"keys": []}
+    assert written["TERRAIN_DATA"]["flatZones"] == []
+    assert written["ACHIEVEMENT_DATA"]["Takeoff"] is True
+    assert data == {"TERRAIN_DATA": {"terrainFormulaDifficulties": {}}, "POST_PROCESSING": {}}
+
+
+def test_export_encodes_numpy_arrays(tmp_path):
+    text = _export(tmp_path / "a.txt", {"HEIGHTMAP": {"points": np.array([0.25, 0.5])}})
+    assert json.loads(text)["HEIGHTMAP"]["points"] == [0.25, 0.5]
+
+
+def test_export_returns_the_file_size(tmp_path):
+    path = tmp_path / "Earth.txt"
+    size = SFSExporter().export_planet(str(path), PLANET, quiet=True)
+    assert size == os.path.getsize(path)
+
+
+def test_failed_export_keeps_the_old_file(tmp_path):
+    path = tmp_path / "Earth.txt"
+    old = _export(path, PLANET)
+    with pytest.raises(ValueError):
+        SFSExporter().export_planet(str(path), {"BASE_DATA": {"bad": object()}}, quiet=True)
+    assert path.read_text(encoding="utf-8") == old
+    assert os.listdir(tmp_path) == ["Earth.txt"]
+
+
+def test_quiet_export_prints_nothing(tmp_path, capsys):
+    SFSExporter().export_planet(str(tmp_path / "a.txt"), PLANET, quiet=True)
+    assert capsys.readouterr().out == ""
+    SFSExporter().export_planet(str(tmp_path / "a.txt"), PLANET)
+    assert capsys.readouterr().out != ""
+
+
+# ---------------------------------------------
+# ATOMIC WRITES
+# ---------------------------------------------
+def test_new_file_gets_umask_permissions(tmp_path, monkeypatch):
+    monkeypatch.setattr(sfs_exporter, "_UMASK", 0o027)
+    path = tmp_path / "new.txt"
+    atomic_write_chunks(str(path), ["x"])
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+def test_umask_is_read_without_changing_it(monkeypatch):
+    current = os.umask(0o022)
+    os.umask(current)
+
+    def no_umask(mask):
+        raise AssertionError("os.umask changes the mask for every thread")
+    monkeypatch.setattr(os, "umask", no_umask)
+    assert sfs_exporter._read_umask() == current
+
+    # Without /proc the mask is probed with a scratch file
+    monkeypatch.setattr(sfs_exporter, "open", lambda *args, **kwargs: open("/nonexistent/status"), raising=False)
+    assert sfs_exporter._read_umask() == current & 0o666
+
+
+def test_replaced_file_keeps_its_permissions(tmp_path):
+    path = tmp_path / "old.txt"
+    path.write_text("old")
+    os.chmod(path, 0o604)
+    atomic_write_chunks(str(path), ["new"])
+    assert path.read_text() == "new"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o604
+
+
+def test_atomic_write_counts_utf8_bytes(tmp_path):
+    path = tmp_path / "a.txt"
+    assert atomic_write_chunks(str(path), ["ä", "☄", "x"]) == 6 == os.path.getsize(path)
+
+
+def test_error_inside_atomic_open_leaves_nothing_behind(tmp_path):
+    path = tmp_path / "a.txt"
+    with pytest.raises(RuntimeError):
+        with atomic_open(str(path)) as f:
+            f.write("partial")
+            raise RuntimeError("boom")
+    assert os.listdir(tmp_path) == []
+
+
+# ---------------------------------------------
+# FRAGMENT SPLICING
+# ---------------------------------------------
+def _model_data(model):
+    data = {"version": "1.5", "HEIGHTMAP": PLANET["HEIGHTMAP"], "ACHIEVEMENT_DATA": PLANET["ACHIEVEMENT_DATA"]}
+    data.update(model.to_dict())
+    return data
+
+
+def test_fragment_splice_matches_json_dumps_across_edits(tmp_path):
+    model = PlanetModel.from_dict(PLANET)
+    fragments = FragmentCache()
+    path = tmp_path / "Earth.txt"
+    # (edit, sections encoded again by the export that follows it)
+    edits = [
+        (lambda: None, 7),
+        (lambda: setattr(model.orbit, "eccentricity", 0.4), 1),
+        (lambda: model.terrain.flatZones.append(FlatZone(height=5.0)), 1),
+        (lambda: setattr(model.terrain.flatZones[0], "width", 12.5), 1),
+        (lambda: model.post_processing.keys.clear(), 0),     # section left out, default written
+        (lambda: setattr(model.base, "radius", 1.0), 1),
+    ]
+    reference = tmp_path / "reference.txt"
+    for edit, encoded in edits:
+        edit()
+        misses = fragments.misses
+        text = _export(path, _model_data(model), fragments=fragments, versions=model.section_versions())
+        assert fragments.misses - misses == encoded
+        SFSExporter().export_planet(str(reference), _model_data(model), quiet=True)
+        assert text == reference.read_text(encoding="utf-8")
+        assert json.loads(text)["ORBIT_DATA"] == model.orbit.to_json()
+
+
+def test_fragment_chunks_equal_json_dumps():
+    data = json.loads(json.dumps(PLANET))
+    encoder = json.JSONEncoder(indent=2)
+    versions = {key: (object(), 0) for key in ("BASE_DATA", "ORBIT_DATA")}
+    cache = FragmentCache()
+    for _ in range(2):
+        assert "".join(cache.chunks(data, versions, encoder)) == json.dumps(data, indent=2)
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert "".join(cache.chunks({}, {}, encoder)) == "{}"
+
+
+def test_raw_json_is_written_verbatim():
+    encoder = json.JSONEncoder(indent=2)
+    text = "".join(FragmentCache().chunks({"A": 1, "HEIGHTMAP": RawJSON('{"points": [1,2]}')}, {}, encoder))
+    assert text == '{\n  "A": 1,\n  "HEIGHTMAP": {"points": [1,2]}\n}'
+    assert json.loads(text)["HEIGHTMAP"] == {"points": [1, 2]}
@@ -0,0 +1,81 @@
+import json
+import pickle
+
+import pytest
+
+from sfs_loader import LazyPlanet, load_planet, loads_planet
+
+PLANET = {
+    "version": "1.5",
+    "BASE_DATA": {"radius": 315000.0, "gravity": 9.8, "name": "quote \" and \\ and {brace]"},
+    "TERRAIN_DATA": {"terrainFormulaDifficulties": {"Normal": ["OUTPUT = 1"]}, "flatZones": []},
+    "HEIGHTMAP": {"points": [0.0, 0.5, 1.0, 0.25]},
+    "EMPTY": {},
+    "LIST": [1, [2, {"a": []}], "]"],
+}
+TEXT = json.dumps(PLANET, indent=2)
+
+
+def test_lazy_sections_stay_undecoded():
+    planet = loads_planet(TEXT)
+    assert isinstance(planet, LazyPlanet)
+    assert not planet.is_loaded("HEIGHTMAP")
+    assert planet.is_loaded("BASE_DATA")
+    assert json.loads(planet.raw_text("HEIGHTMAP")) == PLANET["HEIGHTMAP"]
+    assert planet.raw_text("BASE_DATA") is None
+    assert planet.raw_text("missing") is None
+
+
+def test_lazy_planet_behaves_like_the_decoded_dict():
+    planet = loads_planet(TEXT)
+    assert planet == PLANET
+    assert list(planet) == list(PLANET)
+    assert planet["HEIGHTMAP"] == PLANET["HEIGHTMAP"]
+    assert planet.is_loaded("HEIGHTMAP")
+    assert json.loads(json.dumps(loads_planet(TEXT))) == PLANET
+    assert dict(loads_planet(TEXT)) == PLANET
+    assert loads_planet(TEXT).copy() == PLANET
+
+
+def test_eager_load():
+    planet = loads_planet(TEXT, lazy=False)
+    assert type(planet) is dict and planet == PLANET
+
+
+def test_pickle_keeps_sections_pending():
+    planet = pickle.loads(pickle.dumps(loads_planet(TEXT)))
+    assert not planet.is_loaded("HEIGHTMAP")
+    assert planet == PLANET
+
+
+@pytest.mark.parametrize("text", ["", '{"a": 1', '{"a" 1}', '{"a": [1, 2}'])
+def test_invalid_json_raises_value_error(text):
+    with pytest.raises(ValueError):
+        loads_planet(text)
+
+
+def test_load_planet_from_file(tmp_path):
+    path = tmp_path / "Earth.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    assert load_planet(str(path)) == PLANET
+
+
+@pytest.mark.parametrize("text", ['{"a": 1, "HEIGHTMAP": [1, 2]} trailing', "{} x", '{"a": 1}{"b": 2}'])
+def test_data_after_the_object_is_rejected(text):
+    with pytest.raises(ValueError):
+        loads_planet(text)
+
+
+def test_mismatched_brackets_in_a_lazy_section_are_rejected_at_load():
+    with pytest.raises(ValueError):
+        loads_planet('{"a": 1, "HEIGHTMAP": {"points": [1, 2}]}')
+
+
+def test_other_syntax_errors_in_a_lazy_section_are_raised_on_access():
+    text = '{"a": 1, "HEIGHTMAP": [1,, 2]}'
+    planet = loads_planet(text)
+    assert planet["a"] == 1
+    with pytest.raises(ValueError):
+        planet["HEIGHTMAP"]
+    with pytest.raises(ValueError):
+        loads_planet(text, lazy=False)
@@ -0,0 +1,32 @@
+import types
+
+import pytest
+
+from solar_system import Body, SolarSystem
+
+
+@pytest.fixture
+def view_class():
+    pytest.importorskip("customtkinter")
+    from gui.system_view import SystemView
+    return SystemView
+
+
+def _view():
+    view = types.SimpleNamespace(_pan_start=(0, 0, None), conflicted={"Earth", "Twin"})
+    view.status_label = types.SimpleNamespace(configure=lambda **kwargs: None)
+    view.fit_view = lambda: None
+    return view
+
+
+def test_releasing_a_pan_keeps_the_conflict_highlights(view_class):
+    view = _view()
+    view_class.on_release(view, types.SimpleNamespace(x=0, y=0))
+    assert view._pan_start is None
+    assert view.conflicted == {"Earth", "Twin"}
+
+
+def test_a_new_system_clears_the_highlights(view_class):
+    view = _view()
+    view_class.set_system(view, SolarSystem([Body("Sun", radius=1.0, gravity=1.0)]))
+    assert view.conflicted == set()
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+from terrain_formula import (FormulaError, IncrementalFormula, TerrainFormula, apply_flat_zones,
+                             build_dependency_graph, parse_line)
+
+ANGLES = np.linspace(0.0, 2 * np.pi, 256, endpoint=False)
+RADIUS = 1000.0
+
+
+# ---------------------------------------------
+# PARSING
+# ---------------------------------------------
+def test_parse_assignment():
+    line = parse_line("OUTPUT = 1 + 2 * 3")
+    assert (line.target, line.op, line.uses) == ("OUTPUT", "=", frozenset())
+
+
+def test_compound_assignment_reads_its_target():
+    line = parse_line("a += b * 2")
+    assert line.op == "+="
+    assert line.uses == {"a", "b"}
+
+
+@pytest.mark.parametrize("text", ["= 5", "x = ", "x = (1 + 2", "x = 1 2", "x = Foo(1)", "x = Min(1)",
+                                  "x = AddHeightMap(1, 2, 3)"])
+def test_parse_errors(text):
+    with pytest.raises(FormulaError):
+        parse_line(text)
+
+
+def test_errors_carry_the_line_number():
+    with pytest.raises(FormulaError, match="Line 2"):
+        TerrainFormula(["OUTPUT = 1", "OUTPUT = )"])
+
+
+# ---------------------------------------------
+# EVALUATION
+# ---------------------------------------------
+def test_arithmetic_and_precedence():
+    heights = TerrainFormula(["a = 2", "OUTPUT = a * (3 + 1) - 1 / 2", "OUTPUT *= -1"]).evaluate(ANGLES, RADIUS)
+    assert heights.shape == ANGLES.shape
+    np.testing.assert_allclose(heights, -7.5)
+
+
+def test_functions():
+    lines = ["a = Min(3, 5) + Max(3, 5)", "b = Clamp(20, 0, 10)", "c = Lerp(0, 10, 0.25) + Abs(-1)",
+             "OUTPUT = a + b + c + Pow(2, 3)"]
+    np.testing.assert_allclose(TerrainFormula(lines).evaluate(ANGLES, RADIUS), 8 + 10 + 3.5 + 8)
+
+
+def test_blank_and_comment_lines_are_skipped():
+    assert len(TerrainFormula(["", "  ", "// note", "# note", "OUTPUT = 1"]).lines) == 1
+
+
+def test_no_output_gives_zeros():
+    np.testing.assert_array_equal(TerrainFormula(["a = 1"]).evaluate(ANGLES, RADIUS), 0.0)
+
+
+def test_variable_used_before_assignment():
+    with pytest.raises(FormulaError, match="before it is assigned"):
+        TerrainFormula(["OUTPUT = b"]).evaluate(ANGLES, RADIUS)
+
+
+def test_heightmap_is_deterministic_and_scaled():
+    formula = TerrainFormula(["OUTPUT = AddHeightMap(Perlin, 500, 100)"])
+    heights = formula.evaluate(ANGLES, RADIUS)
+    assert heights.min() >= 0.0 and heights.max() <= 100.0
+    assert heights.std() > 0.0
+    np.testing.assert_array_equal(heights, formula.evaluate(ANGLES, RADIUS))
+
+
+def test_flat_zone_reaches_its_height_at_the_center():
+    heights = apply_flat_zones(np.zeros_like(ANGLES), ANGLES, RADIUS,
+                               [{"angle": ANGLES[64], "height": 50.0, "width": 200.0, "transition": 100.0}])
+    assert heights[64] == pytest.approx(50.0)
+    assert heights[192] == 0.0
+
+
+# ---------------------------------------------
+# INCREMENTAL EVALUATION
+# ---------------------------------------------
+LINES = ["a = 2", "b = a + 1", "c = 10", "OUTPUT = b * c"]
+
+
+def test_dependency_graph():
+    graph = build_dependency_graph([parse_line(text) for text in LINES])
+    assert graph == [(), (0,), (), (1, 2)]
+
+
+def test_incremental_matches_full_evaluation():
+    inc = IncrementalFormula(ANGLES, RADIUS)
+    np.testing.assert_allclose(inc.evaluate(LINES), TerrainFormula(LINES).evaluate(ANGLES, RADIUS))
+    assert (inc.evaluated, inc.reused) == (4, 0)
+
+
+def test_unchanged_text_is_served_from_the_memo():
+    inc = IncrementalFormula(ANGLES, RADIUS)
+    inc.evaluate(LINES)
+    inc.evaluate(LINES)
+    assert (inc.evaluated, inc.reused) == (0, 4)
+
+
+def test_edit_invalidates_the_line_and_its_dependents_only():
+    inc = IncrementalFormula(ANGLES, RADIUS)
+    inc.evaluate(LINES)
+    edited = ["a = 5"] + LINES[1:]
+    heights = inc.evaluate(edited)
+    # a, b and OUTPUT are recomputed; c is reused
+    assert (inc.evaluated, inc.reused) == (3, 1)
+    np.testing.assert_allclose(heights, 60.0)
+
+
+def test_editing_back_recomputes_correctly():
+    inc = IncrementalFormula(ANGLES, RADIUS)
+    first = inc.evaluate(LINES)
+    inc.evaluate(["a = 5"] + LINES[1:])
+    np.testing.assert_allclose(inc.evaluate(LINES), first)
+
+
+def test_same_text_with_different_inputs_is_not_confused():
+    # "b = a + 1" appears twice with different upstream values
+    lines = ["a = 1", "b = a + 1", "a = 10", "b = a + 1", "OUTPUT = b"]
+    inc = IncrementalFormula(ANGLES, RADIUS)
+    np.testing.assert_allclose(inc.evaluate(lines), 11.0)
+
+
+def test_set_samples_invalidates_the_memo():
+    inc = IncrementalFormula(ANGLES, RADIUS)
+    inc.evaluate(LINES)
+    inc.set_samples(ANGLES[:10], RADIUS)
+    assert inc.evaluate(LINES).shape == (10,)
+    assert inc.reused == 0